@@ -0,0 +1,86 @@
+"""Mede logins por segundo por núcleo para cada conjunto de custos do Argon2.
+
+Cada login é uma verificação de senha. As verificações rodam em um
+pool de threads com um worker por núcleo (o argon2-cffi libera o GIL)
+durante `--seconds` segundos para cada conjunto.
+
+Uso:
+    python -m benchmarks.bench_argon2 --seconds 5
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+from benchmarks.common import print_table
+from fast_zero.settings import get_settings
+
+# (time_cost, memory_cost em KiB, parallelism)
+PARAMETER_SETS = (
+    (2, 19_456, 1),  # mínimo da OWASP
+    (1, 47_104, 1),  # alternativa da OWASP
+    (3, 65_536, 4),  # padrão do argon2-cffi/pwdlib
+    (4, 131_072, 4),
+)
+
+
+def logins_per_second(hasher, hashed, seconds, workers):
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        count = 0
+        while time.perf_counter() < deadline:
+            hasher.verify('benchpassword', hashed)
+            count += 1
+        return count
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        total = sum(executor.map(lambda _: worker(), range(workers)))
+    return total / seconds
+
+
+def main(seconds):
+    settings = get_settings()
+    configured = (
+        settings.ARGON2_TIME_COST,
+        settings.ARGON2_MEMORY_COST,
+        settings.ARGON2_PARALLELISM,
+    )
+    cores = os.cpu_count() or 1
+
+    results = []
+    for params in dict.fromkeys((*PARAMETER_SETS, configured)):
+        time_cost, memory_cost, parallelism = params
+        hasher = Argon2Hasher(
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+        )
+        hashed = hasher.hash('benchpassword')
+        start = time.perf_counter()
+        hasher.verify('benchpassword', hashed)
+        single = (time.perf_counter() - start) * 1000
+        rate = logins_per_second(hasher, hashed, seconds, cores)
+        results.append((
+            f't={time_cost} m={memory_cost // 1024}MiB p={parallelism}'
+            + (' (settings)' if params == configured else ''),
+            single,
+            rate,
+            rate / cores,
+        ))
+
+    print(f'{cores} núcleo(s), {seconds}s por conjunto')
+    print_table(
+        ('parâmetros', 'ms por login', 'logins/s', 'logins/s/núcleo'),
+        results,
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+    main(args.seconds)
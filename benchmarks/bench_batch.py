@@ -0,0 +1,85 @@
+"""Compara criar, alterar e remover tarefas uma a uma e em lote.
+
+Uso:
+    python -m benchmarks.bench_batch --todos 1000
+"""
+
+import argparse
+import asyncio
+
+from benchmarks.common import (
+    auth_headers,
+    bench_client,
+    bench_database,
+    print_table,
+    seed_user,
+    timed,
+)
+
+
+async def one_by_one(client, headers, count):
+    ids = []
+    for n in range(count):
+        response = await client.post(
+            '/todos/',
+            headers=headers,
+            json={'title': f'todo {n}', 'description': 'x', 'state': 'todo'},
+        )
+        ids.append(response.json()['id'])
+    for todo_id in ids:
+        await client.patch(
+            f'/todos/{todo_id}',
+            headers=headers,
+            json={'state': 'done'},
+        )
+    for todo_id in ids:
+        await client.delete(f'/todos/{todo_id}', headers=headers)
+
+
+async def batched(client, headers, count):
+    response = await client.post(
+        '/todos/batch',
+        headers=headers,
+        json={
+            'todos': [
+                {'title': f'todo {n}', 'description': 'x', 'state': 'todo'}
+                for n in range(count)
+            ]
+        },
+    )
+    ids = [result['id'] for result in response.json()['results']]
+    await client.patch(
+        '/todos/batch',
+        headers=headers,
+        json={'todos': [{'id': todo_id, 'state': 'done'} for todo_id in ids]},
+    )
+    await client.request(
+        'DELETE',
+        '/todos/batch',
+        headers=headers,
+        json={'ids': ids},
+    )
+
+
+async def main(count):
+    async with bench_database() as engine:
+        await seed_user(engine)
+        headers = auth_headers()
+        results = []
+        async with bench_client(engine) as client:
+            for label, scenario in (
+                ('individual', one_by_one),
+                ('lote', batched),
+            ):
+                _, elapsed = await timed(scenario(client, headers, count))
+                results.append((label, elapsed * 1000, count / elapsed))
+
+    print(f'{count} tarefas criadas, alteradas e removidas')
+    print_table(('modo', 'total (ms)', 'tarefas/s'), results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--todos', type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.todos))
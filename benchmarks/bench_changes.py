@@ -0,0 +1,125 @@
+"""Compara a sincronia incremental com baixar a lista inteira de novo.
+
+Depois de uma sincronia completa, `--changed` tarefas são alteradas e
+`--deleted` removidas. O cliente então busca o que mudou de duas formas:
+percorrendo todas as páginas de `GET /todos/` (como os apps fazem hoje)
+ou com `GET /todos/changes?since=<watermark>`.
+
+Uso:
+    python -m benchmarks.bench_changes --rows 50000 --changed 500
+"""
+
+import argparse
+import asyncio
+from datetime import timedelta
+
+from sqlalchemy import delete, func, update
+
+from benchmarks.common import (
+    auth_headers,
+    bench_client,
+    bench_database,
+    print_table,
+    seed_todos,
+    seed_user,
+    timed,
+)
+from fast_zero.models import Todo
+from fast_zero.purge import purge_cutoff
+from fast_zero.routers.todos import settings
+
+PAGE_SIZE = 1000
+
+
+async def download(client, path, params, next_key):
+    """Percorre as páginas de `path`; retorna os totais e a última página."""
+    requests = rows = size = 0
+    while True:
+        response = await client.get(
+            path, params=params, headers=auth_headers()
+        )
+        body = response.json()
+        requests += 1
+        rows += len(body['todos']) + len(body.get('deleted', ()))
+        size += len(response.content)
+        token = next_key(body)
+        if not token:
+            return requests, rows, size, body
+        params = {**params, **token}
+
+
+def next_cursor(body):
+    return body['next_cursor'] and {'cursor': body['next_cursor']}
+
+
+def next_watermark(body):
+    return body['has_more'] and {'since': body['watermark']}
+
+
+async def main(rows, changed, deleted):
+    async with bench_database() as engine:
+        user_id = await seed_user(engine)
+        await seed_todos(engine, user_id, rows)
+        async with engine.begin() as conn:
+            await conn.execute(
+                update(Todo).values(
+                    updated_at=purge_cutoff(timedelta(hours=1))
+                ),
+            )
+
+        async with bench_client(engine) as client:
+            *_, body = await download(
+                client,
+                '/todos/changes',
+                {'limit': PAGE_SIZE},
+                next_watermark,
+            )
+            watermark = body['watermark']
+
+            async with engine.begin() as conn:
+                await conn.execute(
+                    update(Todo)
+                    .where(Todo.id % (rows // changed) == 0)
+                    .values(state='done', updated_at=func.now()),
+                )
+                await conn.execute(
+                    delete(Todo).where(Todo.id % (rows // deleted) == 1),
+                )
+            # As alterações só aparecem depois da janela de acomodação
+            await asyncio.sleep(settings.TODO_CHANGES_SETTLE_SECONDS + 1)
+
+            results = []
+            for label, path, params, next_key in (
+                ('GET /todos/', '/todos/', {'limit': PAGE_SIZE}, next_cursor),
+                (
+                    'GET /todos/changes',
+                    '/todos/changes',
+                    {'limit': PAGE_SIZE, 'since': watermark},
+                    next_watermark,
+                ),
+            ):
+                (requests, count, size, _), elapsed = await timed(
+                    download(client, path, params, next_key),
+                )
+                results.append((
+                    label,
+                    elapsed * 1000,
+                    requests,
+                    count,
+                    size / 1024,
+                ))
+
+    print(
+        f'{rows} tarefas, {changed} alteradas e {deleted} removidas '
+        'desde a última sincronia'
+    )
+    print_table(('rota', 'ms', 'requisições', 'linhas', 'KiB'), results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--changed', type=int, default=500)
+    parser.add_argument('--deleted', type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.changed, args.deleted))
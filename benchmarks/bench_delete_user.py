@@ -0,0 +1,120 @@
+"""Mede a exclusão de um usuário com muitas tarefas.
+
+Compara três formas de apagar a conta com `--rows` tarefas, medindo o
+tempo total e a latência de `GET /todos/` de outro usuário enquanto isso:
+
+- o cascade do ORM, que carrega todas as tarefas e as apaga uma a uma
+  (o comportamento antes do ON DELETE CASCADE);
+- `DELETE /users/{id}` com o ON DELETE CASCADE do banco;
+- o job em segundo plano, que apaga as tarefas em lotes.
+
+Uso:
+    python -m benchmarks.bench_delete_user --rows 100000
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from benchmarks.common import (
+    auth_headers,
+    bench_client,
+    bench_database,
+    percentiles,
+    print_table,
+    seed_todos,
+    seed_user,
+)
+from fast_zero.database import settings
+from fast_zero.models import User
+from fast_zero.purge import delete_account
+
+
+async def foreground(client, headers, until):
+    """Faz requisições em sequência até `until` terminar."""
+    samples, errors = [], 0
+    while not until.done():
+        start = time.perf_counter()
+        try:
+            await client.get('/todos/', headers=headers)
+        except OperationalError:
+            errors += 1
+        samples.append(time.perf_counter() - start)
+    return samples, errors
+
+
+async def orm_cascade(engine, user_id):
+    async with AsyncSession(engine) as session:
+        user = await session.scalar(
+            select(User)
+            .where(User.id == user_id)
+            .options(selectinload(User.todos)),
+        )
+        await session.delete(user)
+        await session.commit()
+
+
+async def database_cascade(client, user_id):
+    threshold = settings.ACCOUNT_DELETE_BACKGROUND_THRESHOLD
+    settings.ACCOUNT_DELETE_BACKGROUND_THRESHOLD = 0
+    try:
+        await client.delete(f'/users/{user_id}', headers=auth_headers())
+    finally:
+        settings.ACCOUNT_DELETE_BACKGROUND_THRESHOLD = threshold
+
+
+async def main(rows, batch_size, pause):
+    results = []
+    for name in ('ORM cascade', 'ON DELETE CASCADE', 'job em lotes'):
+        async with bench_database() as engine:
+            user_id = await seed_user(engine)
+            await seed_todos(engine, user_id, rows)
+            reader_id = await seed_user(engine, 'reader')
+            await seed_todos(engine, reader_id, 100)
+
+            async with bench_client(engine) as client:
+                if name == 'ORM cascade':
+                    job = orm_cascade(engine, user_id)
+                elif name == 'ON DELETE CASCADE':
+                    job = database_cascade(client, user_id)
+                else:
+                    job = delete_account(engine, user_id, batch_size, pause)
+                start = time.perf_counter()
+                until = asyncio.create_task(job)
+                samples, errors = await foreground(
+                    client,
+                    auth_headers('reader'),
+                    until,
+                )
+                await until
+                elapsed = time.perf_counter() - start
+
+        stats = percentiles(samples)
+        results.append((
+            name,
+            elapsed,
+            stats['count'],
+            errors,
+            stats['p50'],
+            max(samples) * 1000,
+        ))
+
+    print(f'Exclusão de um usuário com {rows} tarefas')
+    print_table(
+        ('cenário', 'total s', 'reqs', 'erros', 'p50 ms', 'máx ms'),
+        results,
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--batch-size', type=int, default=5_000)
+    parser.add_argument('--pause', type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.batch_size, args.pause))
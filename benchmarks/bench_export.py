@@ -0,0 +1,144 @@
+"""Mede o pico de memória (RSS) da exportação de tarefas.
+
+Cada exportação roda em um processo separado, já que o pico de RSS só
+cresce durante a vida de um processo. Com o streaming, o pico deve ficar
+praticamente igual para 10 mil e 1 milhão de linhas.
+
+Uso:
+    python -m benchmarks.bench_export --rows 10000 1000000
+"""
+
+import argparse
+import asyncio
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from benchmarks.common import (
+    auth_headers,
+    bench_database,
+    print_table,
+    seed_todos,
+    seed_user,
+    timed,
+)
+from fast_zero.app import app
+from fast_zero.database import get_session
+
+
+async def child(path, fmt, gzip):
+    """Exporta tudo do banco em `path` e imprime bytes, segundos e RSS.
+
+    Chama a aplicação ASGI diretamente e descarta cada bloco ao recebê-lo;
+    o transporte ASGI do httpx acumularia o corpo inteiro na memória.
+    """
+    engine = create_async_engine(f'sqlite+aiosqlite:///{path}')
+    received = 0
+    requested = False
+    done = asyncio.Event()
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await done.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal received
+        if message['type'] == 'http.response.body':
+            received += len(message.get('body', b''))
+            if not message.get('more_body', False):
+                done.set()
+
+    headers = [
+        (key.lower().encode(), value.encode())
+        for key, value in auth_headers().items()
+    ]
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': '/todos/export',
+        'raw_path': b'/todos/export',
+        'query_string': f'format={fmt}&gzip={str(gzip).lower()}'.encode(),
+        'headers': headers,
+        'client': ('127.0.0.1', 0),
+        'server': ('bench', 80),
+    }
+
+    async def get_session_override():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    _, elapsed = await timed(app(scope, receive, send))
+    app.dependency_overrides.clear()
+    await engine.dispose()
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(received, elapsed, peak_kb)
+
+
+async def seed(path, rows):
+    async with bench_database(path) as engine:
+        user_id = await seed_user(engine)
+        await seed_todos(engine, user_id, rows)
+
+
+def main(sizes, fmt, gzip):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = Path(tmp) / f'export_{rows}.db'
+            asyncio.run(seed(path, rows))
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    '-m',
+                    'benchmarks.bench_export',
+                    '--child',
+                    str(path),
+                    '--format',
+                    fmt,
+                    *(['--gzip'] if gzip else []),
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.split()
+            received, elapsed, peak_kb = output[-3:]
+            results.append((
+                rows,
+                int(received) / 1024 / 1024,
+                float(elapsed),
+                int(peak_kb) / 1024,
+            ))
+
+    print(f'Exportação {fmt}{" + gzip" if gzip else ""}')
+    print_table(
+        ('linhas', 'MiB enviados', 'segundos', 'pico RSS MiB'), results
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--rows', type=int, nargs='+', default=[10_000, 1_000_000]
+    )
+    parser.add_argument(
+        '--format', choices=('ndjson', 'csv'), default='ndjson'
+    )
+    parser.add_argument('--gzip', action='store_true')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        asyncio.run(child(args.child, args.format, args.gzip))
+    else:
+        main(args.rows, args.format, args.gzip)
@@ -0,0 +1,119 @@
+"""Mede a vazão autenticada durante uma enxurrada de logins inválidos.
+
+Um cliente autenticado lista tarefas sem parar enquanto `--flooders`
+tarefas concorrentes tentam, juntas, `--rate` logins por segundo com senha
+errada para um e-mail que existe, a partir do mesmo IP. Sem o limite,
+cada tentativa ocupa o Argon2; com ele, quase todas voltam 429 antes do
+hash. O ritmo fixo evita medir o custo do próprio cliente atacante, que
+roda no mesmo processo.
+
+Uso:
+    python -m benchmarks.bench_login_flood --flooders 16 --rate 100
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+from benchmarks.common import (
+    auth_headers,
+    bench_client,
+    bench_database,
+    percentiles,
+    print_table,
+    seed_todos,
+    seed_user,
+    timed,
+)
+from fast_zero import ratelimit
+from fast_zero.hashing import get_password_hash, password_pool
+
+LIMITERS = (ratelimit.ip_limiter, ratelimit.identity_limiter)
+
+
+async def flood(client, deadline, interval, statuses):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.post(
+            '/auth/token',
+            data={'username': 'bench@bench.com', 'password': 'errada'},
+        )
+        statuses[response.status_code] += 1
+        await asyncio.sleep(max(0, interval - (time.perf_counter() - start)))
+
+
+async def list_todos(client, deadline, samples):
+    headers = auth_headers()
+    while time.perf_counter() < deadline:
+        _, elapsed = await timed(client.get('/todos/', headers=headers))
+        samples.append(elapsed)
+
+
+async def run(engine, flooders, rate, seconds):
+    samples = []
+    statuses = Counter()
+    ratelimit.backend.clear()
+    async with bench_client(engine) as client:
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(
+            list_todos(client, deadline, samples),
+            *(
+                flood(client, deadline, flooders / rate, statuses)
+                for _ in range(flooders)
+            ),
+        )
+    password_pool.shutdown()
+    return samples, statuses
+
+
+def set_limits(enabled, rates):
+    for limiter, rate in zip(LIMITERS, rates):
+        limiter.rate = rate if enabled else 0
+
+
+async def main(flooders, rate, seconds):
+    rates = [limiter.rate for limiter in LIMITERS]
+    async with bench_database() as engine:
+        user_id = await seed_user(
+            engine,
+            password=get_password_hash('benchpassword'),
+        )
+        await seed_todos(engine, user_id, 1_000)
+
+        results = []
+        for label, count, enabled in (
+            ('sem enxurrada', 0, True),
+            ('enxurrada, sem limite', flooders, False),
+            ('enxurrada, com limite', flooders, True),
+        ):
+            set_limits(enabled, rates)
+            samples, statuses = await run(engine, count, rate, seconds)
+            stats = percentiles(samples)
+            results.append((
+                label,
+                stats['count'] / seconds,
+                stats['p50'],
+                stats['p99'],
+                sum(statuses.values()),
+                statuses[429],
+            ))
+        set_limits(True, rates)
+
+    print(
+        f'GET /todos/ autenticado, {flooders} atacantes a {rate} logins/s '
+        f'por {seconds}s'
+    )
+    print_table(
+        ('cenário', 'req/s', 'p50 ms', 'p99 ms', 'logins', '429'),
+        results,
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--flooders', type=int, default=16)
+    parser.add_argument('--rate', type=float, default=100)
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.flooders, args.rate, args.seconds))
@@ -0,0 +1,92 @@
+"""Mede a latência de GET /todos/ durante uma rajada de logins.
+
+Roda o mesmo cenário com o Argon2 no event loop (workers=0) e no pool de
+workers, para mostrar o p99 da listagem estável mesmo com logins em massa.
+
+Uso:
+    python -m benchmarks.bench_login_storm --logins 8 --seconds 5
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import (
+    auth_headers,
+    bench_client,
+    bench_database,
+    percentiles,
+    print_table,
+    seed_todos,
+    seed_user,
+    timed,
+)
+from fast_zero import ratelimit
+from fast_zero.hashing import get_password_hash, password_pool
+
+PASSWORD = 'benchpassword'
+
+
+async def login_storm(client, deadline):
+    while time.perf_counter() < deadline:
+        await client.post(
+            '/auth/token',
+            data={'username': 'bench@bench.com', 'password': PASSWORD},
+        )
+
+
+async def list_todos(client, deadline, samples):
+    headers = auth_headers()
+    while time.perf_counter() < deadline:
+        _, elapsed = await timed(client.get('/todos/', headers=headers))
+        samples.append(elapsed)
+
+
+async def run(engine, workers, logins, seconds):
+    password_pool.shutdown()
+    password_pool.workers = workers
+    password_pool.max_pending = logins * 2
+
+    samples = []
+    async with bench_client(engine) as client:
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(
+            list_todos(client, deadline, samples),
+            *(login_storm(client, deadline) for _ in range(logins)),
+        )
+    password_pool.shutdown()
+    return percentiles(samples)
+
+
+async def main(logins, seconds, workers):
+    # Mede o custo do Argon2; o limite de tentativas recusaria a rajada
+    ratelimit.ip_limiter.rate = ratelimit.identity_limiter.rate = 0
+    async with bench_database() as engine:
+        user_id = await seed_user(
+            engine,
+            password=get_password_hash(PASSWORD),
+        )
+        await seed_todos(engine, user_id, 1_000)
+
+        results = []
+        for label, pool_workers in (('event loop', 0), ('pool', workers)):
+            stats = await run(engine, pool_workers, logins, seconds)
+            results.append((
+                label,
+                stats['count'],
+                stats['p50'],
+                stats['p95'],
+                stats['p99'],
+            ))
+
+    print(f'GET /todos/ com {logins} logins concorrentes por {seconds}s (ms)')
+    print_table(('argon2', 'reqs', 'p50', 'p95', 'p99'), results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--logins', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.seconds, args.workers))
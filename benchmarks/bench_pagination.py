@@ -0,0 +1,73 @@
+"""Compara a paginação por skip/limit com a paginação por cursor.
+
+Uso:
+    python -m benchmarks.bench_pagination --rows 1000000
+"""
+
+import argparse
+import asyncio
+import statistics
+
+from sqlalchemy import select
+
+from benchmarks.common import (
+    auth_headers,
+    bench_client,
+    bench_database,
+    print_table,
+    seed_todos,
+    seed_user,
+    timed,
+)
+from fast_zero.models import Todo
+from fast_zero.pagination import encode_cursor
+
+DEPTHS = (0.0, 0.1, 0.5, 0.9, 0.99)
+
+
+async def main(rows, limit, repeat):
+    async with bench_database() as engine:
+        user_id = await seed_user(engine)
+        await seed_todos(engine, user_id, rows)
+        async with engine.connect() as conn:
+            ids = (await conn.scalars(select(Todo.id).order_by(Todo.id))).all()
+
+        headers = auth_headers()
+        results = []
+        async with bench_client(engine) as client:
+            for depth in DEPTHS:
+                skip = int(rows * depth)
+                cursor = encode_cursor(ids[skip - 1]) if skip else None
+                offset_url = f'/todos/?limit={limit}&skip={skip}'
+                cursor_url = f'/todos/?limit={limit}' + (
+                    f'&cursor={cursor}' if cursor else ''
+                )
+
+                offset_times, cursor_times = [], []
+                for _ in range(repeat):
+                    _, elapsed = await timed(
+                        client.get(offset_url, headers=headers),
+                    )
+                    offset_times.append(elapsed * 1000)
+                    _, elapsed = await timed(
+                        client.get(cursor_url, headers=headers),
+                    )
+                    cursor_times.append(elapsed * 1000)
+
+                results.append((
+                    skip,
+                    statistics.median(offset_times),
+                    statistics.median(cursor_times),
+                ))
+
+    print(f'{rows} tarefas, páginas de {limit}, mediana de {repeat} (ms)')
+    print_table(('posição', 'skip/limit', 'cursor'), results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.limit, args.repeat))
@@ -0,0 +1,90 @@
+"""Compara a listagem com entidades mapeadas e com projeção de colunas.
+
+Cada rodada abre uma sessão nova, busca a página e serializa a resposta,
+como a rota faz. O tempo de CPU e o pico de memória alocada (tracemalloc)
+são mostrados por mil linhas.
+
+Uso:
+    python -m benchmarks.bench_projection --rows 1000 10000
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.common import (
+    bench_database,
+    print_table,
+    seed_todos,
+    seed_user,
+)
+from fast_zero.models import Todo
+from fast_zero.serialization import TODO_PUBLIC_COLUMNS, todo_list_response
+
+
+async def entities(session, rows):
+    result = await session.scalars(select(Todo).order_by(Todo.id).limit(rows))
+    return todo_list_response(result.all()).body
+
+
+async def projection(session, rows):
+    result = await session.execute(
+        select(*TODO_PUBLIC_COLUMNS).order_by(Todo.id).limit(rows),
+    )
+    return todo_list_response(result.all()).body
+
+
+async def measure(engine, load, rows, repeat):
+    """Retorna (ms de CPU, KiB de pico) por mil linhas."""
+    cpu = []
+    for _ in range(repeat):
+        async with AsyncSession(engine) as session:
+            start = time.process_time()
+            await load(session, rows)
+            cpu.append(time.process_time() - start)
+
+    async with AsyncSession(engine) as session:
+        tracemalloc.start()
+        await load(session, rows)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    cpu.sort()
+    scale = 1000 / rows
+    return cpu[len(cpu) // 2] * 1000 * scale, peak / 1024 * scale
+
+
+async def main(sizes, repeat):
+    async with bench_database() as engine:
+        user_id = await seed_user(engine)
+        await seed_todos(engine, user_id, max(sizes))
+
+        results = []
+        for rows in sizes:
+            orm_cpu, orm_mem = await measure(engine, entities, rows, repeat)
+            row_cpu, row_mem = await measure(engine, projection, rows, repeat)
+            results.append((rows, orm_cpu, row_cpu, orm_mem, row_mem))
+
+    print(f'Listagem de tarefas, mediana de {repeat}, valores por mil linhas')
+    print_table(
+        (
+            'linhas',
+            'CPU ms entidades',
+            'CPU ms projeção',
+            'pico KiB entidades',
+            'pico KiB projeção',
+        ),
+        results,
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10_000])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
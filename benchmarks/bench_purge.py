@@ -0,0 +1,118 @@
+"""Mede a latência das requisições durante a limpeza da lixeira.
+
+Semeia tarefas na lixeira, todas antigas, e mede `GET /todos/` de outro
+usuário em três situações: sem limpeza, durante a limpeza em lotes e
+durante uma limpeza em um único DELETE (lote do tamanho da tabela).
+
+Uso:
+    python -m benchmarks.bench_purge --rows 1000000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+
+from sqlalchemy import update
+from sqlalchemy.exc import OperationalError
+
+from benchmarks.common import (
+    auth_headers,
+    bench_client,
+    bench_database,
+    percentiles,
+    print_table,
+    seed_todos,
+    seed_user,
+)
+from fast_zero.models import Todo, TodoState
+from fast_zero.purge import purge_cutoff, purge_trash
+
+
+async def foreground(client, headers, until):
+    """Faz requisições em sequência até `until` terminar.
+
+    Retorna as latências e quantas requisições falharam; um DELETE longo
+    pode segurar a trava do SQLite além do `busy_timeout` dos leitores.
+    """
+    samples, errors = [], 0
+    while not until.done():
+        start = time.perf_counter()
+        try:
+            await client.get('/todos/', headers=headers)
+        except OperationalError:
+            errors += 1
+        samples.append(time.perf_counter() - start)
+    return samples, errors
+
+
+async def seed(engine, rows):
+    """Cria o dono da lixeira, com `rows` tarefas antigas, e o leitor."""
+    trash_id = await seed_user(engine, 'trash')
+    await seed_todos(engine, trash_id, rows)
+    async with engine.begin() as conn:
+        await conn.execute(
+            update(Todo)
+            .where(Todo.user_id == trash_id)
+            .values(
+                state=TodoState.trash,
+                updated_at=purge_cutoff(timedelta(days=60)),
+            ),
+        )
+    reader_id = await seed_user(engine, 'reader')
+    await seed_todos(engine, reader_id, 100)
+
+
+async def main(rows, batch_size, pause, idle):
+    results = []
+    for name, size in (
+        ('sem limpeza', None),
+        (f'lotes de {batch_size}', batch_size),
+        ('DELETE único', rows),
+    ):
+        async with bench_database() as engine:
+            await seed(engine, rows)
+            async with bench_client(engine) as client:
+                if size is None:
+                    until = asyncio.create_task(asyncio.sleep(idle))
+                else:
+                    until = asyncio.create_task(
+                        purge_trash(engine, timedelta(days=30), size, pause),
+                    )
+                samples, errors = await foreground(
+                    client,
+                    auth_headers('reader'),
+                    until,
+                )
+                await until
+
+        stats = percentiles(samples)
+        results.append((
+            name,
+            stats['count'],
+            errors,
+            stats['p50'],
+            stats['p99'],
+            max(samples) * 1000,
+        ))
+
+    print(f'GET /todos/ enquanto {rows} tarefas saem da lixeira (ms)')
+    print_table(
+        ('cenário', 'reqs', 'erros', 'p50', 'p99', 'máx'),
+        results,
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--pause', type=float, default=0.05)
+    parser.add_argument(
+        '--idle',
+        type=float,
+        default=5,
+        help='segundos medidos no cenário sem limpeza',
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.batch_size, args.pause, args.idle))
@@ -0,0 +1,88 @@
+"""Mede o polling das rotas públicas de usuários com e sem o cache.
+
+Cria `--users` usuários e faz `--requests` consultas alternando
+`GET /users/` e `GET /users/{id}` (ids variados), primeiro com o cache
+desligado e depois ligado.
+
+Uso:
+    python -m benchmarks.bench_response_cache --users 100 --requests 5000
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import insert
+
+from benchmarks.common import (
+    bench_client,
+    bench_database,
+    percentiles,
+    print_table,
+    timed,
+)
+from fast_zero.database import settings
+from fast_zero.metrics import RESPONSE_CACHE_REQUESTS, response_cache_hit_ratio
+from fast_zero.models import User
+from fast_zero.response_cache import MemoryStorage, response_cache
+
+
+async def seed(engine, count):
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(User),
+            [
+                {
+                    'username': f'user{n}',
+                    'email': f'user{n}@bench.com',
+                    'password': 'x',
+                }
+                for n in range(count)
+            ],
+        )
+
+
+async def poll(client, users, requests):
+    samples = []
+    for n in range(requests):
+        path = '/users/' if n % 2 else f'/users/{n % users + 1}'
+        _, elapsed = await timed(client.get(path))
+        samples.append(elapsed)
+    return samples
+
+
+async def main(users, requests):
+    results = []
+    async with bench_database() as engine:
+        await seed(engine, users)
+        async with bench_client(engine) as client:
+            for label, size in (
+                ('sem cache', 0),
+                ('com cache', settings.RESPONSE_CACHE_SIZE),
+            ):
+                response_cache.storage = MemoryStorage(
+                    size,
+                    settings.RESPONSE_CACHE_TTL,
+                )
+                RESPONSE_CACHE_REQUESTS.values.clear()
+                samples, elapsed = await timed(poll(client, users, requests))
+                stats = percentiles(samples)
+                results.append((
+                    label,
+                    requests / elapsed,
+                    stats['p50'],
+                    stats['p99'],
+                    response_cache_hit_ratio(),
+                ))
+
+    print(
+        f'{requests} consultas a GET /users/ e /users/{{id}}, {users} usuários'
+    )
+    print_table(('cenário', 'req/s', 'p50 ms', 'p99 ms', 'acertos'), results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.requests))
@@ -0,0 +1,58 @@
+"""Compara a busca textual (q=) com o filtro por substring (contains).
+
+Termos muito frequentes são o pior caso da busca ranqueada, que precisa
+ordenar todas as ocorrências; termos seletivos são o pior caso do
+`contains`, que varre a tabela inteira atrás de poucas linhas.
+
+Uso:
+    python -m benchmarks.bench_search --rows 1000000
+"""
+
+import argparse
+import asyncio
+import statistics
+
+from benchmarks.common import (
+    auth_headers,
+    bench_client,
+    bench_database,
+    print_table,
+    seed_todos,
+    seed_user,
+    timed,
+)
+
+
+async def main(rows, repeat):
+    async with bench_database() as engine:
+        user_id = await seed_user(engine)
+        await seed_todos(engine, user_id, rows)
+
+        headers = auth_headers()
+        results = []
+        async with bench_client(engine) as client:
+            for term in ('relatório', str(rows // 2), str(rows - 1)):
+                timings = {}
+                for label, url in (
+                    ('contains', f'/todos/?description={term}'),
+                    ('q', f'/todos/?q={term}'),
+                ):
+                    samples = []
+                    for _ in range(repeat):
+                        _, elapsed = await timed(
+                            client.get(url, headers=headers),
+                        )
+                        samples.append(elapsed * 1000)
+                    timings[label] = statistics.median(samples)
+                results.append((term, timings['contains'], timings['q']))
+
+    print(f'{rows} tarefas, mediana de {repeat} (ms)')
+    print_table(('termo', 'contains', 'q'), results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
@@ -0,0 +1,84 @@
+"""Compara o custo por linha da serialização das listagens.
+
+O caminho padrão repete o que o FastAPI faz com o `response_model`:
+valida cada objeto contra `TodoPublic` (`from_attributes`), converte com o
+`jsonable_encoder` e codifica com o `json` da biblioteca padrão. O caminho
+rápido monta os dicionários direto das linhas e codifica com o orjson.
+
+Uso:
+    python -m benchmarks.bench_serialization --rows 10 100 1000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.common import (
+    bench_database,
+    print_table,
+    seed_todos,
+    seed_user,
+)
+from fast_zero.models import Todo
+from fast_zero.schemas import TodoList
+from fast_zero.serialization import todo_list_response
+
+
+def response_model_path(todos):
+    content = TodoList.model_validate(
+        {'todos': todos, 'next_cursor': None},
+        from_attributes=True,
+    )
+    return JSONResponse(jsonable_encoder(content.model_dump(mode='json'))).body
+
+
+def fast_path(todos):
+    return todo_list_response(todos).body
+
+
+def per_row(func, todos, repeat):
+    """Mediana, em microssegundos por linha, de `repeat` execuções."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(todos)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] / len(todos) * 1_000_000
+
+
+async def main(sizes, repeat):
+    async with bench_database() as engine:
+        user_id = await seed_user(engine)
+        await seed_todos(engine, user_id, max(sizes))
+        async with AsyncSession(engine) as session:
+            todos = (await session.scalars(select(Todo))).all()
+
+    # Os dois caminhos precisam produzir o mesmo documento
+    assert json.loads(response_model_path(todos)) == json.loads(
+        fast_path(todos),
+    )
+
+    results = []
+    for rows in sizes:
+        page = todos[:rows]
+        slow = per_row(response_model_path, page, repeat)
+        fast = per_row(fast_path, page, repeat)
+        results.append((rows, slow, fast, slow / fast))
+
+    print(f'Serialização de listagens, mediana de {repeat} (µs por linha)')
+    print_table(('linhas', 'response_model', 'orjson', 'ganho'), results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
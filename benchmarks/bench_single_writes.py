@@ -0,0 +1,126 @@
+"""Compara PATCH e DELETE de uma tarefa antes e depois do RETURNING.
+
+As rotas antigas (SELECT, UPDATE e refresh; SELECT e DELETE) são montadas
+em `/legacy` só durante o benchmark, na mesma aplicação, e medidas lado a
+lado com as rotas atuais de `/todos`.
+
+Uso:
+    python -m benchmarks.bench_single_writes --todos 2000
+"""
+
+import argparse
+import asyncio
+from http import HTTPStatus
+
+from fastapi import APIRouter, HTTPException
+from sqlalchemy import select
+
+from benchmarks.common import (
+    auth_headers,
+    bench_client,
+    bench_database,
+    percentiles,
+    print_table,
+    seed_todos,
+    seed_user,
+    timed,
+)
+from fast_zero.app import app
+from fast_zero.models import Todo
+from fast_zero.routers.todos import CurrentUser, Session
+from fast_zero.schemas import Message, TodoPublic, TodoUpdate
+
+legacy = APIRouter(prefix='/legacy')
+
+
+async def _legacy_todo(session, user, todo_id):
+    todo = await session.scalar(
+        select(Todo).where(Todo.id == todo_id, Todo.user_id == user.id),
+    )
+    if not todo:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail='Task not found',
+        )
+    return todo
+
+
+@legacy.patch('/{todo_id}', response_model=TodoPublic)
+async def legacy_patch(
+    todo_id: int,
+    session: Session,
+    user: CurrentUser,
+    todo: TodoUpdate,
+):
+    db_todo = await _legacy_todo(session, user, todo_id)
+    for key, value in todo.model_dump(exclude_unset=True).items():
+        setattr(db_todo, key, value)
+    session.add(db_todo)
+    await session.commit()
+    await session.refresh(db_todo)
+    return db_todo
+
+
+@legacy.delete('/{todo_id}', response_model=Message)
+async def legacy_delete(todo_id: int, session: Session, user: CurrentUser):
+    todo = await _legacy_todo(session, user, todo_id)
+    await session.delete(todo)
+    await session.commit()
+    return {'message': 'Task has been deleted successfully.'}
+
+
+async def measure(client, headers, prefix, ids):
+    patches, deletes = [], []
+    for todo_id in ids:
+        _, elapsed = await timed(
+            client.patch(
+                f'{prefix}/{todo_id}',
+                headers=headers,
+                json={'state': 'done'},
+            )
+        )
+        patches.append(elapsed)
+    for todo_id in ids:
+        _, elapsed = await timed(
+            client.delete(f'{prefix}/{todo_id}', headers=headers),
+        )
+        deletes.append(elapsed)
+    return patches, deletes
+
+
+async def main(count):
+    app.include_router(legacy)
+    results = []
+    async with bench_database() as engine:
+        user_id = await seed_user(engine)
+        await seed_todos(engine, user_id, count * 2)
+        headers = auth_headers()
+        async with bench_client(engine) as client:
+            # Aquece o cache de usuários e as conexões
+            await client.get('/todos/?limit=1', headers=headers)
+            for label, prefix, ids in (
+                ('antes', '/legacy', range(1, count + 1)),
+                ('RETURNING', '/todos', range(count + 1, 2 * count + 1)),
+            ):
+                patches, deletes = await measure(client, headers, prefix, ids)
+                for method, samples in (
+                    ('PATCH', patches),
+                    ('DELETE', deletes),
+                ):
+                    stats = percentiles(samples)
+                    results.append((
+                        f'{method} {label}',
+                        stats['mean'],
+                        stats['p50'],
+                        stats['p99'],
+                    ))
+
+    print(f'{count} tarefas alteradas e removidas uma a uma (ms)')
+    print_table(('rota', 'média', 'p50', 'p99'), results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--todos', type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.todos))
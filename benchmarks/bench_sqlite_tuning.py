@@ -0,0 +1,122 @@
+"""Mede a vazão de leituras e escritas misturadas com e sem os PRAGMAs.
+
+`--clients` clientes concorrentes fazem, por `--seconds` segundos, uma
+escrita (criar ou alterar uma tarefa) a cada `--write-every` requisições
+e leituras de `GET /todos/` no resto. O cenário "padrão" usa o SQLite
+como vem (journal em rollback, synchronous=FULL, sem mmap); o outro, os
+PRAGMAs das settings (WAL, synchronous=NORMAL, busy_timeout, mmap...).
+
+Uso:
+    python -m benchmarks.bench_sqlite_tuning --clients 8 --seconds 10
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy.exc import OperationalError
+
+from benchmarks.common import (
+    auth_headers,
+    bench_client,
+    bench_database,
+    percentiles,
+    print_table,
+    seed_todos,
+    seed_user,
+)
+from fast_zero.database import settings, sqlite_pragmas
+
+ROWS = 10_000
+
+
+async def worker(client, n, deadline, write_every, results):
+    headers = auth_headers()
+    request = 0
+    while time.perf_counter() < deadline:
+        request += 1
+        is_write = request % write_every == 0
+        start = time.perf_counter()
+        try:
+            if is_write and request % (2 * write_every):
+                await client.post(
+                    '/todos/',
+                    headers=headers,
+                    json={'title': f'nova {n}', 'description': 'x'},
+                )
+            elif is_write:
+                await client.patch(
+                    f'/todos/{(n * 7919 + request) % ROWS + 1}',
+                    headers=headers,
+                    json={'state': 'done'},
+                )
+            else:
+                await client.get('/todos/?limit=20', headers=headers)
+        except OperationalError:
+            results['erros'] += 1
+            continue
+        kind = 'write' if is_write else 'read'
+        results[kind].append(time.perf_counter() - start)
+
+
+async def run(pragmas, clients, seconds, write_every):
+    results = {'read': [], 'write': [], 'erros': 0}
+    async with bench_database(pragmas=pragmas) as engine:
+        user_id = await seed_user(engine)
+        await seed_todos(engine, user_id, ROWS)
+        async with bench_client(engine) as client:
+            await client.get('/todos/?limit=1', headers=auth_headers())
+            deadline = time.perf_counter() + seconds
+            await asyncio.gather(
+                *(
+                    worker(client, n, deadline, write_every, results)
+                    for n in range(clients)
+                )
+            )
+    return results
+
+
+async def main(clients, seconds, write_every):
+    rows = []
+    for label, pragmas in (
+        ('padrão', {}),
+        ('settings', sqlite_pragmas(settings)),
+    ):
+        results = await run(pragmas, clients, seconds, write_every)
+        reads = percentiles(results['read'])
+        writes = percentiles(results['write'])
+        rows.append((
+            label,
+            (reads['count'] + writes['count']) / seconds,
+            reads['p50'],
+            reads['p99'],
+            writes['p50'],
+            writes['p99'],
+            results['erros'],
+        ))
+
+    print(
+        f'{clients} clientes por {seconds}s, uma escrita a cada '
+        f'{write_every} requisições'
+    )
+    print_table(
+        (
+            'PRAGMAs',
+            'req/s',
+            'leitura p50',
+            'leitura p99',
+            'escrita p50',
+            'escrita p99',
+            'erros',
+        ),
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--write-every', type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.clients, args.seconds, args.write_every))
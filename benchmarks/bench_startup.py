@@ -0,0 +1,126 @@
+"""Mede a partida a frio da aplicação e da CLI.
+
+Cada rodada é um processo Python novo com `-X importtime`. Para a
+aplicação, o processo importa `fast_zero.app`, roda o lifespan, responde a
+um `GET /` direto pelo ASGI e sai: o tempo total do processo é o tempo
+até a primeira resposta. Para a CLI, o processo roda `--help`. Ao fim,
+mostra os módulos do projeto que mais pesam na importação.
+
+Uso:
+    python -m benchmarks.bench_startup --runs 10
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks.common import print_table
+
+FIRST_RESPONSE = """
+import asyncio
+import os
+
+from fast_zero.app import app
+
+
+async def main():
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': '/',
+        'raw_path': b'/',
+        'query_string': b'',
+        'headers': [],
+        'client': ('127.0.0.1', 0),
+        'server': ('startup', 80),
+    }
+    statuses = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            statuses.append(message['status'])
+
+    async with app.router.lifespan_context(app):
+        await app(scope, receive, send)
+    # Sai sem a finalização do interpretador, que não faz parte da partida
+    os._exit(0 if statuses == [200] else 1)
+
+
+asyncio.run(main())
+"""
+
+SCENARIOS = {
+    'app: primeira resposta': ['-c', FIRST_RESPONSE],
+    'cli: --help': ['-m', 'fast_zero.cli', '--help'],
+}
+
+IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def run_once(args):
+    """Roda um processo e retorna os segundos, o total de imports e os
+    tempos cumulativos de cada módulo (em µs)."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed = time.perf_counter() - start
+    imports, total = {}, 0
+    for match in IMPORT_LINE.finditer(result.stderr):
+        imports[match[4]] = int(match[2])
+        # Só os imports de primeiro nível: os demais já estão somados neles
+        if len(match[3]) == 1:
+            total += int(match[2])
+    return elapsed, total, imports
+
+
+def main(runs, top):
+    results = []
+    slowest = defaultdict(list)
+    for name, args in SCENARIOS.items():
+        walls, totals = [], []
+        for _ in range(runs):
+            elapsed, total, imports = run_once(args)
+            walls.append(elapsed)
+            totals.append(total)
+            for module, us in imports.items():
+                if module.startswith('fast_zero'):
+                    slowest[module].append(us)
+        results.append((
+            name,
+            statistics.median(walls) * 1000,
+            min(walls) * 1000,
+            statistics.median(totals) / 1000,
+        ))
+
+    print(f'{runs} processos por cenário (ms)')
+    print_table(('cenário', 'mediana', 'mínimo', 'imports'), results)
+
+    print('\nMódulos do projeto mais lentos (cumulativo, mediana em ms)')
+    ranking = sorted(
+        ((m, statistics.median(v) / 1000) for m, v in slowest.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    print_table(('módulo', 'ms'), ranking[:top])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+    main(args.runs, args.top)
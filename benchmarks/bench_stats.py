@@ -0,0 +1,94 @@
+"""Compara a leitura dos contadores com a agregação na hora.
+
+A agregação faz um GROUP BY sobre as tarefas do usuário a cada chamada;
+os contadores são lidos direto da tabela mantida pelos triggers. As duas
+consultas são medidas sozinhas e a rota `GET /todos/stats` inteira, com
+autenticação e serialização, também.
+
+Uso:
+    python -m benchmarks.bench_stats --rows 10000 100000 1000000
+"""
+
+import argparse
+import asyncio
+import statistics
+
+from sqlalchemy import func, select
+
+from benchmarks.common import (
+    auth_headers,
+    bench_client,
+    bench_database,
+    print_table,
+    seed_todos,
+    seed_user,
+    timed,
+)
+from fast_zero.models import Todo, TodoCounter
+
+
+def aggregate(user_id):
+    return (
+        select(Todo.state, func.count())
+        .where(Todo.user_id == user_id)
+        .group_by(Todo.state)
+    )
+
+
+def counters(user_id):
+    return select(TodoCounter.state, TodoCounter.count).where(
+        TodoCounter.user_id == user_id,
+    )
+
+
+async def median_ms(conn, query, repeat):
+    samples = []
+    for _ in range(repeat):
+        _, elapsed = await timed(conn.execute(query))
+        samples.append(elapsed * 1000)
+    return statistics.median(samples)
+
+
+async def main(sizes, repeat):
+    results = []
+    for rows in sizes:
+        async with bench_database() as engine:
+            user_id = await seed_user(engine)
+            await seed_todos(engine, user_id, rows)
+
+            async with engine.connect() as conn:
+                group_by = await median_ms(conn, aggregate(user_id), repeat)
+                counter = await median_ms(conn, counters(user_id), repeat)
+
+            route_times = []
+            headers = auth_headers()
+            async with bench_client(engine) as client:
+                for _ in range(repeat):
+                    response, elapsed = await timed(
+                        client.get('/todos/stats', headers=headers),
+                    )
+                    route_times.append(elapsed * 1000)
+            assert response.json()['total'] == rows
+
+        results.append((
+            rows,
+            group_by,
+            counter,
+            statistics.median(route_times),
+        ))
+
+    print(f'Mediana de {repeat} chamadas (ms)')
+    print_table(
+        ('tarefas', 'GROUP BY', 'contadores', 'GET /todos/stats'),
+        results,
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
@@ -0,0 +1,162 @@
+"""Utilitários compartilhados pelos benchmarks.
+
+Os benchmarks rodam a aplicação em processo (ASGI) sobre um banco SQLite
+temporário, então precisam das mesmas variáveis de ambiente (ou `.env`)
+usadas pela aplicação.
+"""
+
+import statistics
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from fast_zero.app import app
+from fast_zero.database import (
+    get_read_session,
+    get_session,
+    set_sqlite_pragmas,
+    settings,
+    sqlite_pragmas,
+)
+from fast_zero.models import Todo, TodoState, User, table_registry
+from fast_zero.security import create_access_token
+
+STATES = list(TodoState)
+
+WORDS = (
+    'comprar pagar ligar revisar enviar estudar limpar marcar '
+    'consertar organizar agendar responder ler escrever treinar '
+    'mercado banco médico relatório contrato curso casa reunião '
+    'carro projeto viagem fatura cliente jardim livro academia'
+).split()
+
+
+def words(n, count):
+    """Gera um texto determinístico com `count` palavras do vocabulário."""
+    return ' '.join(
+        WORDS[(n * (i + 7) + i * i) % len(WORDS)] for i in range(count)
+    )
+
+
+@asynccontextmanager
+async def bench_database(path: Path | None = None, pragmas=None):
+    """Cria um banco SQLite temporário com o esquema da aplicação.
+
+    Usa os PRAGMAs das settings, a menos que `pragmas` seja informado.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = path or Path(tmp) / 'bench.db'
+        engine = set_sqlite_pragmas(
+            create_async_engine(f'sqlite+aiosqlite:///{path}'),
+            sqlite_pragmas(settings) if pragmas is None else pragmas,
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(table_registry.metadata.create_all)
+        try:
+            yield engine
+        finally:
+            await engine.dispose()
+
+
+async def seed_user(engine, username='bench', password='benchpassword'):
+    """Cria um usuário direto no banco e retorna o seu id."""
+    async with engine.begin() as conn:
+        return await conn.scalar(
+            insert(User)
+            .values(
+                username=username,
+                email=f'{username}@bench.com',
+                password=password,
+            )
+            .returning(User.id),
+        )
+
+
+async def seed_todos(engine, user_id, rows, batch=10_000):
+    """Insere `rows` tarefas para o usuário em lotes."""
+    async with engine.begin() as conn:
+        for start in range(0, rows, batch):
+            await conn.execute(
+                insert(Todo),
+                [
+                    {
+                        'title': f'{words(n, 3)} {n}',
+                        'description': words(n * 31, 12),
+                        'state': STATES[n % len(STATES)],
+                        'user_id': user_id,
+                    }
+                    for n in range(start, min(start + batch, rows))
+                ],
+            )
+
+
+def auth_headers(username='bench'):
+    """Gera o cabeçalho de autenticação sem passar pelo Argon2."""
+    token = create_access_token(data={'sub': f'{username}@bench.com'})
+    return {'Authorization': f'Bearer {token}'}
+
+
+@asynccontextmanager
+async def bench_client(engine):
+    """Cliente HTTP em processo com uma sessão nova por requisição."""
+
+    async def get_session_override():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_read_session] = get_session_override
+    transport = ASGITransport(app=app)
+    try:
+        async with AsyncClient(
+            transport=transport,
+            base_url='http://bench',
+        ) as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+
+
+async def timed(coro):
+    """Executa a corrotina e retorna (resultado, segundos)."""
+    start = time.perf_counter()
+    result = await coro
+    return result, time.perf_counter() - start
+
+
+def percentiles(samples):
+    """Resume uma lista de latências (em segundos) em milissegundos."""
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {
+        'count': len(ordered),
+        'mean': statistics.fmean(ordered) * 1000,
+        'p50': pick(0.50),
+        'p95': pick(0.95),
+        'p99': pick(0.99),
+    }
+
+
+def print_table(headers, rows):
+    """Imprime uma tabela simples alinhada à direita."""
+    widths = [
+        max(len(str(h)), *(len(_fmt(r[i])) for r in rows))
+        for i, h in enumerate(headers)
+    ]
+    print('  '.join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print('  '.join(_fmt(v).rjust(w) for v, w in zip(row, widths)))
+
+
+def _fmt(value):
+    if isinstance(value, float):
+        return f'{value:.3f}'
+    return str(value)
@@ -0,0 +1,251 @@
+"""Teste de carga em processo da aplicação.
+
+Usuários virtuais concorrentes fazem login e depois executam uma mistura
+de listagens, criações, alterações e remoções de tarefas contra a
+aplicação ASGI real, sobre um banco SQLite semeado. O resultado traz a
+vazão e os percentis p50/p95/p99 por rota.
+
+Uso:
+    python -m benchmarks.loadtest --users 20 --seconds 10 --save base.json
+    python -m benchmarks.loadtest --compare base.json --threshold 0.15
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from http import HTTPStatus
+
+from benchmarks.common import (
+    bench_client,
+    bench_database,
+    percentiles,
+    print_table,
+    seed_todos,
+    seed_user,
+)
+from fast_zero import ratelimit
+from fast_zero.hashing import get_password_hash
+
+PASSWORD = 'loadtestpassword'
+
+# Peso de cada ação na mistura de cada usuário virtual
+MIX = {
+    'list': 50,
+    'create': 20,
+    'patch': 18,
+    'delete': 10,
+    'login': 2,
+}
+
+
+class VirtualUser:
+    def __init__(self, client, username, rng, samples):
+        self.client = client
+        self.username = username
+        self.rng = rng
+        self.samples = samples
+        self.headers = {}
+        self.todo_ids = []
+
+    async def request(self, route, method, url, **kwargs):
+        start = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        elapsed = time.perf_counter() - start
+        self.samples[route].append((elapsed, response.status_code))
+        return response
+
+    async def login(self):
+        response = await self.request(
+            'POST /auth/token',
+            'POST',
+            '/auth/token',
+            data={
+                'username': f'{self.username}@bench.com',
+                'password': PASSWORD,
+            },
+        )
+        if response.is_success:
+            token = response.json()['access_token']
+            self.headers = {'Authorization': f'Bearer {token}'}
+
+    async def list(self):
+        response = await self.request(
+            'GET /todos/',
+            'GET',
+            '/todos/',
+            params={'limit': 50},
+            headers=self.headers,
+        )
+        if response.is_success:
+            self.todo_ids = [todo['id'] for todo in response.json()['todos']]
+
+    async def create(self):
+        response = await self.request(
+            'POST /todos/',
+            'POST',
+            '/todos/',
+            headers=self.headers,
+            json={
+                'title': f'carga {self.rng.random()}',
+                'description': 'criada pelo teste de carga',
+                'state': 'todo',
+            },
+        )
+        if response.is_success:
+            self.todo_ids.append(response.json()['id'])
+
+    async def patch(self):
+        if not self.todo_ids:
+            return await self.list()
+        await self.request(
+            'PATCH /todos/{todo_id}',
+            'PATCH',
+            f'/todos/{self.rng.choice(self.todo_ids)}',
+            headers=self.headers,
+            json={'state': self.rng.choice(['doing', 'done'])},
+        )
+
+    async def delete(self):
+        if not self.todo_ids:
+            return await self.list()
+        todo_id = self.todo_ids.pop(self.rng.randrange(len(self.todo_ids)))
+        await self.request(
+            'DELETE /todos/{todo_id}',
+            'DELETE',
+            f'/todos/{todo_id}',
+            headers=self.headers,
+        )
+
+    async def run(self, deadline):
+        await self.login()
+        actions, weights = zip(*MIX.items())
+        while time.perf_counter() < deadline:
+            action = self.rng.choices(actions, weights)[0]
+            await getattr(self, action)()
+
+
+def summarize(samples, elapsed):
+    routes = {}
+    for route, entries in sorted(samples.items()):
+        stats = percentiles([latency for latency, _ in entries])
+        stats['errors'] = sum(
+            1 for _, status in entries if status >= HTTPStatus.BAD_REQUEST
+        )
+        stats['throughput'] = len(entries) / elapsed
+        routes[route] = stats
+    return routes
+
+
+def compare(current, baseline, threshold):
+    """Lista as rotas cuja latência ou vazão piorou além do limite."""
+    regressions = []
+    for route, base in baseline['routes'].items():
+        now = current['routes'].get(route)
+        if now is None:
+            continue
+        for metric in ('p50', 'p95', 'p99'):
+            if now[metric] > base[metric] * (1 + threshold):
+                regressions.append((route, metric, base[metric], now[metric]))
+        if now['throughput'] < base['throughput'] * (1 - threshold):
+            regressions.append((
+                route,
+                'throughput',
+                base['throughput'],
+                now['throughput'],
+            ))
+    return regressions
+
+
+async def run(users, seconds, todos, seed):
+    # Todos os usuários virtuais saem do mesmo endereço do transporte ASGI
+    ratelimit.ip_limiter.rate = 0
+    async with bench_database() as engine:
+        password = get_password_hash(PASSWORD)
+        for n in range(users):
+            user_id = await seed_user(engine, f'vu{n}', password)
+            await seed_todos(engine, user_id, todos)
+
+        samples = defaultdict(list)
+        async with bench_client(engine) as client:
+            start = time.perf_counter()
+            deadline = start + seconds
+            await asyncio.gather(
+                *(
+                    VirtualUser(
+                        client,
+                        f'vu{n}',
+                        random.Random(seed + n),
+                        samples,
+                    ).run(deadline)
+                    for n in range(users)
+                )
+            )
+            elapsed = time.perf_counter() - start
+
+    return {
+        'meta': {
+            'users': users,
+            'seconds': seconds,
+            'todos_per_user': todos,
+            'seed': seed,
+        },
+        'routes': summarize(samples, elapsed),
+    }
+
+
+def report(result):
+    print_table(
+        ('rota', 'reqs', 'erros', 'req/s', 'p50', 'p95', 'p99'),
+        [
+            (
+                route,
+                stats['count'],
+                stats['errors'],
+                stats['throughput'],
+                stats['p50'],
+                stats['p95'],
+                stats['p99'],
+            )
+            for route, stats in result['routes'].items()
+        ],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--todos', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save', help='grava o resultado como baseline')
+    parser.add_argument('--compare', help='baseline para comparação')
+    parser.add_argument('--threshold', type=float, default=0.10)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.users, args.seconds, args.todos, args.seed))
+    report(result)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump(result, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(result, baseline, args.threshold)
+        if regressions:
+            print(f'\nRegressões acima de {args.threshold:.0%}:')
+            print_table(('rota', 'métrica', 'baseline', 'atual'), regressions)
+            sys.exit(1)
+        print(f'\nSem regressões acima de {args.threshold:.0%}.')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,45 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from http import HTTPStatus
 
 from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 
+from fast_zero.database import engine, pool_status, read_engine, settings
+from fast_zero.hashing import password_pool
+from fast_zero.metrics import (
+    CONTENT_TYPE,
+    CallbackGauge,
+    MetricsMiddleware,
+    registry,
+)
+from fast_zero.purge import purge_worker
+from fast_zero.replica import ReadYourWritesMiddleware
 from fast_zero.routers import auth, todos, users
-from fast_zero.schemas import Message
+from fast_zero.schemas import Message, PoolStatus
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    purge_task = None
+    if settings.TRASH_PURGE_INTERVAL > 0:
+        purge_task = asyncio.create_task(purge_worker(engine, settings))
+
+    yield
+
+    if purge_task is not None:
+        purge_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await purge_task
+    password_pool.shutdown()
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(users.router)
 app.include_router(todos.router)
@@ -30,3 +63,38 @@ async def send_html():
         </body>
     </html>
     """
+
+
+@app.get(
+    '/health/pool',
+    status_code=HTTPStatus.OK,
+    response_model=PoolStatus,
+)
+async def read_pool_status():
+    """Retorna as estatísticas do pool de conexões do banco."""
+    return pool_status()
+
+
+for name, documentation in (
+    ('checked_out', 'Conexões em uso no pool do banco.'),
+    ('overflow', 'Conexões abertas além do tamanho do pool.'),
+    ('size', 'Tamanho configurado do pool do banco.'),
+    ('wait_count', 'Checkouts de conexão feitos no pool.'),
+    ('wait_time_total', 'Tempo total de espera por conexões do pool.'),
+):
+    CallbackGauge(
+        f'db_pool_{name}',
+        documentation,
+        lambda name=name: pool_status()[name],
+    )
+
+
+@app.get(
+    '/metrics',
+    status_code=HTTPStatus.OK,
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+)
+async def read_metrics():
+    """Exporta as métricas no formato texto do Prometheus."""
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
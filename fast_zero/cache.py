@@ -0,0 +1,127 @@
+"""Cache dos usuários autenticados (principals).
+
+`get_current_user` consulta o cache pelo `sub` do token antes de ir ao
+banco. As entradas têm tamanho máximo (LRU), um TTL e nunca vivem além do
+`exp` do token que as criou.
+
+A invalidação passa por um broker: `update_user` e `delete_user`
+publicam o `sub` alterado e cada processo inscrito descarta a sua cópia.
+O `LocalBroker` entrega as mensagens dentro do próprio processo; com
+vários workers do uvicorn ele pode ser trocado por qualquer objeto com a
+mesma interface (`subscribe`/`publish`) apoiado em Redis, NOTIFY etc.
+"""
+
+import time
+from collections import OrderedDict
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from fast_zero.metrics import PRINCIPAL_CACHE_REQUESTS
+from fast_zero.models import User
+from fast_zero.settings import get_settings
+
+settings = get_settings()
+
+
+class TTLCache:
+    """Cache LRU em memória com expiração por entrada."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            self._data.pop(key, None)
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key, value, ttl: float | None = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class LocalBroker:
+    """Broker de invalidação que entrega as mensagens no próprio processo."""
+
+    def __init__(self):
+        self.subscribers = []
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    async def publish(self, message: str):
+        for callback in self.subscribers:
+            callback(message)
+
+
+class PrincipalCache:
+    """Guarda cópias destacadas dos usuários autenticados, por `sub`."""
+
+    def __init__(self, cache: TTLCache, broker):
+        self.cache = cache
+        self.broker = broker
+        # Incrementada a cada invalidação; uma leitura do banco iniciada
+        # antes dela não pode repovoar o cache com dados antigos
+        self.generation = 0
+        broker.subscribe(self._on_invalidate)
+
+    def get(self, subject: str) -> User | None:
+        user = self.cache.get(subject)
+        PRINCIPAL_CACHE_REQUESTS.inc('hit' if user else 'miss')
+        return user
+
+    def set(self, subject: str, user: User, expires_at: float, generation):
+        if generation != self.generation:
+            return
+        snapshot = User(
+            username=user.username,
+            password=user.password,
+            email=user.email,
+        )
+        snapshot.id = user.id
+        snapshot.created_at = user.created_at
+        snapshot.updated_at = user.updated_at
+        make_transient_to_detached(snapshot)
+        self.cache.set(subject, snapshot, expires_at - time.time())
+
+    async def invalidate(self, subject: str):
+        await self.broker.publish(subject)
+
+    def clear(self):
+        self.generation += 1
+        self.cache.clear()
+
+    def _on_invalidate(self, subject: str):
+        self.generation += 1
+        self.cache.delete(subject)
+
+
+principal_cache = PrincipalCache(
+    TTLCache(
+        maxsize=settings.PRINCIPAL_CACHE_SIZE,
+        ttl=settings.PRINCIPAL_CACHE_TTL,
+    ),
+    LocalBroker(),
+)
@@ -0,0 +1,211 @@
+"""Comandos de manutenção da aplicação.
+
+Cada comando importa só o que usa, dentro da própria função: o processo
+da CLI é curto e não precisa carregar a aplicação inteira (FastAPI,
+routers) para copiar um banco ou calibrar o Argon2.
+
+Uso:
+    python -m fast_zero.cli rebuild-counters [--user-id ID]
+    python -m fast_zero.cli purge-trash [--older-than-days N]
+        [--tombstone-retention-days N]
+    python -m fast_zero.cli calibrate-argon2 [--target-ms MS] [--write-env]
+    python -m fast_zero.cli copy-replica ORIGEM DESTINO [--interval S]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from fast_zero.settings import get_settings
+
+
+async def rebuild_counters(user_id: int | None):
+    from fast_zero.counters import rebuild_todo_counters
+    from fast_zero.database import engine
+
+    async with engine.begin() as conn:
+        rows = await rebuild_todo_counters(conn, user_id)
+    await engine.dispose()
+    print(f'{rows} contadores reconstruídos')
+
+
+async def purge(
+    older_than_days: int,
+    tombstone_retention_days: int,
+    batch_size: int,
+    pause: float,
+):
+    from fast_zero.database import engine
+    from fast_zero.purge import purge_tombstones, purge_trash
+
+    purged = await purge_trash(
+        engine,
+        timedelta(days=older_than_days),
+        batch_size,
+        pause,
+    )
+    expired = await purge_tombstones(
+        engine,
+        timedelta(days=tombstone_retention_days),
+        batch_size,
+        pause,
+    )
+    await engine.dispose()
+    print(f'{purged} tarefas removidas da lixeira')
+    print(f'{expired} lápides da sincronia removidas')
+
+
+def write_env(path: Path, values: dict):
+    """Grava `values` no arquivo .env, substituindo as chaves existentes."""
+    lines = (
+        path.read_text(encoding='utf-8').splitlines() if path.exists() else []
+    )
+    lines = [
+        line for line in lines if line.split('=', 1)[0].strip() not in values
+    ]
+    lines.extend(f'{key}={value}' for key, value in values.items())
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def calibrate(target_ms: float, max_memory_mib: int, parallelism: int, env):
+    from fast_zero.hashing import calibrate_argon2
+
+    result = calibrate_argon2(
+        target_ms / 1000,
+        max_memory_mib * 1024,
+        parallelism,
+    )
+    elapsed = result.pop('elapsed')
+    print(f'Hash em {elapsed * 1000:.0f} ms (alvo {target_ms:.0f} ms):')
+    for key, value in result.items():
+        print(f'{key}={value}')
+    if env:
+        write_env(Path(env), result)
+        print(f'Gravado em {env}')
+
+
+def copy_replica(source: Path, target: Path, interval: float):
+    """Copia o SQLite primário para a réplica a cada `interval` segundos.
+
+    Com intervalo 0 copia uma vez só.
+    """
+    from fast_zero.replica import copy_sqlite_database
+
+    while True:
+        copy_sqlite_database(source, target)
+        print(f'{source} copiado para {target}')
+        if interval <= 0:
+            return
+        time.sleep(interval)
+
+
+def main(argv=None):
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    rebuild = commands.add_parser(
+        'rebuild-counters',
+        help='recalcula os contadores de tarefas por estado',
+    )
+    rebuild.add_argument(
+        '--user-id',
+        type=int,
+        help='reconstrói apenas os contadores deste usuário',
+    )
+
+    purge_parser = commands.add_parser(
+        'purge-trash',
+        help=(
+            'remove de vez as tarefas antigas da lixeira e as lápides '
+            'vencidas da sincronia'
+        ),
+    )
+    purge_parser.add_argument(
+        '--older-than-days',
+        type=int,
+        default=settings.TRASH_PURGE_AFTER_DAYS,
+    )
+    purge_parser.add_argument(
+        '--tombstone-retention-days',
+        type=int,
+        default=settings.TODO_TOMBSTONE_RETENTION_DAYS,
+    )
+    purge_parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=settings.TRASH_PURGE_BATCH_SIZE,
+    )
+    purge_parser.add_argument(
+        '--pause',
+        type=float,
+        default=settings.TRASH_PURGE_PAUSE,
+        help='segundos de pausa entre os lotes',
+    )
+
+    calibrate_parser = commands.add_parser(
+        'calibrate-argon2',
+        help='mede o host e escolhe os custos do Argon2',
+    )
+    calibrate_parser.add_argument(
+        '--target-ms',
+        type=float,
+        default=250,
+        help='latência desejada para um hash',
+    )
+    calibrate_parser.add_argument('--max-memory-mib', type=int, default=256)
+    calibrate_parser.add_argument(
+        '--parallelism',
+        type=int,
+        default=settings.ARGON2_PARALLELISM,
+    )
+    calibrate_parser.add_argument(
+        '--write-env',
+        nargs='?',
+        const='.env',
+        help='grava o resultado no arquivo de configuração (padrão .env)',
+    )
+
+    replica_parser = commands.add_parser(
+        'copy-replica',
+        help='copia um banco SQLite para servir de réplica local',
+    )
+    replica_parser.add_argument('source', type=Path)
+    replica_parser.add_argument('target', type=Path)
+    replica_parser.add_argument(
+        '--interval',
+        type=float,
+        default=0,
+        help='segundos entre as cópias (0 copia uma vez)',
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == 'rebuild-counters':
+        asyncio.run(rebuild_counters(args.user_id))
+    elif args.command == 'purge-trash':
+        asyncio.run(
+            purge(
+                args.older_than_days,
+                args.tombstone_retention_days,
+                args.batch_size,
+                args.pause,
+            ),
+        )
+    elif args.command == 'calibrate-argon2':
+        calibrate(
+            args.target_ms,
+            args.max_memory_mib,
+            args.parallelism,
+            args.write_env,
+        )
+    elif args.command == 'copy-replica':
+        copy_replica(args.source, args.target, args.interval)
+
+
+if __name__ == '__main__':
+    main()
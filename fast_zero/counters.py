@@ -0,0 +1,34 @@
+from sqlalchemy import delete, func, insert, select, text
+
+from fast_zero.models import Todo, TodoCounter
+
+
+async def rebuild_todo_counters(conn, user_id: int | None = None) -> int:
+    """Recalcula os contadores a partir das tarefas, em lote.
+
+    Deve rodar dentro de uma transação (`engine.begin()`). No Postgres a
+    tabela de tarefas fica bloqueada para escrita até o commit, para que
+    nenhum trigger altere os contadores no meio da reconstrução; no
+    SQLite a própria transação de escrita já serializa os writers.
+    Retorna a quantidade de contadores gravados.
+    """
+    if conn.dialect.name == 'postgresql':
+        await conn.execute(text('LOCK TABLE todos IN SHARE MODE'))
+
+    clear = delete(TodoCounter)
+    totals = select(Todo.user_id, Todo.state, func.count()).group_by(
+        Todo.user_id,
+        Todo.state,
+    )
+    if user_id is not None:
+        clear = clear.where(TodoCounter.user_id == user_id)
+        totals = totals.where(Todo.user_id == user_id)
+
+    await conn.execute(clear)
+    result = await conn.execute(
+        insert(TodoCounter).from_select(
+            ['user_id', 'state', 'count'],
+            totals,
+        ),
+    )
+    return result.rowcount
@@ -1,11 +1,172 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import time
 
-from fast_zero.settings import Settings
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.requests import Request
 
-engine = create_async_engine(Settings().DATABASE_URL)
+from fast_zero.replica import is_pinned
+from fast_zero.settings import Settings, get_settings
 
+settings = get_settings()
 
-def get_session():
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Pool de conexões que registra o tempo gasto nos checkouts."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.wait_count += 1
+            self.wait_time_total += elapsed
+            self.wait_time_max = max(self.wait_time_max, elapsed)
+
+
+def _is_memory_database(url) -> bool:
+    return url.get_backend_name() == 'sqlite' and url.database in {
+        None,
+        '',
+        ':memory:',
+    }
+
+
+def sqlite_pragmas(settings: Settings) -> dict:
+    """PRAGMAs do SQLite definidos pelas settings."""
+    return {
+        'journal_mode': settings.SQLITE_JOURNAL_MODE,
+        'synchronous': settings.SQLITE_SYNCHRONOUS,
+        'busy_timeout': settings.SQLITE_BUSY_TIMEOUT,
+        'cache_size': settings.SQLITE_CACHE_SIZE,
+        'mmap_size': settings.SQLITE_MMAP_SIZE,
+        'temp_store': settings.SQLITE_TEMP_STORE,
+    }
+
+
+def set_sqlite_pragmas(engine, pragmas: dict | None = None):
+    """Aplica os PRAGMAs em cada conexão nova do SQLite.
+
+    `foreign_keys` é sempre ligado: sem ele o SQLite ignora o
+    ON DELETE CASCADE de `todos.user_id`.
+    """
+    if engine.dialect.name == 'sqlite':
+        statements = [
+            f'PRAGMA {name}={value}'
+            for name, value in {
+                'foreign_keys': 'ON',
+                **(pragmas or {}),
+            }.items()
+        ]
+
+        @event.listens_for(engine.sync_engine, 'connect')
+        def _set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.close()
+
+    return engine
+
+
+def engine_options(settings: Settings, url: str | None = None):
+    """Monta a URL e as opções do engine para o dialeto configurado.
+
+    Sem `url`, usa a `DATABASE_URL` das settings.
+    """
+    url = make_url(url or settings.DATABASE_URL)
+    options = {'pool_pre_ping': settings.DATABASE_POOL_PRE_PING}
+
+    # Bancos em memória usam um pool estático, sem tamanho configurável
+    if not _is_memory_database(url):
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+            pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        )
+
+    if url.get_driver_name() == 'asyncpg':
+        # O cache do asyncpg guarda os statements preparados por conexão;
+        # o do SQLAlchemy evita repreparar o mesmo SQL a cada execução
+        options['connect_args'] = {
+            'statement_cache_size': settings.ASYNCPG_STATEMENT_CACHE_SIZE,
+        }
+        url = url.update_query_dict({
+            'prepared_statement_cache_size': str(
+                settings.ASYNCPG_PREPARED_STATEMENT_CACHE_SIZE
+            ),
+        })
+
+    return url, options
+
+
+def build_engine(settings: Settings, url: str | None = None):
+    """Cria o engine assíncrono com o pool e os ajustes do dialeto."""
+    url, options = engine_options(settings, url)
+    return set_sqlite_pragmas(
+        create_async_engine(url, **options),
+        sqlite_pragmas(settings),
+    )
+
+
+engine = build_engine(settings)
+read_engine = (
+    build_engine(settings, settings.READ_DATABASE_URL)
+    if settings.READ_DATABASE_URL
+    else engine
+)
+
+SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+ReadSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False)
+
+
+async def get_session():
     """Cria uma nova sessão de banco de dados."""
-    with AsyncSession(engine, expire_on_commit=False) as session:
+    async with SessionLocal() as session:
+        yield session
+
+
+async def get_read_session(request: Request):
+    """Cria uma sessão para rotas somente leitura.
+
+    Usa a réplica, exceto para quem escreveu há pouco
+    (`READ_YOUR_WRITES_SECONDS`), que continua lendo do primário.
+    """
+    factory = SessionLocal if is_pinned(request.scope) else ReadSessionLocal
+    async with factory() as session:
         yield session
+
+
+def pool_status(engine=engine) -> dict:
+    """Retorna as estatísticas atuais do pool de conexões do engine."""
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {
+            'size': 0,
+            'checked_out': 0,
+            'checked_in': 0,
+            'overflow': 0,
+            'wait_count': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+        }
+
+    return {
+        'size': pool.size(),
+        'checked_out': pool.checkedout(),
+        'checked_in': pool.checkedin(),
+        'overflow': max(pool.overflow(), 0),
+        'wait_count': pool.wait_count,
+        'wait_time_total': pool.wait_time_total,
+        'wait_time_max': pool.wait_time_max,
+    }
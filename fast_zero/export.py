@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+import zlib
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fast_zero.models import Todo
+
+EXPORT_COLUMNS = (
+    Todo.id,
+    Todo.title,
+    Todo.description,
+    Todo.state,
+    Todo.created_at,
+    Todo.updated_at,
+)
+EXPORT_FIELDS = tuple(column.key for column in EXPORT_COLUMNS)
+
+MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def _values(row):
+    return (
+        row.id,
+        row.title,
+        row.description,
+        row.state.value,
+        row.created_at.isoformat(),
+        row.updated_at.isoformat(),
+    )
+
+
+def encode_ndjson(rows, header=False) -> bytes:
+    return b''.join(
+        json.dumps(
+            dict(zip(EXPORT_FIELDS, _values(row))),
+            ensure_ascii=False,
+        ).encode()
+        + b'\n'
+        for row in rows
+    )
+
+
+def encode_csv(rows, header=False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows(_values(row) for row in rows)
+    return buffer.getvalue().encode()
+
+
+ENCODERS = {
+    'ndjson': encode_ndjson,
+    'csv': encode_csv,
+}
+
+
+async def export_todos(bind, user_id, fmt, compress, chunk_size=1000):
+    """Gera a exportação das tarefas do usuário em blocos de bytes.
+
+    As linhas vêm de um cursor do lado do servidor, `chunk_size` por vez,
+    e cada bloco é codificado (e comprimido) antes de buscar o próximo,
+    então a memória usada não depende do total de tarefas.
+
+    A sessão é aberta aqui, e não recebida da dependência, porque a
+    resposta é enviada depois que as dependências já foram encerradas.
+    """
+    encode = ENCODERS[fmt]
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    async with AsyncSession(bind) as session:
+        result = await session.stream(
+            select(*EXPORT_COLUMNS)
+            .where(Todo.user_id == user_id)
+            .order_by(Todo.id)
+            .execution_options(yield_per=chunk_size),
+        )
+        header = True
+        async for rows in result.partitions():
+            chunk = encode(rows, header=header)
+            header = False
+            if compressor:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+
+    if header and fmt == 'csv':
+        chunk = encode([], header=True)
+        yield compressor.compress(chunk) if compressor else chunk
+    if compressor:
+        yield compressor.flush()
@@ -0,0 +1,185 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from http import HTTPStatus
+
+from fastapi import HTTPException
+
+from fast_zero.metrics import observe_password_hash
+from fast_zero.settings import get_settings
+
+settings = get_settings()
+
+
+@lru_cache
+def get_pwd_context():
+    """Contexto do Argon2, montado no primeiro hash e não na importação."""
+    from pwdlib import PasswordHash
+    from pwdlib.hashers.argon2 import Argon2Hasher
+
+    return PasswordHash((
+        Argon2Hasher(
+            time_cost=settings.ARGON2_TIME_COST,
+            memory_cost=settings.ARGON2_MEMORY_COST,
+            parallelism=settings.ARGON2_PARALLELISM,
+        ),
+    ))
+
+
+def get_password_hash(password: str) -> str:
+    return get_pwd_context().hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Indica se o hash foi gerado com parâmetros diferentes dos atuais."""
+    return get_pwd_context().current_hasher.check_needs_rehash(
+        hashed_password,
+    )
+
+
+# Memórias testadas na calibração, em KiB (de 1 GiB a 16 MiB)
+ARGON2_MEMORY_CANDIDATES = tuple(2**n for n in range(20, 13, -1))
+ARGON2_MAX_TIME_COST = 10
+
+
+def measure_argon2(time_cost, memory_cost, parallelism, rounds=3) -> float:
+    """Mediana, em segundos, do tempo de um hash com esses parâmetros."""
+    from pwdlib.hashers.argon2 import Argon2Hasher
+
+    hasher = Argon2Hasher(
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+    )
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        hasher.hash('calibration password')
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def calibrate_argon2(
+    target: float,
+    max_memory_cost: int,
+    parallelism: int,
+    measure=measure_argon2,
+) -> dict:
+    """Escolhe os parâmetros do Argon2 para um hash levar até `target` s.
+
+    Prioriza a memória, como recomenda a RFC 9106: usa a maior memória
+    (até `max_memory_cost` KiB) em que uma passada cabe no orçamento e
+    depois aumenta o `time_cost` enquanto o tempo continuar dentro dele.
+    """
+    candidates = [m for m in ARGON2_MEMORY_CANDIDATES if m <= max_memory_cost]
+    for memory_cost in candidates:
+        elapsed = measure(1, memory_cost, parallelism)
+        if elapsed > target and memory_cost != candidates[-1]:
+            continue
+
+        time_cost = 1
+        while time_cost < ARGON2_MAX_TIME_COST:
+            next_elapsed = measure(time_cost + 1, memory_cost, parallelism)
+            if next_elapsed > target:
+                break
+            time_cost += 1
+            elapsed = next_elapsed
+
+        return {
+            'ARGON2_TIME_COST': time_cost,
+            'ARGON2_MEMORY_COST': memory_cost,
+            'ARGON2_PARALLELISM': parallelism,
+            'elapsed': elapsed,
+        }
+    raise ValueError('max_memory_cost is below the smallest candidate')
+
+
+class PasswordWorkerPool:
+    """Executa as operações do Argon2 fora do event loop.
+
+    `max_pending` limita quantas operações podem estar em andamento
+    (executando ou na fila); acima disso a requisição falha na hora com
+    503 em vez de esperar indefinidamente. Com `workers=0` as operações
+    rodam no próprio event loop.
+    """
+
+    def __init__(self, workers: int, max_pending: int, kind: str = 'thread'):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.kind = kind
+        self.pending = 0
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.kind == 'process':
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix='argon2',
+                )
+        return self._executor
+
+    async def run(self, func, *args):
+        if not self.workers:
+            return func(*args)
+
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail='Server is busy, try again later',
+                headers={'Retry-After': '1'},
+            )
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(),
+                func,
+                *args,
+            )
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_pool = PasswordWorkerPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+)
+
+
+async def get_password_hash_async(password: str) -> str:
+    start = time.perf_counter()
+    try:
+        return await password_pool.run(get_password_hash, password)
+    finally:
+        observe_password_hash('hash', time.perf_counter() - start)
+
+
+async def verify_password_async(
+    plain_password: str,
+    hashed_password: str,
+) -> bool:
+    start = time.perf_counter()
+    try:
+        return await password_pool.run(
+            verify_password,
+            plain_password,
+            hashed_password,
+        )
+    finally:
+        observe_password_hash('verify', time.perf_counter() - start)
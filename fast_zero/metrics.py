@@ -0,0 +1,338 @@
+"""Métricas da aplicação no formato texto do Prometheus.
+
+Implementação enxuta de contadores, gauges e histogramas, sem dependências
+externas. As observações acontecem no event loop, então não há travas.
+"""
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+def _escape(value) -> str:
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\n', '\\n')
+        .replace('"', '\\"')
+    )
+
+
+def _labels(names, values, extra=()) -> str:
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _number(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=(), registry=registry):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        registry.register(self)
+
+    def inc(self, *labelvalues, amount=1):
+        self.values[labelvalues] = self.values.get(labelvalues, 0) + amount
+
+    def samples(self):
+        for labelvalues, value in self.values.items():
+            labels = _labels(self.labelnames, labelvalues)
+            yield f'{self.name}{labels} {_number(value)}'
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def dec(self, *labelvalues, amount=1):
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, *labelvalues, value):
+        self.values[labelvalues] = value
+
+
+class CallbackGauge:
+    """Gauge cujos valores são lidos de uma função no momento da coleta."""
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, callback, registry=registry):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        registry.register(self)
+
+    def samples(self):
+        yield f'{self.name} {_number(self.callback())}'
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name,
+        documentation,
+        labelnames=(),
+        buckets=LATENCY_BUCKETS,
+        registry=registry,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.values = {}
+        registry.register(self)
+
+    def observe(self, value, *labelvalues):
+        series = self.values.get(labelvalues)
+        if series is None:
+            # contagem por bucket (não cumulativa) + soma + total
+            series = self.values[labelvalues] = [
+                [0] * (len(self.buckets) + 1),
+                0.0,
+                0,
+            ]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self):
+        for labelvalues, (counts, total, count) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(
+                (*self.buckets, float('inf')),
+                counts,
+            ):
+                cumulative += bucket_count
+                labels = _labels(
+                    self.labelnames,
+                    labelvalues,
+                    (('le', _number(bound)),),
+                )
+                yield f'{self.name}_bucket{labels} {cumulative}'
+            labels = _labels(self.labelnames, labelvalues)
+            yield f'{self.name}_sum{labels} {_number(total)}'
+            yield f'{self.name}_count{labels} {count}'
+
+
+HTTP_REQUESTS = Counter(
+    'http_requests_total',
+    'Requisições HTTP por rota e status.',
+    ('method', 'route', 'status'),
+)
+HTTP_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'Latência das requisições HTTP por rota.',
+    ('method', 'route'),
+)
+HTTP_IN_PROGRESS = Gauge(
+    'http_requests_in_progress',
+    'Requisições HTTP em andamento.',
+    ('method',),
+)
+HTTP_DB_QUERIES = Histogram(
+    'http_request_db_queries',
+    'Comandos SQL executados por requisição.',
+    ('method', 'route'),
+    buckets=COUNT_BUCKETS,
+)
+HTTP_DB_SECONDS = Histogram(
+    'http_request_db_seconds',
+    'Tempo gasto no banco por requisição.',
+    ('method', 'route'),
+)
+HTTP_PASSWORD_HASH_SECONDS = Counter(
+    'http_request_password_hash_seconds_total',
+    'Tempo gasto no Argon2 pelas requisições de cada rota.',
+    ('method', 'route'),
+)
+DB_QUERIES = Counter(
+    'db_queries_total',
+    'Comandos SQL executados, dentro ou fora de requisições.',
+)
+PRINCIPAL_CACHE_REQUESTS = Counter(
+    'principal_cache_requests_total',
+    'Consultas ao cache de usuários autenticados, por resultado.',
+    ('result',),
+)
+RESPONSE_CACHE_REQUESTS = Counter(
+    'response_cache_requests_total',
+    'Consultas ao cache de respostas, por rota e resultado.',
+    ('route', 'result'),
+)
+
+
+def response_cache_hit_ratio() -> float:
+    """Fração das consultas ao cache de respostas que o encontraram."""
+    values = RESPONSE_CACHE_REQUESTS.values
+    total = sum(values.values())
+    hits = sum(v for (_, result), v in values.items() if result == 'hit')
+    return hits / total if total else 0.0
+
+
+CallbackGauge(
+    'response_cache_hit_ratio',
+    'Fração das consultas ao cache de respostas atendidas por ele.',
+    response_cache_hit_ratio,
+)
+RATE_LIMITED = Counter(
+    'rate_limited_requests_total',
+    'Requisições recusadas com 429, por tipo de limite.',
+    ('scope',),
+)
+TRASH_PURGED = Counter(
+    'trash_purged_todos_total',
+    'Tarefas da lixeira removidas pela limpeza.',
+)
+TRASH_PURGE_BATCHES = Counter(
+    'trash_purge_batches_total',
+    'Lotes executados pela limpeza da lixeira.',
+)
+TRASH_PURGE_BATCH_SECONDS = Histogram(
+    'trash_purge_batch_duration_seconds',
+    'Duração de cada transação de limpeza da lixeira.',
+)
+TRASH_PURGE_LAST_RUN = Gauge(
+    'trash_purge_last_run_timestamp_seconds',
+    'Momento em que a última limpeza da lixeira terminou.',
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    'password_hash_duration_seconds',
+    'Duração das operações do Argon2, incluindo a espera no pool.',
+    ('operation',),
+)
+
+
+class RequestStats:
+    __slots__ = ('db_queries', 'db_seconds', 'password_hash_seconds')
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.password_hash_seconds = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    'request_stats',
+    default=None,
+)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, params, context, *args):
+    context._metrics_start = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, params, context, *args):
+    elapsed = time.perf_counter() - context._metrics_start
+    DB_QUERIES.inc()
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_seconds += elapsed
+
+
+def observe_password_hash(operation: str, elapsed: float):
+    PASSWORD_HASH_SECONDS.observe(elapsed, operation)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.password_hash_seconds += elapsed
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que registra latência, status e uso do banco."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        method = scope['method']
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        HTTP_IN_PROGRESS.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_PROGRESS.dec(method)
+            _request_stats.reset(token)
+
+            # O template da rota evita uma série por id; rotas
+            # desconhecidas são agrupadas para não explodir a cardinalidade
+            route = scope.get('route')
+            path = route.path if route is not None else 'unmatched'
+            HTTP_REQUESTS.inc(method, path, str(status))
+            HTTP_LATENCY.observe(elapsed, method, path)
+            HTTP_DB_QUERIES.observe(stats.db_queries, method, path)
+            HTTP_DB_SECONDS.observe(stats.db_seconds, method, path)
+            if stats.password_hash_seconds:
+                HTTP_PASSWORD_HASH_SECONDS.inc(
+                    method,
+                    path,
+                    amount=stats.password_hash_seconds,
+                )
@@ -1,11 +1,26 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import DDL, DateTime, ForeignKey, Index, event, func
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import Mapped, mapped_column, registry, relationship
 
 table_registry = registry()
 
+# O SQLite grava o CURRENT_TIMESTAMP como texto sem frações de segundo. As
+# datas enviadas pela aplicação usam o mesmo formato, senão a comparação de
+# texto com as gravadas pelo banco falha na igualdade (o watermark da
+# sincronia compara `(updated_at, id)`).
+Timestamp = DateTime().with_variant(
+    sqlite.DATETIME(
+        storage_format=(
+            '%(year)04d-%(month)02d-%(day)02d '
+            '%(hour)02d:%(minute)02d:%(second)02d'
+        ),
+    ),
+    'sqlite',
+)
+
 
 class TodoState(str, Enum):
     draft = 'draft'
@@ -29,7 +44,11 @@ class User:
     todos: Mapped[list['Todo']] = relationship(
         init=False,
         cascade='all, delete-orphan',
-        lazy='selectin',
+        # O banco remove as tarefas (ON DELETE CASCADE); o ORM não precisa
+        # carregá-las para apagar o usuário
+        passive_deletes=True,
+        # Carregado apenas sob demanda, com `selectinload` explícito
+        lazy='raise',
     )
     # Cria o updated_at
     updated_at: Mapped[datetime] = mapped_column(
@@ -42,11 +61,22 @@ class User:
 @table_registry.mapped_as_dataclass
 class Todo:
     __tablename__ = 'todos'
+    # Toda consulta do router filtra por user_id; os índices seguem as
+    # ordenações usadas na listagem, nos filtros por estado e na sincronia.
+    # O último atende a limpeza da lixeira, que não filtra por usuário.
+    __table_args__ = (
+        Index('ix_todos_user_id_id', 'user_id', 'id'),
+        Index('ix_todos_user_id_state_id', 'user_id', 'state', 'id'),
+        Index('ix_todos_user_id_updated_at_id', 'user_id', 'updated_at', 'id'),
+        Index('ix_todos_state_updated_at', 'state', 'updated_at'),
+    )
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     title: Mapped[str]
     description: Mapped[str]
     state: Mapped[TodoState]
-    user_id: Mapped[int] = mapped_column(ForeignKey('users.id'))
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE'),
+    )
 
     created_at: Mapped[datetime] = mapped_column(
         init=False,
@@ -54,7 +84,266 @@ class Todo:
     )
 
     updated_at: Mapped[datetime] = mapped_column(
+        Timestamp,
         init=False,
         server_default=func.now(),
         onupdate=func.now(),
     )
+
+
+@table_registry.mapped_as_dataclass
+class TodoTombstone:
+    """Registro das tarefas removidas, para a sincronia incremental.
+
+    Gravado pelos triggers de `todos` (TODO_TOMBSTONES_*_DDL) em cada
+    DELETE; as lápides de um usuário removido não ficam.
+    """
+
+    __tablename__ = 'todo_tombstones'
+    __table_args__ = (
+        Index(
+            'ix_todo_tombstones_user_id_deleted_at_id',
+            'user_id',
+            'deleted_at',
+            'id',
+        ),
+        Index('ix_todo_tombstones_deleted_at', 'deleted_at'),
+    )
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        Timestamp,
+        init=False,
+        server_default=func.now(),
+    )
+
+
+@table_registry.mapped_as_dataclass
+class TodoCounter:
+    """Quantidade de tarefas de cada usuário por estado.
+
+    Mantida pelos triggers de `todos` (TODO_COUNTERS_*_DDL), na mesma
+    transação de cada INSERT, UPDATE de estado ou DELETE.
+    """
+
+    __tablename__ = 'todo_counters'
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    state: Mapped[TodoState] = mapped_column(primary_key=True)
+    count: Mapped[int] = mapped_column(default=0)
+
+
+# Índice de busca textual das tarefas. No SQLite é uma tabela FTS5 de
+# conteúdo externo mantida por triggers; no Postgres um índice GIN sobre o
+# tsvector de título e descrição.
+TODO_SEARCH_SQLITE_DDL = (
+    """
+    CREATE VIRTUAL TABLE todos_fts USING fts5(
+        title, description,
+        content='todos', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER todos_fts_insert AFTER INSERT ON todos BEGIN
+        INSERT INTO todos_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER todos_fts_delete AFTER DELETE ON todos BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER todos_fts_update
+    AFTER UPDATE OF title, description ON todos BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO todos_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+)
+
+TODO_SEARCH_VECTOR = "to_tsvector('simple', title || ' ' || description)"
+
+TODO_SEARCH_POSTGRES_DDL = (
+    f'CREATE INDEX ix_todos_search ON todos USING GIN ({TODO_SEARCH_VECTOR})',
+)
+
+for statement in TODO_SEARCH_SQLITE_DDL:
+    event.listen(
+        Todo.__table__,
+        'after_create',
+        DDL(statement).execute_if(dialect='sqlite'),
+    )
+for statement in TODO_SEARCH_POSTGRES_DDL:
+    event.listen(
+        Todo.__table__,
+        'after_create',
+        DDL(statement).execute_if(dialect='postgresql'),
+    )
+event.listen(
+    Todo.__table__,
+    'before_drop',
+    DDL('DROP TABLE IF EXISTS todos_fts').execute_if(dialect='sqlite'),
+)
+
+
+# Contadores por usuário e estado. Os triggers só existem depois que as
+# duas tabelas foram criadas, por isso ficam no `after_create` do metadata.
+TODO_COUNTERS_SQLITE_DDL = (
+    """
+    CREATE TRIGGER todo_counters_insert AFTER INSERT ON todos BEGIN
+        INSERT INTO todo_counters (user_id, state, count)
+        VALUES (new.user_id, new.state, 1)
+        ON CONFLICT (user_id, state) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER todo_counters_delete AFTER DELETE ON todos BEGIN
+        UPDATE todo_counters SET count = count - 1
+        WHERE user_id = old.user_id AND state = old.state;
+    END
+    """,
+    """
+    CREATE TRIGGER todo_counters_update AFTER UPDATE OF state, user_id
+    ON todos
+    WHEN old.state IS NOT new.state OR old.user_id IS NOT new.user_id
+    BEGIN
+        UPDATE todo_counters SET count = count - 1
+        WHERE user_id = old.user_id AND state = old.state;
+        INSERT INTO todo_counters (user_id, state, count)
+        VALUES (new.user_id, new.state, 1)
+        ON CONFLICT (user_id, state) DO UPDATE SET count = count + 1;
+    END
+    """,
+)
+
+TODO_COUNTERS_POSTGRES_DDL = (
+    """
+    CREATE FUNCTION todo_counters_apply() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE todo_counters SET count = count - 1
+            WHERE user_id = OLD.user_id AND state = OLD.state;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO todo_counters (user_id, state, count)
+            VALUES (NEW.user_id, NEW.state, 1)
+            ON CONFLICT (user_id, state)
+            DO UPDATE SET count = todo_counters.count + 1;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER todo_counters_insert_delete
+    AFTER INSERT OR DELETE ON todos
+    FOR EACH ROW EXECUTE FUNCTION todo_counters_apply()
+    """,
+    """
+    CREATE TRIGGER todo_counters_update
+    AFTER UPDATE OF state, user_id ON todos
+    FOR EACH ROW
+    WHEN (
+        OLD.state IS DISTINCT FROM NEW.state
+        OR OLD.user_id IS DISTINCT FROM NEW.user_id
+    )
+    EXECUTE FUNCTION todo_counters_apply()
+    """,
+)
+
+for statement in TODO_COUNTERS_SQLITE_DDL:
+    event.listen(
+        table_registry.metadata,
+        'after_create',
+        DDL(statement).execute_if(dialect='sqlite'),
+    )
+for statement in TODO_COUNTERS_POSTGRES_DDL:
+    event.listen(
+        table_registry.metadata,
+        'after_create',
+        DDL(statement).execute_if(dialect='postgresql'),
+    )
+event.listen(
+    table_registry.metadata,
+    'after_drop',
+    DDL('DROP FUNCTION IF EXISTS todo_counters_apply()').execute_if(
+        dialect='postgresql',
+    ),
+)
+
+
+# Lápides das tarefas removidas. Na exclusão em cascata de um usuário a
+# lápide não é gravada: ele não existe mais e as lápides dele sairiam
+# junto (a exclusão em lotes de `purge.delete_account` apaga as dela a
+# cada lote). O SQLite pode reaproveitar o id da maior tarefa apagada; a nova
+# tarefa apaga a lápide do mesmo id, senão a sincronia entregaria a tarefa
+# viva e a remoção dela na mesma resposta.
+TODO_TOMBSTONES_SQLITE_DDL = (
+    """
+    CREATE TRIGGER todo_tombstones_insert AFTER DELETE ON todos
+    WHEN EXISTS (SELECT 1 FROM users WHERE id = old.user_id)
+    BEGIN
+        INSERT INTO todo_tombstones (user_id, id)
+        VALUES (old.user_id, old.id)
+        ON CONFLICT (user_id, id)
+        DO UPDATE SET deleted_at = excluded.deleted_at;
+    END
+    """,
+    """
+    CREATE TRIGGER todo_tombstones_reuse AFTER INSERT ON todos BEGIN
+        DELETE FROM todo_tombstones
+        WHERE user_id = new.user_id AND id = new.id;
+    END
+    """,
+)
+
+TODO_TOMBSTONES_POSTGRES_DDL = (
+    """
+    CREATE FUNCTION todo_tombstones_record() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO todo_tombstones (user_id, id)
+        SELECT OLD.user_id, OLD.id
+        WHERE EXISTS (SELECT 1 FROM users WHERE id = OLD.user_id)
+        ON CONFLICT (user_id, id)
+        DO UPDATE SET deleted_at = excluded.deleted_at;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER todo_tombstones_insert
+    AFTER DELETE ON todos
+    FOR EACH ROW EXECUTE FUNCTION todo_tombstones_record()
+    """,
+)
+
+for statement in TODO_TOMBSTONES_SQLITE_DDL:
+    event.listen(
+        table_registry.metadata,
+        'after_create',
+        DDL(statement).execute_if(dialect='sqlite'),
+    )
+for statement in TODO_TOMBSTONES_POSTGRES_DDL:
+    event.listen(
+        table_registry.metadata,
+        'after_create',
+        DDL(statement).execute_if(dialect='postgresql'),
+    )
+event.listen(
+    table_registry.metadata,
+    'after_drop',
+    DDL('DROP FUNCTION IF EXISTS todo_tombstones_record()').execute_if(
+        dialect='postgresql',
+    ),
+)
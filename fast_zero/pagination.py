@@ -0,0 +1,86 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import datetime
+from http import HTTPStatus
+
+from fastapi import HTTPException
+
+
+def _encode(payload: dict) -> str:
+    data = json.dumps(payload, separators=(',', ':'))
+    return urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def _decode(token: str, detail: str) -> dict:
+    try:
+        padding = '=' * (-len(token) % 4)
+        payload = json.loads(urlsafe_b64decode(token + padding))
+    except (BinasciiError, ValueError, TypeError):
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=detail)
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=detail)
+    return payload
+
+
+# Maior id que cabe num INTEGER do SQLite e num BIGINT do PostgreSQL
+MAX_ID = 2**63
+
+
+def _valid_id(value) -> bool:
+    # `bool` é subclasse de `int`: `true` no JSON não pode virar um id
+    return type(value) is int and 0 <= value < MAX_ID
+
+
+def encode_cursor(last_id: int) -> str:
+    """Gera um cursor opaco a partir do último id de uma página."""
+    return _encode({'id': last_id})
+
+
+def decode_cursor(cursor: str) -> int:
+    """Recupera o último id de uma página a partir do cursor opaco."""
+    last_id = _decode(cursor, 'Invalid cursor').get('id')
+    if not _valid_id(last_id):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail='Invalid cursor',
+        )
+    return last_id
+
+
+def encode_watermark(changed_at: datetime, last_id: int) -> str:
+    """Gera um watermark opaco a partir da última alteração entregue."""
+    return _encode({'at': changed_at.isoformat(), 'id': last_id})
+
+
+def decode_watermark(watermark: str) -> tuple[datetime, int]:
+    """Recupera a posição `(data, id)` a partir do watermark opaco."""
+    payload = _decode(watermark, 'Invalid watermark')
+    try:
+        changed_at = datetime.fromisoformat(payload['at'])
+        last_id = payload['id']
+    except (KeyError, TypeError, ValueError):
+        changed_at = last_id = None
+    if not _valid_id(last_id) or changed_at.tzinfo is not None:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail='Invalid watermark',
+        )
+    return changed_at, last_id
+
+
+def paginate(query, column, page):
+    """Aplica a paginação por cursor (keyset) ou por skip/limit."""
+    query = query.order_by(column)
+    if page.cursor:
+        query = query.where(column > decode_cursor(page.cursor))
+    else:
+        query = query.offset(page.skip)
+    return query.limit(page.limit)
+
+
+def next_cursor(rows, page) -> str | None:
+    """Retorna o cursor da próxima página, se a página atual estiver cheia."""
+    if rows and len(rows) == page.limit:
+        return encode_cursor(rows[-1].id)
+    return None
@@ -0,0 +1,174 @@
+"""Remoção definitiva das tarefas que estão na lixeira há muito tempo.
+
+A limpeza apaga no máximo `batch_size` tarefas por transação e dorme
+`pause` segundos entre os lotes. Assim cada trava de escrita do SQLite
+dura só um lote curto, as requisições conseguem escrever nos intervalos e
+o WAL pode ser reciclado pelos checkpoints entre uma transação e outra.
+
+A exclusão em segundo plano de contas muito grandes usa os mesmos lotes
+antes de apagar o usuário, e o worker também descarta as lápides da
+sincronia que passaram da retenção.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, select, tuple_
+
+from fast_zero.metrics import (
+    TRASH_PURGE_BATCH_SECONDS,
+    TRASH_PURGE_BATCHES,
+    TRASH_PURGE_LAST_RUN,
+    TRASH_PURGED,
+)
+from fast_zero.models import Todo, TodoState, TodoTombstone, User
+
+logger = logging.getLogger(__name__)
+
+
+def purge_cutoff(older_than: timedelta) -> datetime:
+    # As datas são gravadas pelo banco em UTC, sem fuso
+    return datetime.now(UTC).replace(tzinfo=None) - older_than
+
+
+def _delete_todos(candidates, batch_size: int):
+    return delete(Todo).where(
+        Todo.id.in_(candidates.limit(batch_size).scalar_subquery()),
+    )
+
+
+async def _delete_in_batches(
+    engine,
+    statements,
+    batch_size: int,
+    pause: float,
+    on_batch=None,
+) -> int:
+    """Executa o DELETE limitado a `batch_size`, um lote por transação.
+
+    O primeiro comando de `statements` é o DELETE do lote; os demais rodam
+    na mesma transação, logo depois dele.
+    """
+    statement, *follow_up = statements
+    total = 0
+    while True:
+        start = time.perf_counter()
+        async with engine.begin() as conn:
+            deleted = (await conn.execute(statement)).rowcount
+            for extra in follow_up:
+                await conn.execute(extra)
+        if on_batch:
+            on_batch(deleted, time.perf_counter() - start)
+        total += deleted
+
+        if deleted < batch_size:
+            return total
+        await asyncio.sleep(pause)
+
+
+def _observe_purge_batch(deleted: int, elapsed: float):
+    TRASH_PURGE_BATCH_SECONDS.observe(elapsed)
+    TRASH_PURGE_BATCHES.inc()
+    TRASH_PURGED.inc(amount=deleted)
+
+
+async def purge_trash(
+    engine,
+    older_than: timedelta,
+    batch_size: int,
+    pause: float,
+) -> int:
+    """Apaga as tarefas na lixeira mais antigas que `older_than`.
+
+    Retorna quantas tarefas foram removidas.
+    """
+    cutoff = purge_cutoff(older_than)
+    candidates = (
+        select(Todo.id)
+        .where(Todo.state == TodoState.trash, Todo.updated_at < cutoff)
+        .order_by(Todo.updated_at)
+    )
+    total = await _delete_in_batches(
+        engine,
+        (_delete_todos(candidates, batch_size),),
+        batch_size,
+        pause,
+        _observe_purge_batch,
+    )
+    TRASH_PURGE_LAST_RUN.set(value=time.time())
+    return total
+
+
+async def delete_account(
+    engine,
+    user_id: int,
+    batch_size: int,
+    pause: float,
+) -> int:
+    """Apaga as tarefas do usuário em lotes e depois o próprio usuário.
+
+    Retorna quantas tarefas foram removidas.
+    """
+    candidates = select(Todo.id).where(Todo.user_id == user_id)
+    # O usuário ainda existe durante os lotes, então o trigger grava as
+    # lápides; elas saem na mesma transação, sem chegar a ser confirmadas
+    statements = (
+        _delete_todos(candidates, batch_size),
+        delete(TodoTombstone).where(TodoTombstone.user_id == user_id),
+    )
+    total = await _delete_in_batches(engine, statements, batch_size, pause)
+    # O que tiver sido criado no meio do caminho sai pelo ON DELETE CASCADE
+    async with engine.begin() as conn:
+        await conn.execute(delete(User).where(User.id == user_id))
+    logger.info('Account %d deleted with %d todos', user_id, total)
+    return total
+
+
+async def purge_tombstones(
+    engine,
+    older_than: timedelta,
+    batch_size: int,
+    pause: float,
+) -> int:
+    """Apaga as lápides mais antigas que `older_than`.
+
+    Retorna quantas lápides foram removidas.
+    """
+    key = tuple_(TodoTombstone.user_id, TodoTombstone.id)
+    candidates = (
+        select(TodoTombstone.user_id, TodoTombstone.id)
+        .where(TodoTombstone.deleted_at < purge_cutoff(older_than))
+        .limit(batch_size)
+    )
+    return await _delete_in_batches(
+        engine,
+        (delete(TodoTombstone).where(key.in_(candidates)),),
+        batch_size,
+        pause,
+    )
+
+
+async def purge_worker(engine, settings):
+    """Executa a limpeza a cada `TRASH_PURGE_INTERVAL` segundos."""
+    while True:
+        try:
+            purged = await purge_trash(
+                engine,
+                timedelta(days=settings.TRASH_PURGE_AFTER_DAYS),
+                settings.TRASH_PURGE_BATCH_SIZE,
+                settings.TRASH_PURGE_PAUSE,
+            )
+            logger.info('Trash purge removed %d todos', purged)
+            expired = await purge_tombstones(
+                engine,
+                timedelta(days=settings.TODO_TOMBSTONE_RETENTION_DAYS),
+                settings.TRASH_PURGE_BATCH_SIZE,
+                settings.TRASH_PURGE_PAUSE,
+            )
+            logger.info('Tombstone purge removed %d tombstones', expired)
+        except Exception:
+            # Uma falha não pode derrubar o worker; tenta de novo depois
+            logger.exception('Trash purge failed')
+        await asyncio.sleep(settings.TRASH_PURGE_INTERVAL)
@@ -0,0 +1,104 @@
+"""Limite de tentativas nas rotas que calculam Argon2.
+
+Cada chave (IP do cliente, usuário/e-mail) tem um token bucket: `burst`
+tentativas de uma vez e reposição de `per_minute` por minuto. A checagem
+acontece antes de qualquer hash, então uma enxurrada de logins recebe 429
+sem ocupar CPU.
+
+Os buckets ficam no `MemoryBackend`, separados em shards com trava própria
+e tamanho limitado. Para dividir os limites entre vários workers basta um
+backend com o mesmo método `take` apoiado em um armazenamento
+compartilhado (Redis, por exemplo).
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+
+from fastapi import HTTPException, Request
+
+from fast_zero.metrics import RATE_LIMITED
+from fast_zero.settings import get_settings
+
+settings = get_settings()
+
+
+class MemoryBackend:
+    """Token buckets em memória, distribuídos em shards."""
+
+    def __init__(self, shards: int = 16, max_keys: int = 100_000):
+        self.max_keys_per_shard = max(1, max_keys // shards)
+        self.shards = [
+            (threading.Lock(), OrderedDict()) for _ in range(shards)
+        ]
+
+    async def take(self, key: str, rate: float, capacity: float) -> float:
+        """Consome um token; retorna 0 ou os segundos até haver um."""
+        lock, buckets = self.shards[hash(key) % len(self.shards)]
+        now = time.monotonic()
+        with lock:
+            tokens, updated = buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / rate
+            buckets[key] = (tokens, now)
+            buckets.move_to_end(key)
+            # As chaves mais antigas são as que já teriam o bucket cheio
+            while len(buckets) > self.max_keys_per_shard:
+                buckets.popitem(last=False)
+        return retry_after
+
+    def clear(self):
+        for lock, buckets in self.shards:
+            with lock:
+                buckets.clear()
+
+
+class RateLimiter:
+    def __init__(self, backend, per_minute: float, burst: int):
+        self.backend = backend
+        self.rate = per_minute / 60
+        self.burst = burst
+
+    async def hit(self, key: str) -> float:
+        if self.rate <= 0:
+            return 0.0
+        return await self.backend.take(key, self.rate, self.burst)
+
+
+backend = MemoryBackend()
+
+ip_limiter = RateLimiter(
+    backend,
+    settings.AUTH_RATE_LIMIT_IP_PER_MINUTE,
+    settings.AUTH_RATE_LIMIT_IP_BURST,
+)
+identity_limiter = RateLimiter(
+    backend,
+    settings.AUTH_RATE_LIMIT_IDENTITY_PER_MINUTE,
+    settings.AUTH_RATE_LIMIT_IDENTITY_BURST,
+)
+
+
+async def limit_auth_attempts(request: Request, *identities: str):
+    """Aplica os limites por IP e por identidade antes do hash da senha."""
+    host = request.client.host if request.client else 'unknown'
+    checks = [('ip', ip_limiter, f'ip:{host}')]
+    checks.extend(
+        ('identity', identity_limiter, f'identity:{identity.lower()}')
+        for identity in identities
+    )
+    for scope, limiter, key in checks:
+        retry_after = await limiter.hit(key)
+        if retry_after:
+            RATE_LIMITED.inc(scope)
+            raise HTTPException(
+                status_code=HTTPStatus.TOO_MANY_REQUESTS,
+                detail='Too many requests, try again later',
+                headers={'Retry-After': str(math.ceil(retry_after))},
+            )
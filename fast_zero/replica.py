@@ -0,0 +1,113 @@
+"""Roteamento das leituras para a réplica do banco.
+
+Com `READ_DATABASE_URL` definida, as rotas somente leitura usam
+`get_read_session`, ligada ao engine da réplica, e as demais continuam no
+primário. Como a réplica chega atrasada, quem acabou de escrever fica
+preso ao primário por `READ_YOUR_WRITES_SECONDS` segundos: o
+`ReadYourWritesMiddleware` marca o cliente depois de cada requisição de
+escrita bem-sucedida, e as leituras marcadas vão ao primário.
+
+O cliente é identificado pelo token (`Authorization`) e por um cookie de
+curta duração que a própria resposta da escrita entrega, o que cobre as
+escritas anônimas (o cadastro). O IP não serve: atrás de um proxy ou NAT
+todos os clientes o compartilham e iriam juntos para o primário.
+
+Para testar localmente basta um segundo arquivo SQLite copiado de tempos
+em tempos do primário (`python -m fast_zero.cli copy-replica`).
+"""
+
+import math
+import secrets
+import sqlite3
+from http import HTTPStatus
+from http.cookies import CookieError, SimpleCookie
+from pathlib import Path
+
+from fast_zero.cache import TTLCache
+from fast_zero.settings import get_settings
+
+settings = get_settings()
+
+SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+MARKER_COOKIE = 'read_your_writes'
+
+pins = TTLCache(maxsize=100_000, ttl=settings.READ_YOUR_WRITES_SECONDS)
+
+
+def _marker(scope) -> str | None:
+    for name, value in scope.get('headers', ()):
+        if name == b'cookie':
+            try:
+                cookies = SimpleCookie(value.decode('latin-1'))
+            except CookieError:
+                continue
+            if MARKER_COOKIE in cookies:
+                return cookies[MARKER_COOKIE].value
+    return None
+
+
+def client_keys(scope, marker: str | None = None) -> list[str]:
+    """Chaves que identificam quem fez a requisição: token e marcador."""
+    keys = [
+        f'auth:{value.decode("latin-1")}'
+        for name, value in scope.get('headers', ())
+        if name == b'authorization'
+    ]
+    if marker := marker or _marker(scope):
+        keys.append(f'marker:{marker}')
+    return keys
+
+
+def _marker_cookie(marker: str) -> bytes:
+    max_age = math.ceil(settings.READ_YOUR_WRITES_SECONDS)
+    return (
+        f'{MARKER_COOKIE}={marker}; Max-Age={max_age}; Path=/; '
+        'HttpOnly; SameSite=Lax'
+    ).encode('latin-1')
+
+
+def is_pinned(scope) -> bool:
+    return any(pins.get(key) for key in client_keys(scope))
+
+
+class ReadYourWritesMiddleware:
+    """Prende ao primário, por um tempo, quem acabou de escrever."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope['type'] != 'http'
+            or scope['method'] in SAFE_METHODS
+            or not settings.READ_DATABASE_URL
+        ):
+            return await self.app(scope, receive, send)
+
+        marker = _marker(scope) or secrets.token_urlsafe(16)
+
+        async def send_and_pin(message):
+            # Marca antes de a resposta sair: a próxima leitura do cliente
+            # já encontra o pino
+            if (
+                message['type'] == 'http.response.start'
+                and message['status'] < HTTPStatus.BAD_REQUEST
+            ):
+                for key in client_keys(scope, marker):
+                    pins.set(key, True)
+                message['headers'] = [
+                    *message.get('headers', ()),
+                    (b'set-cookie', _marker_cookie(marker)),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_and_pin)
+
+
+def copy_sqlite_database(source: Path, target: Path):
+    """Copia um banco SQLite com a API de backup, de forma consistente."""
+    with (
+        sqlite3.connect(source) as src,
+        sqlite3.connect(target) as dst,
+    ):
+        src.backup(dst)
@@ -0,0 +1,107 @@
+"""Cache das respostas das rotas públicas de usuários.
+
+`GET /users/` e `GET /users/{id}` guardam o corpo JSON já codificado,
+por rota e parâmetros validados, e nas próximas consultas devolvem os
+bytes sem ir ao banco nem ao Pydantic.
+
+A invalidação é por tags versionadas: cada chave inclui a versão atual
+da sua tag (`users:list` para as listagens, `users:{id}` para um
+usuário) e invalidar uma tag grava uma versão nova. As entradas antigas
+ficam inalcançáveis e saem pelo TTL ou pelo LRU; uma resposta montada
+antes de uma escrita é gravada com a versão antiga e nunca é servida.
+
+Com a réplica de leitura, a origem da leitura faz parte da chave e quem
+está preso ao primário (read-your-writes) não consulta nem grava o
+cache: uma resposta lida da réplica atrasada nunca chega a quem acabou
+de escrever. Para os demais clientes, a resposta pode refletir o atraso
+da réplica por até `RESPONSE_CACHE_TTL` segundos.
+
+O armazenamento é plugável: qualquer objeto com `get`/`set` assíncronos
+serve. O `MemoryStorage` guarda tudo no próprio processo; um backend
+compartilhado (Redis, por exemplo) divide o cache e as versões entre os
+workers.
+"""
+
+from uuid import uuid4
+
+from fast_zero.cache import TTLCache
+from fast_zero.metrics import RESPONSE_CACHE_REQUESTS
+from fast_zero.replica import is_pinned
+from fast_zero.settings import get_settings
+
+settings = get_settings()
+
+USERS_LIST_TAG = 'users:list'
+
+
+def user_tag(user_id: int) -> str:
+    return f'users:{user_id}'
+
+
+def read_source(scope) -> str | None:
+    """Origem das leituras da requisição; `None` quando ela ignora o cache."""
+    if is_pinned(scope):
+        return None
+    return 'replica' if settings.READ_DATABASE_URL else 'primary'
+
+
+class MemoryStorage:
+    """Respostas em memória, em um LRU com TTL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.cache = TTLCache(maxsize, ttl)
+
+    async def get(self, key: str):
+        return self.cache.get(key)
+
+    async def set(self, key: str, value):
+        self.cache.set(key, value)
+
+    def clear(self):
+        self.cache.clear()
+
+
+class ResponseCache:
+    def __init__(self, storage):
+        self.storage = storage
+
+    async def _version(self, tag: str) -> str:
+        version = await self.storage.get(f'version:{tag}')
+        if version is None:
+            # Versão desconhecida (nunca gravada ou já descartada): uma
+            # nova garante que nada gravado antes seja servido
+            version = uuid4().hex
+            await self.storage.set(f'version:{tag}', version)
+        return version
+
+    async def lookup(self, route: str, tag: str, key: str, scope):
+        """Retorna a chave completa e o corpo guardado, se houver.
+
+        A chave é `None` para as requisições que não usam o cache.
+        """
+        source = read_source(scope)
+        if source is None:
+            return None, None
+        cache_key = f'{tag}@{await self._version(tag)}:{source}:{key}'
+        body = await self.storage.get(cache_key)
+        RESPONSE_CACHE_REQUESTS.inc(route, 'miss' if body is None else 'hit')
+        return cache_key, body
+
+    async def store(self, cache_key: str | None, body: bytes):
+        if cache_key is not None:
+            await self.storage.set(cache_key, body)
+
+    async def invalidate(self, *tags: str):
+        for tag in tags:
+            await self.storage.set(f'version:{tag}', uuid4().hex)
+
+    def clear(self):
+        self.storage.clear()
+
+
+response_cache = ResponseCache(
+    MemoryStorage(
+        maxsize=settings.RESPONSE_CACHE_SIZE,
+        ttl=settings.RESPONSE_CACHE_TTL,
+    ),
+)
@@ -1,18 +1,29 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Request,
+)
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemySession
 
 from fast_zero.database import get_session
+from fast_zero.hashing import (
+    get_password_hash_async,
+    needs_rehash,
+    verify_password_async,
+)
 from fast_zero.models import User
+from fast_zero.ratelimit import limit_auth_attempts
 from fast_zero.schemas import Token
 from fast_zero.security import (
     create_access_token,
     get_current_user,
-    verify_password,
 )
 
 CurrentUser = Annotated[
@@ -34,10 +45,32 @@ Session = Annotated[
 ]
 
 
+async def rehash_password(bind, user_id: int, password: str, old_hash: str):
+    """Regrava o hash da senha com os parâmetros atuais do Argon2.
+
+    Roda depois da resposta, com uma sessão própria. Só grava se o hash
+    ainda for o mesmo, para não desfazer uma troca de senha concorrente.
+    """
+    try:
+        new_hash = await get_password_hash_async(password)
+    except HTTPException:
+        # Pool de hash cheio: fica para o próximo login
+        return
+    async with SQLAlchemySession(bind) as session:
+        await session.execute(
+            update(User)
+            .where(User.id == user_id, User.password == old_hash)
+            .values(password=new_hash),
+        )
+        await session.commit()
+
+
 @router.post('/token', response_model=Token)
 async def login_for_access_token(
+    request: Request,
     form_data: OAuth2From,
     session: Session,
+    background_tasks: BackgroundTasks,
 ):
     """Gera um token de acesso para o usuário."""
 
@@ -46,6 +79,7 @@ async def login_for_access_token(
             status_code=HTTPStatus.UNAUTHORIZED,
             detail='Incorrect username or password',
         )
+    await limit_auth_attempts(request, form_data.username)
     user = await session.scalar(
         select(User).where(User.email == form_data.username),
     )
@@ -55,11 +89,19 @@ async def login_for_access_token(
             status_code=HTTPStatus.UNAUTHORIZED,
             detail='Incorrect username or password',
         )
-    if not verify_password(form_data.password, user.password):
+    if not await verify_password_async(form_data.password, user.password):
         raise HTTPException(
             status_code=HTTPStatus.UNAUTHORIZED,
             detail='Incorrect username or password',
         )
+    if needs_rehash(user.password):
+        background_tasks.add_task(
+            rehash_password,
+            session.bind,
+            user.id,
+            form_data.password,
+            user.password,
+        )
 
     access_token = create_access_token(
         data={'sub': user.email},
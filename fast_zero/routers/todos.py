@@ -2,20 +2,38 @@ from http import HTTPStatus
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case, delete, insert, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from fast_zero.database import get_session
-from fast_zero.models import Todo, User
+from fast_zero.database import get_read_session, get_session, settings
+from fast_zero.export import MEDIA_TYPES, export_todos
+from fast_zero.models import Todo, TodoCounter, User
+from fast_zero.pagination import next_cursor, paginate
 from fast_zero.schemas import (
+    FilterChanges,
+    FilterExport,
     FilterTodo,
     Message,
+    TodoBatchCreate,
+    TodoBatchDelete,
+    TodoBatchResponse,
+    TodoBatchUpdate,
+    TodoChanges,
     TodoList,
     TodoPublic,
     TodoSchema,
+    TodoStats,
     TodoUpdate,
 )
+from fast_zero.search import search_todos
 from fast_zero.security import get_current_user
+from fast_zero.serialization import (
+    TODO_PUBLIC_COLUMNS,
+    todo_changes_response,
+    todo_list_response,
+)
+from fast_zero.sync import todo_changes
 
 router = APIRouter(
     prefix='/todos',
@@ -23,8 +41,11 @@ router = APIRouter(
 )
 
 Session = Annotated[AsyncSession, Depends(get_session)]
+ReadSession = Annotated[AsyncSession, Depends(get_read_session)]
 CurrentUser = Annotated[User, Depends(get_current_user)]
 TodoFilter = Annotated[FilterTodo, Query()]
+ExportFilter = Annotated[FilterExport, Query()]
+ChangesFilter = Annotated[FilterChanges, Query()]
 
 
 @router.get(
@@ -33,11 +54,11 @@ TodoFilter = Annotated[FilterTodo, Query()]
     response_model=TodoList,
 )
 async def list_todos(
-    session: Session,
+    session: ReadSession,
     user: CurrentUser,
     filter_todo: TodoFilter,
 ):
-    query = select(Todo).where(Todo.user_id == user.id)
+    query = select(*TODO_PUBLIC_COLUMNS).where(Todo.user_id == user.id)
 
     if filter_todo.title:
         query = query.filter(Todo.title.contains(filter_todo.title))
@@ -50,11 +71,96 @@ async def list_todos(
     if filter_todo.state:
         query = query.filter(Todo.state == filter_todo.state)
 
-    todos = await session.scalars(
-        query.offset(filter_todo.skip).limit(filter_todo.limit)
+    # A busca textual é ordenada por relevância e paginada por skip/limit;
+    # um cursor (posição por id) não tem sentido nessa ordem
+    if filter_todo.q and filter_todo.q.strip():
+        if filter_todo.cursor:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail='Search results are paginated with skip and limit',
+            )
+        query = search_todos(query, filter_todo.q, session.bind.dialect.name)
+        todos = await session.execute(
+            query.offset(filter_todo.skip).limit(filter_todo.limit),
+        )
+        return todo_list_response(todos.all())
+
+    todos = await session.execute(paginate(query, Todo.id, filter_todo))
+    todos = todos.all()
+
+    return todo_list_response(todos, next_cursor(todos, filter_todo))
+
+
+@router.get(
+    '/stats',
+    status_code=HTTPStatus.OK,
+    response_model=TodoStats,
+)
+async def read_todo_stats(session: Session, user: CurrentUser):
+    """Retorna a quantidade de tarefas do usuário por estado.
+
+    Lê os contadores mantidos pelos triggers de `todos`, sem agregar as
+    tarefas a cada chamada.
+    """
+    counters = await session.execute(
+        select(TodoCounter.state, TodoCounter.count).where(
+            TodoCounter.user_id == user.id,
+        ),
+    )
+    stats = {state.value: count for state, count in counters}
+    return {**stats, 'total': sum(stats.values())}
+
+
+@router.get(
+    '/export',
+    status_code=HTTPStatus.OK,
+    response_class=StreamingResponse,
+    responses={
+        HTTPStatus.OK: {
+            'content': {media_type: {} for media_type in MEDIA_TYPES.values()},
+        },
+    },
+)
+async def export_user_todos(
+    session: Session,
+    user: CurrentUser,
+    filter_export: ExportFilter,
+):
+    """Exporta todas as tarefas do usuário em NDJSON ou CSV."""
+    filename = f'todos.{filter_export.format}'
+    headers = {'Content-Disposition': f'attachment; filename="{filename}"'}
+    if filter_export.gzip:
+        headers['Content-Encoding'] = 'gzip'
+
+    return StreamingResponse(
+        export_todos(
+            session.bind,
+            user.id,
+            filter_export.format,
+            filter_export.gzip,
+        ),
+        media_type=MEDIA_TYPES[filter_export.format],
+        headers=headers,
     )
 
-    return {'todos': todos.all()}
+
+@router.get(
+    '/changes',
+    status_code=HTTPStatus.OK,
+    response_model=TodoChanges,
+)
+async def list_todo_changes(
+    session: Session,
+    user: CurrentUser,
+    filter_changes: ChangesFilter,
+):
+    """Retorna as tarefas alteradas e removidas desde o watermark.
+
+    Lê sempre do primário: com uma réplica atrasada, o watermark passaria
+    por alterações que ela ainda não recebeu.
+    """
+    changes = await todo_changes(session, user.id, filter_changes, settings)
+    return todo_changes_response(changes)
 
 
 @router.post(
@@ -80,6 +186,110 @@ async def create_todo(
     return db_todo
 
 
+@router.post(
+    '/batch',
+    status_code=HTTPStatus.CREATED,
+    response_model=TodoBatchResponse,
+)
+async def create_todos_batch(
+    batch: TodoBatchCreate,
+    session: Session,
+    user: CurrentUser,
+):
+    """Cria várias tarefas com um único INSERT ... RETURNING."""
+    todos = await session.scalars(
+        insert(Todo).returning(Todo, sort_by_parameter_order=True),
+        [{**todo.model_dump(), 'user_id': user.id} for todo in batch.todos],
+    )
+    results = [
+        {'id': todo.id, 'status': HTTPStatus.CREATED, 'todo': todo}
+        for todo in todos.all()
+    ]
+    await session.commit()
+
+    return {'results': results}
+
+
+@router.patch(
+    '/batch',
+    status_code=HTTPStatus.OK,
+    response_model=TodoBatchResponse,
+)
+async def patch_todos_batch(
+    batch: TodoBatchUpdate,
+    session: Session,
+    user: CurrentUser,
+):
+    """Atualiza várias tarefas com um único UPDATE ... RETURNING.
+
+    Cada campo recebe um CASE por id, então itens diferentes podem alterar
+    campos diferentes. Tarefas inexistentes ou de outro usuário voltam
+    com status 404.
+    """
+    ids = [item.id for item in batch.todos]
+    values = {}
+    for field in TodoUpdate.model_fields:
+        column = getattr(Todo, field)
+        whens = {
+            item.id: literal(getattr(item, field), column.type)
+            for item in batch.todos
+            if field in item.model_fields_set
+        }
+        if whens:
+            values[field] = case(whens, value=Todo.id, else_=column)
+
+    conditions = Todo.id.in_(ids), Todo.user_id == user.id
+    if values:
+        todos = await session.scalars(
+            update(Todo).where(*conditions).values(**values).returning(Todo),
+        )
+    else:
+        todos = await session.scalars(select(Todo).where(*conditions))
+    updated = {todo.id: todo for todo in todos.all()}
+    await session.commit()
+
+    return {
+        'results': [
+            {'id': todo_id, 'status': HTTPStatus.OK, 'todo': updated[todo_id]}
+            if todo_id in updated
+            else {'id': todo_id, 'status': HTTPStatus.NOT_FOUND}
+            for todo_id in ids
+        ]
+    }
+
+
+@router.delete(
+    '/batch',
+    status_code=HTTPStatus.OK,
+    response_model=TodoBatchResponse,
+)
+async def delete_todos_batch(
+    batch: TodoBatchDelete,
+    session: Session,
+    user: CurrentUser,
+):
+    """Remove várias tarefas com um único DELETE ... RETURNING."""
+    deleted = await session.scalars(
+        delete(Todo)
+        .where(Todo.id.in_(batch.ids), Todo.user_id == user.id)
+        .returning(Todo.id),
+    )
+    deleted = set(deleted.all())
+    await session.commit()
+
+    return {
+        'results': [
+            {
+                'id': todo_id,
+                'status': HTTPStatus.OK
+                if todo_id in deleted
+                else HTTPStatus.NOT_FOUND,
+            }
+            for todo_id in batch.ids
+        ]
+    }
+
+
 @router.patch(
     '/{todo_id}',
     status_code=HTTPStatus.OK,
@@ -91,24 +301,22 @@ async def patch_todo(
     user: CurrentUser,
     todo: TodoUpdate,
 ):
-    db_todo = await session.scalar(
-        select(Todo).where(
-            Todo.id == todo_id,
-            Todo.user_id == user.id,
+    """Atualiza a tarefa com um único UPDATE ... RETURNING."""
+    conditions = Todo.id == todo_id, Todo.user_id == user.id
+    values = todo.model_dump(exclude_unset=True)
+    if values:
+        db_todo = await session.scalar(
+            update(Todo).where(*conditions).values(**values).returning(Todo),
         )
-    )
+    else:
+        db_todo = await session.scalar(select(Todo).where(*conditions))
     if not db_todo:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail='Task not found',
         )
 
-    for key, value in todo.model_dump(exclude_unset=True).items():
-        setattr(db_todo, key, value)
-
-    session.add(db_todo)
     await session.commit()
-    await session.refresh(db_todo)
     return db_todo
 
 
@@ -121,18 +329,17 @@ async def delete_todo(
     session: Session,
     user: CurrentUser,
 ):
-    todo = await session.scalar(
-        select(Todo).where(
-            Todo.user_id == user.id,
-            Todo.id == todo_id,
-        )
+    """Remove a tarefa com um único DELETE ... RETURNING."""
+    deleted = await session.scalar(
+        delete(Todo)
+        .where(Todo.id == todo_id, Todo.user_id == user.id)
+        .returning(Todo.id),
     )
-    if not todo:
+    if deleted is None:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail='Task not found',
         )
 
-    await session.delete(todo)
     await session.commit()
     return {'message': 'Task has been deleted successfully.'}
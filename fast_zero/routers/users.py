@@ -1,13 +1,28 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemySession
 
-from fast_zero.database import get_session
-from fast_zero.models import User
+from fast_zero.cache import principal_cache
+from fast_zero.database import get_read_session, get_session, settings
+from fast_zero.hashing import get_password_hash_async
+from fast_zero.models import TodoCounter, User
+from fast_zero.pagination import next_cursor, paginate
+from fast_zero.purge import delete_account
+from fast_zero.ratelimit import limit_auth_attempts
+from fast_zero.response_cache import USERS_LIST_TAG, response_cache, user_tag
 from fast_zero.schemas import (
     FilterPage,
     Message,
@@ -15,9 +30,11 @@ from fast_zero.schemas import (
     UserPublic,
     UserSchema,
 )
-from fast_zero.security import (
-    get_current_user,
-    get_password_hash,
+from fast_zero.security import get_current_user
+from fast_zero.serialization import (
+    USER_PUBLIC_COLUMNS,
+    user_list_response,
+    user_public,
 )
 
 router = APIRouter(prefix='/users', tags=['users'])
@@ -27,52 +44,83 @@ Session = Annotated[
     Depends(get_session),
 ]
 
+ReadSession = Annotated[
+    SQLAlchemySession,
+    Depends(get_read_session),
+]
+
 CurrentUser = Annotated[User, Depends(get_current_user)]
 FilterPageQuery = Annotated[FilterPage, Query()]
 
 
-@router.post('/', status_code=HTTPStatus.CREATED, response_model=UserPublic)
-async def create_user(user: UserSchema, session: Session):
-    db_user = await session.scalar(
-        select(User).where(
-            (User.username == user.username) | (User.email == user.email),
-        )
-    )
-    if db_user:
-        if db_user.username == user.username:
-            raise HTTPException(
-                status_code=HTTPStatus.CONFLICT,
-                detail='Username already exists',
-            )
-        elif db_user.email == user.email:
-            raise HTTPException(
+def _conflict(error: IntegrityError) -> HTTPException | None:
+    """Traduz a violação de unicidade para a mensagem do campo repetido.
+
+    O SQLite informa a coluna (`UNIQUE constraint failed: users.email`) e o
+    PostgreSQL a constraint (`users_email_key`); as duas citam o campo.
+    Outras violações retornam `None`.
+    """
+    message = str(error.orig)
+    for field, detail in (
+        ('username', 'Username already exists'),
+        ('email', 'Email already exists'),
+    ):
+        if f'users.{field}' in message or f'users_{field}_key' in message:
+            return HTTPException(
                 status_code=HTTPStatus.CONFLICT,
-                detail='Email already exists',
+                detail=detail,
             )
+    return None
 
-    hashed_password = get_password_hash(user.password)
 
-    db_user = User(
-        email=user.email,
-        username=user.username,
-        password=hashed_password,
-    )
-    session.add(db_user)
-    await session.commit()
-    await session.refresh(db_user)
+@router.post('/', status_code=HTTPStatus.CREATED, response_model=UserPublic)
+async def create_user(user: UserSchema, session: Session, request: Request):
+    await limit_auth_attempts(request, user.username, user.email)
+    hashed_password = await get_password_hash_async(user.password)
+
+    # A própria constraint de unicidade decide os conflitos: sem SELECT
+    # prévio, que não protegeria contra cadastros concorrentes
+    try:
+        db_user = (
+            await session.execute(
+                insert(User)
+                .values(
+                    email=user.email,
+                    username=user.username,
+                    password=hashed_password,
+                )
+                .returning(*USER_PUBLIC_COLUMNS),
+            )
+        ).one()
+        await session.commit()
+    except IntegrityError as error:
+        raise _conflict(error) or error
+    await response_cache.invalidate(USERS_LIST_TAG)
     return db_user
 
 
 @router.get('/', status_code=HTTPStatus.OK, response_model=UserList)
 async def read_users(
-    session: Session,
+    session: ReadSession,
     filter_users: FilterPageQuery,
+    request: Request,
 ):
-    query = await session.scalars(
-        select(User).offset(filter_users.skip).limit(filter_users.limit)
+    cache_key, body = await response_cache.lookup(
+        '/users/',
+        USERS_LIST_TAG,
+        filter_users.model_dump_json(),
+        request.scope,
+    )
+    if body is not None:
+        return Response(body, media_type='application/json')
+
+    query = await session.execute(
+        paginate(select(*USER_PUBLIC_COLUMNS), User.id, filter_users),
     )
     users = query.all()
-    return {'users': users}
+    response = user_list_response(users, next_cursor(users, filter_users))
+    await response_cache.store(cache_key, response.body)
+    return response
 
 
 @router.get(
@@ -80,18 +128,30 @@ async def read_users(
     status_code=HTTPStatus.OK,
     response_model=UserPublic,
 )
-async def read_user(user_id: int, session: Session):
+async def read_user(user_id: int, session: ReadSession, request: Request):
     """Retorna um usuário específico."""
-
-    db_user = await session.scalar(
-        select(User).where(User.id == user_id),
+    cache_key, body = await response_cache.lookup(
+        '/users/{user_id}',
+        user_tag(user_id),
+        'public',
+        request.scope,
     )
+    if body is not None:
+        return Response(body, media_type='application/json')
+
+    db_user = (
+        await session.execute(
+            select(*USER_PUBLIC_COLUMNS).where(User.id == user_id),
+        )
+    ).first()
     if not db_user:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail='User not found',
         )
-    return db_user
+    response = ORJSONResponse(user_public(db_user))
+    await response_cache.store(cache_key, response.body)
+    return response
 
 
 @router.put('/{user_id}', response_model=UserPublic)
@@ -108,37 +168,83 @@ async def update_user(
             status_code=HTTPStatus.FORBIDDEN,
             detail='Not enough permissions',
         )
+    previous_email = current_user.email
+    hashed_password = await get_password_hash_async(user.password)
     try:
-        current_user.username = user.username
-        current_user.email = user.email
-        current_user.password = get_password_hash(user.password)
+        db_user = (
+            await session.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(
+                    username=user.username,
+                    email=user.email,
+                    password=hashed_password,
+                )
+                .returning(*USER_PUBLIC_COLUMNS),
+            )
+        ).one()
         await session.commit()
-        await session.refresh(current_user)
-        # Retorna o usuário atualizado
-        return current_user
-    except IntegrityError:
-        raise HTTPException(
-            status_code=HTTPStatus.CONFLICT,
-            detail='Username or email already exists',
-        )
+    except IntegrityError as error:
+        raise _conflict(error) or error
+    await principal_cache.invalidate(previous_email)
+    await response_cache.invalidate(USERS_LIST_TAG, user_tag(user_id))
+    return db_user
 
 
 @router.delete(
     '/{user_id}',
     status_code=HTTPStatus.OK,
     response_model=Message,
+    responses={HTTPStatus.ACCEPTED: {'model': Message}},
 )
 async def delete_user(
     user_id: int,
     session: Session,
     current_user: CurrentUser,
+    response: Response,
+    background_tasks: BackgroundTasks,
 ):
-    """Deleta um usuário existente."""
+    """Deleta um usuário existente.
+
+    As tarefas saem pelo ON DELETE CASCADE do banco. Contas acima de
+    `ACCOUNT_DELETE_BACKGROUND_THRESHOLD` tarefas são apagadas depois da
+    resposta, em lotes, e a rota responde 202.
+    """
     if current_user.id != user_id:
         raise HTTPException(
             status_code=HTTPStatus.FORBIDDEN,
             detail='Not enough permissions',
         )
+    threshold = settings.ACCOUNT_DELETE_BACKGROUND_THRESHOLD
+    todos = await session.scalar(
+        select(func.coalesce(func.sum(TodoCounter.count), 0)).where(
+            TodoCounter.user_id == user_id,
+        )
+    )
+
+    if threshold and todos > threshold:
+        background_tasks.add_task(
+            delete_account,
+            session.bind,
+            user_id,
+            settings.ACCOUNT_DELETE_BATCH_SIZE,
+            settings.ACCOUNT_DELETE_PAUSE,
+        )
+        # De novo ao fim do job: até lá o usuário ainda existe e pode ter
+        # voltado aos caches (o token autenticaria um usuário apagado)
+        background_tasks.add_task(
+            principal_cache.invalidate, current_user.email
+        )
+        background_tasks.add_task(
+            response_cache.invalidate, USERS_LIST_TAG, user_tag(user_id)
+        )
+        await principal_cache.invalidate(current_user.email)
+        await response_cache.invalidate(USERS_LIST_TAG, user_tag(user_id))
+        response.status_code = HTTPStatus.ACCEPTED
+        return {'message': 'User deletion scheduled'}
+
     await session.delete(current_user)
     await session.commit()
+    await principal_cache.invalidate(current_user.email)
+    await response_cache.invalidate(USERS_LIST_TAG, user_tag(user_id))
     return {'message': 'User deleted'}
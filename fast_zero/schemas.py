@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 from fast_zero.models import TodoState
 
@@ -9,6 +10,16 @@ class Message(BaseModel):
     message: str
 
 
+class PoolStatus(BaseModel):
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    wait_count: int
+    wait_time_total: float
+    wait_time_max: float
+
+
 class UserSchema(BaseModel):
     username: str
     email: EmailStr
@@ -30,6 +41,7 @@ class UserPublic(BaseModel):
 
 class UserList(BaseModel):
     users: list[UserPublic]
+    next_cursor: str | None = None
 
 
 class Token(BaseModel):
@@ -40,6 +52,7 @@ class Token(BaseModel):
 class FilterPage(BaseModel):
     skip: int = 0
     limit: int = 100
+    cursor: str | None = None
 
 
 class TodoSchema(BaseModel):
@@ -56,15 +69,83 @@ class TodoPublic(TodoSchema):
 
 class TodoList(BaseModel):
     todos: list[TodoPublic]
+    next_cursor: str | None = None
+
+
+class TodoStats(BaseModel):
+    draft: int = 0
+    todo: int = 0
+    doing: int = 0
+    done: int = 0
+    trash: int = 0
+    total: int = 0
 
 
 class FilterTodo(FilterPage):
+    q: str | None = None
     title: str | None = None
     description: str | None = None
     state: TodoState | None = None
 
 
+class FilterExport(BaseModel):
+    format: Literal['ndjson', 'csv'] = 'ndjson'
+    gzip: bool = False
+
+
+CHANGES_MAX_LIMIT = 1000
+
+
+class FilterChanges(BaseModel):
+    since: str | None = None
+    limit: int = Field(default=500, ge=1, le=CHANGES_MAX_LIMIT)
+
+
+class TodoTombstonePublic(BaseModel):
+    id: int
+    deleted_at: datetime
+
+
+class TodoChanges(BaseModel):
+    todos: list[TodoPublic]
+    deleted: list[TodoTombstonePublic]
+    watermark: str
+    has_more: bool
+
+
 class TodoUpdate(BaseModel):
     title: str | None = None
     description: str | None = None
     state: TodoState | None = None
+
+
+BATCH_MAX_SIZE = 1000
+
+
+class TodoBatchCreate(BaseModel):
+    todos: list[TodoSchema] = Field(min_length=1, max_length=BATCH_MAX_SIZE)
+
+
+class TodoBatchUpdateItem(TodoUpdate):
+    id: int
+
+
+class TodoBatchUpdate(BaseModel):
+    todos: list[TodoBatchUpdateItem] = Field(
+        min_length=1,
+        max_length=BATCH_MAX_SIZE,
+    )
+
+
+class TodoBatchDelete(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=BATCH_MAX_SIZE)
+
+
+class TodoBatchResult(BaseModel):
+    id: int
+    status: int
+    todo: TodoPublic | None = None
+
+
+class TodoBatchResponse(BaseModel):
+    results: list[TodoBatchResult]
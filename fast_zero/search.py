@@ -0,0 +1,43 @@
+from sqlalchemy import column, func, literal_column, or_, table, text
+
+from fast_zero.models import TODO_SEARCH_VECTOR, Todo
+
+todos_fts = table('todos_fts', column('rowid'), column('rank'))
+
+
+def fts5_query(q: str) -> str:
+    """Converte o texto livre em uma consulta FTS5 segura.
+
+    Cada termo vira uma frase entre aspas, então operadores e caracteres
+    especiais digitados pelo usuário não quebram a sintaxe do MATCH.
+    """
+    return ' '.join(
+        '"{}"'.format(term.replace('"', '""')) for term in q.split()
+    )
+
+
+def search_todos(query, q: str, dialect: str):
+    """Filtra a consulta pelo texto `q` e ordena pela relevância."""
+    if dialect == 'sqlite':
+        return (
+            query.join(todos_fts, todos_fts.c.rowid == Todo.id)
+            .where(
+                text('todos_fts MATCH :fts_query').bindparams(
+                    fts_query=fts5_query(q),
+                ),
+            )
+            .order_by(todos_fts.c.rank, Todo.id)
+        )
+
+    if dialect == 'postgresql':
+        vector = literal_column(TODO_SEARCH_VECTOR)
+        ts_query = func.websearch_to_tsquery(literal_column("'simple'"), q)
+        return query.where(vector.op('@@')(ts_query)).order_by(
+            func.ts_rank(vector, ts_query).desc(),
+            Todo.id,
+        )
+
+    # Outros bancos não têm índice de busca: mantém o filtro por substring
+    return query.where(
+        or_(Todo.title.contains(q), Todo.description.contains(q)),
+    ).order_by(Todo.id)
@@ -5,18 +5,15 @@ from zoneinfo import ZoneInfo
 
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from jwt import DecodeError, ExpiredSignatureError, decode, encode
-from pwdlib import PasswordHash
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from fast_zero.cache import principal_cache
 from fast_zero.database import get_session
 from fast_zero.models import User
-from fast_zero.settings import Settings
+from fast_zero.settings import get_settings
 
-settings = Settings()
-
-pwd_context = PasswordHash.recommended()
+settings = get_settings()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='auth/token')
 
@@ -28,6 +25,8 @@ token = Annotated[str, Depends(oauth2_scheme)]
 
 
 def create_access_token(data: dict):
+    from jwt import encode
+
     to_encode = data.copy()
     expire = datetime.now(tz=ZoneInfo('UTC')) + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES,
@@ -42,18 +41,12 @@ def create_access_token(data: dict):
     return encoded_jwt
 
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
-
 async def get_current_user(
     session: Session,
     token: token,
 ) -> User:
+    from jwt import DecodeError, ExpiredSignatureError, decode
+
     credentials_exception = HTTPException(
         status_code=HTTPStatus.UNAUTHORIZED,
         detail='Could not validate credentials',
@@ -73,9 +66,16 @@ async def get_current_user(
     except ExpiredSignatureError:
         raise credentials_exception
 
+    cached = principal_cache.get(subject_email)
+    if cached is not None:
+        # Anexa uma cópia à sessão sem consultar o banco
+        return await session.merge(cached, load=False)
+
+    generation = principal_cache.generation
     user = await session.scalar(
         select(User).where(User.email == subject_email),
     )
     if not user:
         raise credentials_exception
+    principal_cache.set(subject_email, user, payload.get('exp', 0), generation)
     return user
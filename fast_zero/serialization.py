@@ -0,0 +1,71 @@
+"""Serialização rápida das respostas de listagem.
+
+As listagens montam os dicionários direto das linhas e codificam com o
+orjson, sem passar cada item de novo pela validação do Pydantic. Os
+`response_model` continuam declarados nas rotas, então o schema do
+OpenAPI não muda; os campos aqui precisam acompanhar `TodoPublic` e
+`UserPublic` (e `TodoChanges`).
+
+As colunas `*_PUBLIC_COLUMNS` são as projeções usadas pelas listagens:
+as linhas voltam como tuplas do SQLAlchemy, sem instâncias mapeadas no
+identity map da sessão nem estado de unit of work.
+"""
+
+from fastapi.responses import ORJSONResponse
+
+from fast_zero.models import Todo, User
+
+TODO_PUBLIC_COLUMNS = (
+    Todo.id,
+    Todo.title,
+    Todo.description,
+    Todo.state,
+    Todo.created_at,
+    Todo.updated_at,
+)
+USER_PUBLIC_COLUMNS = (User.id, User.username, User.email)
+
+
+def todo_public(todo) -> dict:
+    return {
+        'title': todo.title,
+        'description': todo.description,
+        'state': todo.state,
+        'id': todo.id,
+        'created_at': todo.created_at,
+        'updated_at': todo.updated_at,
+    }
+
+
+def user_public(user) -> dict:
+    return {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+    }
+
+
+def todo_list_response(todos, cursor=None) -> ORJSONResponse:
+    return ORJSONResponse({
+        'todos': [todo_public(todo) for todo in todos],
+        'next_cursor': cursor,
+    })
+
+
+def todo_changes_response(changes) -> ORJSONResponse:
+    return ORJSONResponse({
+        'todos': [todo_public(todo) for todo in changes['todos']],
+        'deleted': [
+            {'id': tombstone.id, 'deleted_at': tombstone.deleted_at}
+            for tombstone in changes['deleted']
+        ],
+        'watermark': changes['watermark'],
+        'has_more': changes['has_more'],
+    })
+
+
+def user_list_response(users, cursor=None) -> ORJSONResponse:
+    return ORJSONResponse({
+        'users': [user_public(user) for user in users],
+        'next_cursor': cursor,
+    })
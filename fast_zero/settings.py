@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -11,3 +14,82 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+
+    # Pool de conexões do banco de dados
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+
+    # Réplica de leitura (opcional) e a janela em que quem escreveu lê do
+    # primário
+    READ_DATABASE_URL: str | None = None
+    READ_YOUR_WRITES_SECONDS: float = 5
+
+    # PRAGMAs aplicados em cada conexão do SQLite (busy_timeout em ms,
+    # cache_size negativo em KiB, mmap_size em bytes; 0 desliga o mmap)
+    SQLITE_JOURNAL_MODE: Literal['delete', 'truncate', 'persist', 'wal'] = (
+        'wal'
+    )
+    SQLITE_SYNCHRONOUS: Literal['off', 'normal', 'full', 'extra'] = 'normal'
+    SQLITE_BUSY_TIMEOUT: int = 5000
+    SQLITE_CACHE_SIZE: int = -16384
+    SQLITE_MMAP_SIZE: int = 268_435_456
+    SQLITE_TEMP_STORE: Literal['default', 'file', 'memory'] = 'memory'
+
+    # Caches de prepared statements do asyncpg (0 desliga; necessário atrás
+    # de um pgbouncer em modo transaction)
+    ASYNCPG_STATEMENT_CACHE_SIZE: int = 100
+    ASYNCPG_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+
+    # Pool de workers para o Argon2 (0 roda no próprio event loop)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    PASSWORD_HASH_EXECUTOR: Literal['thread', 'process'] = 'thread'
+
+    # Cache dos usuários autenticados (tamanho 0 desliga o cache)
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL: float = 60
+
+    # Cache das respostas de GET /users/ e GET /users/{id} (tamanho 0
+    # desliga o cache)
+    RESPONSE_CACHE_SIZE: int = 1024
+    RESPONSE_CACHE_TTL: float = 30
+
+    # Limpeza das tarefas na lixeira (intervalo 0 desliga o worker)
+    TRASH_PURGE_AFTER_DAYS: int = 30
+    TRASH_PURGE_BATCH_SIZE: int = 500
+    TRASH_PURGE_PAUSE: float = 0.05
+    TRASH_PURGE_INTERVAL: float = 0
+
+    # Sincronia incremental (GET /todos/changes): alterações mais recentes
+    # que a janela de acomodação ficam para a próxima consulta, e as
+    # lápides das tarefas removidas são guardadas pela retenção
+    TODO_CHANGES_SETTLE_SECONDS: float = 2
+    TODO_TOMBSTONE_RETENTION_DAYS: int = 90
+
+    # Contas com mais tarefas que o limite são apagadas em segundo plano,
+    # em lotes (0 sempre apaga na própria requisição)
+    ACCOUNT_DELETE_BACKGROUND_THRESHOLD: int = 10_000
+    ACCOUNT_DELETE_BATCH_SIZE: int = 5_000
+    ACCOUNT_DELETE_PAUSE: float = 0.05
+
+    # Custo do Argon2; `python -m fast_zero.cli calibrate-argon2` mede o
+    # host e sugere valores para a latência desejada
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+
+    # Limite de tentativas em /auth/token e na criação de usuários
+    # (por minuto e rajada; 0 desliga o limite)
+    AUTH_RATE_LIMIT_IP_PER_MINUTE: float = 60
+    AUTH_RATE_LIMIT_IP_BURST: int = 20
+    AUTH_RATE_LIMIT_IDENTITY_PER_MINUTE: float = 10
+    AUTH_RATE_LIMIT_IDENTITY_BURST: int = 5
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Settings do processo, lidas do ambiente e do `.env` uma única vez."""
+    return Settings()
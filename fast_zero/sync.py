@@ -0,0 +1,119 @@
+"""Sincronia incremental das tarefas (GET /todos/changes).
+
+As alterações formam um fluxo ordenado por `(data, id)`: as tarefas
+criadas ou alteradas pelo `updated_at` e as removidas pelo `deleted_at`
+da lápide. O watermark é a posição da última alteração entregue; cada
+consulta lê as duas fontes a partir dele pelos índices `(user_id,
+updated_at, id)` e `(user_id, deleted_at, id)`, no máximo `limit + 1`
+linhas de cada, e intercala o resultado.
+
+Só entram alterações anteriores ao horizonte (agora menos
+`TODO_CHANGES_SETTLE_SECONDS`, em segundos inteiros): o SQLite grava as
+datas sem frações de segundo e uma transação pode confirmar depois de
+outra com data maior. Sem essa folga, uma alteração gravada no mesmo
+segundo do watermark seria perdida. A última página devolve o próprio
+horizonte como watermark, então um cliente sem alterações também avança;
+um watermark além do horizonte não saiu do servidor e recebe 400.
+
+As lápides são apagadas depois de `TODO_TOMBSTONE_RETENTION_DAYS` pela
+limpeza da lixeira (o worker com `TRASH_PURGE_INTERVAL` ou o comando
+`purge-trash`); um watermark mais antigo que isso recebe 410 e o cliente
+refaz a sincronia completa (sem `since`, quando as lápides não
+interessam).
+"""
+
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fast_zero.models import Todo, TodoTombstone
+from fast_zero.pagination import decode_watermark, encode_watermark
+from fast_zero.purge import purge_cutoff
+from fast_zero.serialization import TODO_PUBLIC_COLUMNS
+
+
+def sync_horizon(settle_seconds: float) -> datetime:
+    """Limite (exclusivo) das alterações que já podem ser entregues."""
+    horizon = purge_cutoff(timedelta(seconds=settle_seconds))
+    return horizon.replace(microsecond=0)
+
+
+def _window(query, columns, position, horizon, limit):
+    changed_at, key = columns
+    query = query.where(changed_at < horizon)
+    if position:
+        query = query.where(tuple_(changed_at, key) > position)
+    return query.order_by(changed_at, key).limit(limit + 1)
+
+
+async def todo_changes(
+    session: AsyncSession,
+    user_id: int,
+    filter_changes,
+    settings,
+) -> dict:
+    """Retorna as alterações do usuário depois do watermark `since`."""
+    horizon = sync_horizon(settings.TODO_CHANGES_SETTLE_SECONDS)
+    position = None
+    if filter_changes.since:
+        position = decode_watermark(filter_changes.since)
+        # O servidor nunca entrega um watermark além do horizonte
+        if position[0] > horizon:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail='Invalid watermark',
+            )
+        retention = timedelta(days=settings.TODO_TOMBSTONE_RETENTION_DAYS)
+        if position[0] < purge_cutoff(retention):
+            raise HTTPException(
+                status_code=HTTPStatus.GONE,
+                detail='Watermark expired, full sync required',
+            )
+
+    limit = filter_changes.limit
+    changes = [
+        (todo.updated_at, todo.id, False, todo)
+        for todo in await session.execute(
+            _window(
+                select(*TODO_PUBLIC_COLUMNS).where(Todo.user_id == user_id),
+                (Todo.updated_at, Todo.id),
+                position,
+                horizon,
+                limit,
+            ),
+        )
+    ]
+    # Na sincronia completa o cliente não tem o que remover
+    if position:
+        changes.extend(
+            (tombstone.deleted_at, tombstone.id, True, tombstone)
+            for tombstone in await session.execute(
+                _window(
+                    select(TodoTombstone.id, TodoTombstone.deleted_at).where(
+                        TodoTombstone.user_id == user_id,
+                    ),
+                    (TodoTombstone.deleted_at, TodoTombstone.id),
+                    position,
+                    horizon,
+                    limit,
+                ),
+            )
+        )
+    changes.sort(key=lambda change: change[:2])
+
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    if has_more:
+        watermark = changes[-1][:2]
+    else:
+        watermark = (horizon, 0)
+
+    return {
+        'todos': [row for *_, deleted, row in changes if not deleted],
+        'deleted': [row for *_, deleted, row in changes if deleted],
+        'watermark': encode_watermark(*watermark),
+        'has_more': has_more,
+    }
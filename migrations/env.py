@@ -7,12 +7,12 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from sqlalchemy import pool
 
 from fast_zero.models import table_registry
-from fast_zero.settings import Settings
+from fast_zero.settings import get_settings
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
-config.set_main_option("sqlalchemy.url", Settings().DATABASE_URL)
+config.set_main_option("sqlalchemy.url", get_settings().DATABASE_URL)
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -31,10 +31,18 @@ target_metadata = table_registry.metadata
 # ... etc.
 
 
+def include_name(name, type_, parent_names):
+    # As tabelas da busca textual (FTS5) são criadas por SQL nas migrações
+    if type_ == "table" and name.startswith("todos_fts"):
+        return False
+    return True
+
+
 def do_run_migrations(connection):
     context.configure(
         connection=connection,
         target_metadata=target_metadata,
+        include_name=include_name,
     )
 
     with context.begin_transaction():
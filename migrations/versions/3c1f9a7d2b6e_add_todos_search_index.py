@@ -0,0 +1,82 @@
+"""add todos search index
+
+Revision ID: 3c1f9a7d2b6e
+Revises: 71ebdab45bb2
+Create Date: 2026-10-18 10:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f9a7d2b6e'
+down_revision: Union[str, None] = '71ebdab45bb2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute(
+            """
+            CREATE VIRTUAL TABLE todos_fts USING fts5(
+                title, description,
+                content='todos', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER todos_fts_insert AFTER INSERT ON todos BEGIN
+                INSERT INTO todos_fts(rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER todos_fts_delete AFTER DELETE ON todos BEGIN
+                INSERT INTO todos_fts(todos_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER todos_fts_update
+            AFTER UPDATE OF title, description ON todos BEGIN
+                INSERT INTO todos_fts(todos_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO todos_fts(rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END
+            """
+        )
+        # Indexa as tarefas que já existem
+        op.execute("INSERT INTO todos_fts(todos_fts) VALUES ('rebuild')")
+
+    elif dialect == 'postgresql':
+        op.execute(
+            "CREATE INDEX ix_todos_search ON todos USING GIN "
+            "(to_tsvector('simple', title || ' ' || description))"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS todos_fts_update')
+        op.execute('DROP TRIGGER IF EXISTS todos_fts_delete')
+        op.execute('DROP TRIGGER IF EXISTS todos_fts_insert')
+        op.execute('DROP TABLE IF EXISTS todos_fts')
+
+    elif dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_todos_search')
@@ -0,0 +1,136 @@
+"""add todo counters
+
+Revision ID: 5d7e9c1b3a24
+Revises: 8e4b2d6f0a13
+Create Date: 2026-10-18 14:21:06.918442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d7e9c1b3a24'
+down_revision: Union[str, None] = '8e4b2d6f0a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    # O tipo todostate já existe no Postgres, criado junto com a tabela todos
+    state = sa.Enum(
+        'draft', 'todo', 'doing', 'done', 'trash', name='todostate'
+    ).with_variant(
+        postgresql.ENUM(name='todostate', create_type=False), 'postgresql'
+    )
+    op.create_table('todo_counters',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('state', state, nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'state')
+    )
+
+    if dialect == 'sqlite':
+        op.execute(
+            """
+            CREATE TRIGGER todo_counters_insert AFTER INSERT ON todos BEGIN
+                INSERT INTO todo_counters (user_id, state, count)
+                VALUES (new.user_id, new.state, 1)
+                ON CONFLICT (user_id, state) DO UPDATE SET count = count + 1;
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER todo_counters_delete AFTER DELETE ON todos BEGIN
+                UPDATE todo_counters SET count = count - 1
+                WHERE user_id = old.user_id AND state = old.state;
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER todo_counters_update AFTER UPDATE OF state, user_id
+            ON todos
+            WHEN old.state IS NOT new.state OR old.user_id IS NOT new.user_id
+            BEGIN
+                UPDATE todo_counters SET count = count - 1
+                WHERE user_id = old.user_id AND state = old.state;
+                INSERT INTO todo_counters (user_id, state, count)
+                VALUES (new.user_id, new.state, 1)
+                ON CONFLICT (user_id, state) DO UPDATE SET count = count + 1;
+            END
+            """
+        )
+
+    elif dialect == 'postgresql':
+        op.execute(
+            """
+            CREATE FUNCTION todo_counters_apply() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    UPDATE todo_counters SET count = count - 1
+                    WHERE user_id = OLD.user_id AND state = OLD.state;
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    INSERT INTO todo_counters (user_id, state, count)
+                    VALUES (NEW.user_id, NEW.state, 1)
+                    ON CONFLICT (user_id, state)
+                    DO UPDATE SET count = todo_counters.count + 1;
+                END IF;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER todo_counters_insert_delete
+            AFTER INSERT OR DELETE ON todos
+            FOR EACH ROW EXECUTE FUNCTION todo_counters_apply()
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER todo_counters_update
+            AFTER UPDATE OF state, user_id ON todos
+            FOR EACH ROW
+            WHEN (
+                OLD.state IS DISTINCT FROM NEW.state
+                OR OLD.user_id IS DISTINCT FROM NEW.user_id
+            )
+            EXECUTE FUNCTION todo_counters_apply()
+            """
+        )
+
+    # Preenche os contadores com as tarefas que já existem
+    op.execute(
+        'INSERT INTO todo_counters (user_id, state, count) '
+        'SELECT user_id, state, count(*) FROM todos GROUP BY user_id, state'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS todo_counters_update')
+        op.execute('DROP TRIGGER IF EXISTS todo_counters_delete')
+        op.execute('DROP TRIGGER IF EXISTS todo_counters_insert')
+
+    elif dialect == 'postgresql':
+        op.execute('DROP TRIGGER IF EXISTS todo_counters_update ON todos')
+        op.execute(
+            'DROP TRIGGER IF EXISTS todo_counters_insert_delete ON todos'
+        )
+        op.execute('DROP FUNCTION IF EXISTS todo_counters_apply()')
+
+    op.drop_table('todo_counters')
@@ -0,0 +1,117 @@
+"""cascade todos user_id
+
+Revision ID: b3d5f7a9c1e2
+Revises: 9a2c4e6b8d15
+Create Date: 2026-10-18 16:40:12.553901
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d5f7a9c1e2'
+down_revision: Union[str, None] = '9a2c4e6b8d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# A chave estrangeira foi criada sem nome; no SQLite o batch a reflete com
+# este nome para poder trocá-la
+naming_convention = {
+    'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s',
+}
+SQLITE_FK_NAME = 'fk_todos_user_id_users'
+POSTGRES_FK_NAME = 'todos_user_id_fkey'
+
+# O SQLite recria a tabela todos no batch e os triggers dela se perdem
+SQLITE_TRIGGERS = (
+    """
+    CREATE TRIGGER todos_fts_insert AFTER INSERT ON todos BEGIN
+        INSERT INTO todos_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER todos_fts_delete AFTER DELETE ON todos BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER todos_fts_update
+    AFTER UPDATE OF title, description ON todos BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO todos_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER todo_counters_insert AFTER INSERT ON todos BEGIN
+        INSERT INTO todo_counters (user_id, state, count)
+        VALUES (new.user_id, new.state, 1)
+        ON CONFLICT (user_id, state) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER todo_counters_delete AFTER DELETE ON todos BEGIN
+        UPDATE todo_counters SET count = count - 1
+        WHERE user_id = old.user_id AND state = old.state;
+    END
+    """,
+    """
+    CREATE TRIGGER todo_counters_update AFTER UPDATE OF state, user_id
+    ON todos
+    WHEN old.state IS NOT new.state OR old.user_id IS NOT new.user_id
+    BEGIN
+        UPDATE todo_counters SET count = count - 1
+        WHERE user_id = old.user_id AND state = old.state;
+        INSERT INTO todo_counters (user_id, state, count)
+        VALUES (new.user_id, new.state, 1)
+        ON CONFLICT (user_id, state) DO UPDATE SET count = count + 1;
+    END
+    """,
+)
+
+
+def _replace_foreign_key(ondelete) -> None:
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        with op.batch_alter_table(
+            'todos',
+            recreate='always',
+            naming_convention=naming_convention,
+        ) as batch_op:
+            batch_op.drop_constraint(SQLITE_FK_NAME, type_='foreignkey')
+            batch_op.create_foreign_key(
+                SQLITE_FK_NAME,
+                'users',
+                ['user_id'],
+                ['id'],
+                ondelete=ondelete,
+            )
+        for statement in SQLITE_TRIGGERS:
+            op.execute(statement)
+
+    else:
+        op.drop_constraint(POSTGRES_FK_NAME, 'todos', type_='foreignkey')
+        op.create_foreign_key(
+            POSTGRES_FK_NAME,
+            'todos',
+            'users',
+            ['user_id'],
+            ['id'],
+            ondelete=ondelete,
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace_foreign_key('CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_foreign_key(None)
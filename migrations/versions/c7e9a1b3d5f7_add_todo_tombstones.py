@@ -0,0 +1,96 @@
+"""add todo tombstones
+
+Revision ID: c7e9a1b3d5f7
+Revises: b3d5f7a9c1e2
+Create Date: 2026-10-18 17:26:51.384120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e9a1b3d5f7'
+down_revision: Union[str, None] = 'b3d5f7a9c1e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    op.create_table('todo_tombstones',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'id')
+    )
+    op.create_index('ix_todo_tombstones_deleted_at', 'todo_tombstones', ['deleted_at'], unique=False)
+    op.create_index('ix_todo_tombstones_user_id_deleted_at_id', 'todo_tombstones', ['user_id', 'deleted_at', 'id'], unique=False)
+
+    if dialect == 'sqlite':
+        op.execute(
+            """
+            CREATE TRIGGER todo_tombstones_insert AFTER DELETE ON todos
+            WHEN EXISTS (SELECT 1 FROM users WHERE id = old.user_id)
+            BEGIN
+                INSERT INTO todo_tombstones (user_id, id)
+                VALUES (old.user_id, old.id)
+                ON CONFLICT (user_id, id)
+                DO UPDATE SET deleted_at = excluded.deleted_at;
+            END
+            """
+        )
+        # O SQLite reaproveita o id da maior tarefa apagada
+        op.execute(
+            """
+            CREATE TRIGGER todo_tombstones_reuse AFTER INSERT ON todos BEGIN
+                DELETE FROM todo_tombstones
+                WHERE user_id = new.user_id AND id = new.id;
+            END
+            """
+        )
+
+    elif dialect == 'postgresql':
+        op.execute(
+            """
+            CREATE FUNCTION todo_tombstones_record() RETURNS trigger AS $$
+            BEGIN
+                INSERT INTO todo_tombstones (user_id, id)
+                SELECT OLD.user_id, OLD.id
+                WHERE EXISTS (SELECT 1 FROM users WHERE id = OLD.user_id)
+                ON CONFLICT (user_id, id)
+                DO UPDATE SET deleted_at = excluded.deleted_at;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER todo_tombstones_insert
+            AFTER DELETE ON todos
+            FOR EACH ROW EXECUTE FUNCTION todo_tombstones_record()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS todo_tombstones_reuse')
+        op.execute('DROP TRIGGER IF EXISTS todo_tombstones_insert')
+
+    elif dialect == 'postgresql':
+        op.execute('DROP TRIGGER IF EXISTS todo_tombstones_insert ON todos')
+        op.execute('DROP FUNCTION IF EXISTS todo_tombstones_record()')
+
+    op.drop_index('ix_todo_tombstones_user_id_deleted_at_id', table_name='todo_tombstones')
+    op.drop_index('ix_todo_tombstones_deleted_at', table_name='todo_tombstones')
+    op.drop_table('todo_tombstones')
@@ -1,3 +1,4 @@
+import re
 import secrets
 import string
 from contextlib import contextmanager
@@ -10,10 +11,17 @@ from fastapi.testclient import TestClient
 from sqlalchemy import StaticPool, event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
+from fast_zero import ratelimit
 from fast_zero.app import app
-from fast_zero.database import get_session
+from fast_zero.cache import principal_cache
+from fast_zero.database import (
+    get_read_session,
+    get_session,
+    set_sqlite_pragmas,
+)
+from fast_zero.hashing import get_password_hash
 from fast_zero.models import User, table_registry
-from fast_zero.security import get_password_hash
+from fast_zero.response_cache import response_cache
 
 
 def create_password(length=8):
@@ -22,6 +30,30 @@ def create_password(length=8):
     return ''.join(secrets.choice(characters) for _ in range(length))
 
 
+@pytest.fixture(autouse=True)
+def _clear_principal_cache():
+    """Cada teste começa com o cache de usuários autenticados vazio."""
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _clear_response_cache():
+    """Cada teste começa com o cache de respostas vazio."""
+    response_cache.clear()
+    yield
+    response_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _clear_rate_limits():
+    """Cada teste começa com os limites de tentativas zerados."""
+    ratelimit.backend.clear()
+    yield
+    ratelimit.backend.clear()
+
+
 @pytest.fixture
 def client(session):
     """Fixture para criar um cliente de teste do FastAPI."""
@@ -32,6 +64,7 @@ def client(session):
 
     with TestClient(app) as client:
         app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_read_session] = get_session_override
         yield client
     app.dependency_overrides.clear()
 
@@ -39,10 +72,12 @@ def client(session):
 @pytest_asyncio.fixture
 async def session():
     """Fixture para criar uma sessão de banco de dados para testes."""
-    engine = create_async_engine(
-        'sqlite+aiosqlite:///:memory:',
-        connect_args={'check_same_thread': False},
-        poolclass=StaticPool,
+    engine = set_sqlite_pragmas(
+        create_async_engine(
+            'sqlite+aiosqlite:///:memory:',
+            connect_args={'check_same_thread': False},
+            poolclass=StaticPool,
+        )
     )
     async with engine.begin() as conn:
         await conn.run_sync(table_registry.metadata.create_all)
@@ -77,6 +112,80 @@ def mock_db_time():
     return _mock_db_time
 
 
+@contextmanager
+def _capture_queries(engine):
+    """Registra os comandos SQL e seus parâmetros executados no engine."""
+    queries = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        queries.append((statement, parameters))
+
+    event.listen(
+        engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+    )
+    yield queries
+    event.remove(
+        engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+    )
+
+
+@contextmanager
+def _count_queries(engine):
+    """Registra os comandos SQL executados no engine, sem os parâmetros."""
+    statements = []
+    with _capture_queries(engine) as queries:
+        yield statements
+    statements.extend(statement for statement, _ in queries)
+
+
+@pytest.fixture
+def count_queries(session):
+    """Fixture para contar os comandos SQL emitidos durante um bloco."""
+    return lambda: _count_queries(session.bind)
+
+
+class QueryPlans:
+    """Captura consultas e verifica os seus planos com EXPLAIN QUERY PLAN."""
+
+    def __init__(self, session):
+        self.session = session
+        self.queries = []
+
+    @contextmanager
+    def capture(self):
+        with _capture_queries(self.session.bind) as queries:
+            yield queries
+        self.queries.extend(queries)
+
+    async def full_scans(self, table):
+        """Retorna os passos dos planos capturados que varrem `table`."""
+        connection = await self.session.connection()
+        scans = []
+        for statement, parameters in self.queries:
+            if (
+                not statement.lstrip()
+                .upper()
+                .startswith(('SELECT', 'UPDATE', 'DELETE'))
+            ):
+                continue
+            plan = await connection.exec_driver_sql(
+                f'EXPLAIN QUERY PLAN {statement}',
+                parameters,
+            )
+            scans.extend(
+                (statement, row.detail)
+                for row in plan
+                if re.match(rf'SCAN {table}\b', row.detail)
+            )
+        return scans
+
+
+@pytest.fixture
+def query_plans(session):
+    """Fixture para verificar se as consultas de um bloco usam índices."""
+    return QueryPlans(session)
+
+
 @pytest_asyncio.fixture
 async def user(session):
     """Fixture para criar um usuário de teste."""
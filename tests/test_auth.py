@@ -1,8 +1,11 @@
 from datetime import datetime, timedelta
 from http import HTTPStatus
 
+import pytest
 from freezegun import freeze_time
+from pwdlib.hashers.argon2 import Argon2Hasher
 
+from fast_zero.hashing import needs_rehash, verify_password
 from fast_zero.security import settings
 
 
@@ -124,3 +127,43 @@ def test_token_expired_dont_refresh(client, user):
     assert response.json() == {
         'detail': 'Could not validate credentials',
     }
+
+
+def test_current_user_does_not_load_todos(client, user, token, count_queries):
+    with count_queries() as statements:
+        response = client.post(
+            '/auth/refresh_token',
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(statements) == 1
+    assert 'todos' not in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_password(client, session, user):
+    legacy = Argon2Hasher(time_cost=1, memory_cost=8192, parallelism=1)
+    user.password = legacy.hash(user.clean_password)
+    await session.commit()
+
+    response = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    )
+
+    await session.refresh(user)
+    assert response.status_code == HTTPStatus.OK
+    assert not needs_rehash(user.password)
+    assert verify_password(user.clean_password, user.password)
+
+
+def test_login_keeps_current_hash(client, user):
+    hashed = user.password
+
+    client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    )
+
+    assert user.password == hashed
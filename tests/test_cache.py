@@ -0,0 +1,113 @@
+import time
+from http import HTTPStatus
+
+import pytest
+
+from fast_zero.cache import LocalBroker, PrincipalCache, TTLCache
+from fast_zero.models import User
+
+
+def _user(user_id=1):
+    user = User(username='alice', password='hash', email='alice@test.com')
+    user.id = user_id
+    user.created_at = user.updated_at = None
+    return user
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    expected_value = 3
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', expected_value)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == expected_value
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    cache = TTLCache(maxsize=10, ttl=60)
+    now = time.monotonic()
+    cache.set('a', 1, ttl=5)
+
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 6)
+
+    assert cache.get('a') is None
+    assert cache.misses == 1
+
+
+def test_principal_cache_caps_entry_at_token_exp():
+    principals = PrincipalCache(TTLCache(maxsize=10, ttl=60), LocalBroker())
+    principals.set('alice', _user(), time.time() - 1, principals.generation)
+
+    assert principals.get('alice') is None
+
+
+@pytest.mark.asyncio
+async def test_local_broker_invalidates_every_worker():
+    broker = LocalBroker()
+    workers = [
+        PrincipalCache(TTLCache(maxsize=10, ttl=60), broker) for _ in range(2)
+    ]
+    for principals in workers:
+        principals.set('alice', _user(), time.time() + 60, 0)
+    assert workers[1].get('alice') is not None
+
+    await workers[0].invalidate('alice')
+
+    assert all(principals.get('alice') is None for principals in workers)
+
+
+@pytest.mark.asyncio
+async def test_principal_cache_ignores_reads_older_than_invalidation():
+    principals = PrincipalCache(TTLCache(maxsize=10, ttl=60), LocalBroker())
+    generation = principals.generation
+
+    await principals.invalidate('alice')
+    principals.set('alice', _user(), time.time() + 60, generation)
+
+    assert principals.get('alice') is None
+
+
+def test_current_user_is_served_from_cache(client, token, count_queries):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.post('/auth/refresh_token', headers=headers)
+
+    with count_queries() as statements:
+        response = client.post('/auth/refresh_token', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert statements == []
+    assert 'principal_cache_requests_total{result="hit"}' in (
+        client.get('/metrics').text
+    )
+
+
+def test_update_user_invalidates_cached_principal(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.post('/auth/refresh_token', headers=headers)
+
+    client.put(
+        f'/users/{user.id}',
+        headers=headers,
+        json={
+            'username': 'renamed',
+            'email': 'renamed@test.com',
+            'password': 'secret',
+        },
+    )
+    response = client.post('/auth/refresh_token', headers=headers)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_delete_user_invalidates_cached_principal(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.post('/auth/refresh_token', headers=headers)
+
+    client.delete(f'/users/{user.id}', headers=headers)
+    response = client.post('/auth/refresh_token', headers=headers)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import select, update
+
+from fast_zero.counters import rebuild_todo_counters
+from fast_zero.models import Todo, TodoCounter, TodoState
+
+
+async def _counters(session):
+    rows = await session.execute(
+        select(TodoCounter.user_id, TodoCounter.state, TodoCounter.count)
+        .where(TodoCounter.count > 0)
+        .order_by(TodoCounter.user_id, TodoCounter.state),
+    )
+    return rows.all()
+
+
+@pytest.mark.asyncio
+async def test_rebuild_todo_counters_fixes_drift(session, user, other_user):
+    expected_rows = 3
+    session.add_all([
+        Todo('a', 'a', TodoState.todo, user.id),
+        Todo('b', 'b', TodoState.todo, user.id),
+        Todo('c', 'c', TodoState.done, user.id),
+        Todo('d', 'd', TodoState.draft, other_user.id),
+    ])
+    await session.commit()
+    expected = await _counters(session)
+
+    # Simula contadores corrompidos, fora dos triggers
+    await session.execute(update(TodoCounter).values(count=42))
+    await session.commit()
+
+    connection = await session.connection()
+    rows = await rebuild_todo_counters(connection)
+    await session.commit()
+
+    assert rows == expected_rows
+    assert await _counters(session) == expected
+
+
+@pytest.mark.asyncio
+async def test_rebuild_todo_counters_for_one_user(session, user, other_user):
+    session.add_all([
+        Todo('a', 'a', TodoState.todo, user.id),
+        Todo('b', 'b', TodoState.todo, other_user.id),
+    ])
+    await session.commit()
+    await session.execute(update(TodoCounter).values(count=42))
+    await session.commit()
+
+    connection = await session.connection()
+    await rebuild_todo_counters(connection, user_id=user.id)
+    await session.commit()
+
+    counts = dict(
+        (
+            await session.execute(
+                select(TodoCounter.user_id, TodoCounter.count),
+            )
+        ).all()
+    )
+    assert counts == {user.id: 1, other_user.id: 42}
@@ -0,0 +1,149 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import StaticPool, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from fast_zero import database
+from fast_zero.database import (
+    InstrumentedQueuePool,
+    build_engine,
+    engine_options,
+    get_session,
+    pool_status,
+)
+from fast_zero.settings import Settings
+
+
+@pytest.mark.asyncio
+async def test_build_engine_uses_pool_settings(tmp_path):
+    settings = Settings(
+        DATABASE_URL=f'sqlite+aiosqlite:///{tmp_path / "pool.db"}',
+        DATABASE_POOL_SIZE=3,
+        DATABASE_MAX_OVERFLOW=1,
+        DATABASE_POOL_RECYCLE=60,
+    )
+    engine = build_engine(settings)
+    try:
+        assert isinstance(engine.pool, InstrumentedQueuePool)
+        assert engine.pool.size() == settings.DATABASE_POOL_SIZE
+        assert engine.pool._max_overflow == settings.DATABASE_MAX_OVERFLOW
+        assert engine.pool._recycle == settings.DATABASE_POOL_RECYCLE
+        assert engine.pool._pre_ping
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_build_engine_applies_sqlite_pragmas(tmp_path):
+    settings = Settings(
+        DATABASE_URL=f'sqlite+aiosqlite:///{tmp_path / "pragmas.db"}',
+        SQLITE_BUSY_TIMEOUT=1234,
+        SQLITE_MMAP_SIZE=1_048_576,
+    )
+    engine = build_engine(settings)
+    try:
+        async with engine.connect() as conn:
+            pragmas = {
+                name: await conn.scalar(text(f'PRAGMA {name}'))
+                for name in (
+                    'foreign_keys',
+                    'journal_mode',
+                    'synchronous',
+                    'busy_timeout',
+                    'cache_size',
+                    'mmap_size',
+                    'temp_store',
+                )
+            }
+    finally:
+        await engine.dispose()
+
+    # synchronous=NORMAL é 1 e temp_store=MEMORY é 2
+    assert pragmas == {
+        'foreign_keys': 1,
+        'journal_mode': 'wal',
+        'synchronous': 1,
+        'busy_timeout': settings.SQLITE_BUSY_TIMEOUT,
+        'cache_size': settings.SQLITE_CACHE_SIZE,
+        'mmap_size': settings.SQLITE_MMAP_SIZE,
+        'temp_store': 2,
+    }
+
+
+def test_engine_options_for_asyncpg():
+    settings = Settings(
+        DATABASE_URL='postgresql+asyncpg://app:secret@db/app',
+        ASYNCPG_STATEMENT_CACHE_SIZE=0,
+        ASYNCPG_PREPARED_STATEMENT_CACHE_SIZE=500,
+    )
+
+    url, options = engine_options(settings)
+
+    assert url.query == {'prepared_statement_cache_size': '500'}
+    assert options['connect_args'] == {'statement_cache_size': 0}
+    assert options['poolclass'] is InstrumentedQueuePool
+
+
+@pytest.mark.asyncio
+async def test_build_engine_in_memory_keeps_static_pool():
+    settings = Settings(DATABASE_URL='sqlite+aiosqlite:///:memory:')
+    engine = build_engine(settings)
+    try:
+        assert isinstance(engine.pool, StaticPool)
+        assert pool_status(engine)['size'] == 0
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_status_counts_checked_out_connections(tmp_path):
+    settings = Settings(
+        DATABASE_URL=f'sqlite+aiosqlite:///{tmp_path / "pool.db"}',
+    )
+    engine = build_engine(settings)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text('SELECT 1'))
+            status = pool_status(engine)
+            assert status['checked_out'] == 1
+            assert status['wait_count'] == 1
+
+        status = pool_status(engine)
+        assert status['checked_out'] == 0
+        assert status['checked_in'] == 1
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_get_session_closes_session(session, monkeypatch):
+    monkeypatch.setattr(
+        database,
+        'SessionLocal',
+        async_sessionmaker(session.bind, expire_on_commit=False),
+    )
+    sessions = get_session()
+    new_session = await anext(sessions)
+    await new_session.execute(text('SELECT 1'))
+    assert new_session.in_transaction()
+
+    with pytest.raises(StopAsyncIteration):
+        await anext(sessions)
+
+    assert not new_session.in_transaction()
+
+
+def test_read_pool_status(client):
+    response = client.get('/health/pool')
+
+    assert response.status_code == HTTPStatus.OK
+    assert set(response.json()) == {
+        'size',
+        'checked_out',
+        'checked_in',
+        'overflow',
+        'wait_count',
+        'wait_time_total',
+        'wait_time_max',
+    }
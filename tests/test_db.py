@@ -2,6 +2,8 @@ from dataclasses import asdict
 
 import pytest
 from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import selectinload
 
 from fast_zero.models import Todo, User
 
@@ -26,7 +28,9 @@ async def test_create_user(session, mock_db_time):
         await session.commit()
 
     user = await session.scalar(
-        select(User).where(User.username == user_test['username']),
+        select(User)
+        .where(User.username == user_test['username'])
+        .options(selectinload(User.todos)),
     )
 
     user_test['created_at'] = time
@@ -70,6 +74,24 @@ async def test_user_todo_relationship(session, user):
     await session.commit()
     await session.refresh(user)
 
-    user = await session.scalar(select(User).where(User.id == user.id))
+    user = await session.scalar(
+        select(User)
+        .where(User.id == user.id)
+        .options(selectinload(User.todos)),
+    )
 
     assert user.todos == [todo]
+
+
+@pytest.mark.asyncio
+async def test_user_todos_is_not_loaded_implicitly(session, user):
+    user = await session.scalar(
+        select(User)
+        .where(User.id == user.id)
+        .execution_options(
+            populate_existing=True,
+        ),
+    )
+
+    with pytest.raises(InvalidRequestError):
+        user.todos
@@ -0,0 +1,75 @@
+from http import HTTPStatus
+
+from fast_zero.metrics import CONTENT_TYPE, Counter, Histogram, Registry
+
+
+def test_counter_render_with_labels():
+    registry = Registry()
+    counter = Counter('hits_total', 'Acessos.', ('route',), registry=registry)
+
+    counter.inc('/a')
+    counter.inc('/a', amount=2)
+    counter.inc('/b')
+
+    assert registry.render() == (
+        '# HELP hits_total Acessos.\n'
+        '# TYPE hits_total counter\n'
+        'hits_total{route="/a"} 3\n'
+        'hits_total{route="/b"} 1\n'
+    )
+
+
+def test_histogram_render_cumulative_buckets():
+    registry = Registry()
+    histogram = Histogram(
+        'latency_seconds',
+        'Latência.',
+        buckets=(0.1, 1.0),
+        registry=registry,
+    )
+
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    assert registry.render() == (
+        '# HELP latency_seconds Latência.\n'
+        '# TYPE latency_seconds histogram\n'
+        'latency_seconds_bucket{le="0.1"} 1\n'
+        'latency_seconds_bucket{le="1"} 2\n'
+        'latency_seconds_bucket{le="+Inf"} 3\n'
+        'latency_seconds_sum 5.55\n'
+        'latency_seconds_count 3\n'
+    )
+
+
+def test_metrics_endpoint_records_route_and_sql_statements(client, token):
+    client.get('/todos/', headers={'Authorization': f'Bearer {token}'})
+
+    response = client.get('/metrics')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == CONTENT_TYPE
+    assert (
+        'http_requests_total{method="GET",route="/todos/",status="200"}'
+        in response.text
+    )
+    assert (
+        'http_request_db_queries_count{method="GET",route="/todos/"}'
+        in response.text
+    )
+    assert 'password_hash_duration_seconds_count{operation="verify"}' in (
+        response.text
+    )
+    assert 'db_pool_checked_out 0' in response.text
+
+
+def test_metrics_groups_unknown_routes(client):
+    client.get('/nao-existe')
+
+    response = client.get('/metrics')
+
+    assert (
+        'http_requests_total{method="GET",route="unmatched",status="404"}'
+        in response.text
+    )
@@ -0,0 +1,200 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, insert, select, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from fast_zero import database, purge
+from fast_zero.cli import main
+from fast_zero.metrics import TRASH_PURGE_BATCHES
+from fast_zero.models import (
+    Todo,
+    TodoState,
+    TodoTombstone,
+    User,
+    table_registry,
+)
+from fast_zero.purge import delete_account, purge_cutoff, purge_trash
+
+MAX_FOREGROUND_LATENCY = 0.5
+
+
+async def _add_todos(conn, user_id, state, count, age=timedelta(days=60)):
+    await conn.execute(
+        insert(Todo),
+        [
+            {
+                'title': f'todo {n}',
+                'description': 'descrição',
+                'state': state,
+                'user_id': user_id,
+            }
+            for n in range(count)
+        ],
+    )
+    await conn.execute(
+        update(Todo)
+        .where(Todo.state == state)
+        .values(updated_at=purge_cutoff(age)),
+    )
+
+
+@pytest.mark.asyncio
+async def test_purge_trash_removes_only_old_trashed_todos(session, user):
+    expected_purged = 3
+    connection = await session.connection()
+    await _add_todos(connection, user.id, TodoState.trash, expected_purged)
+    await _add_todos(connection, user.id, TodoState.done, 2)
+    await _add_todos(
+        connection, user.id, TodoState.draft, 1, age=timedelta(days=1)
+    )
+    await connection.execute(
+        update(Todo)
+        .where(Todo.state == TodoState.draft)
+        .values(state=TodoState.trash),
+    )
+    await session.commit()
+
+    purged = await purge_trash(
+        session.bind, timedelta(days=30), batch_size=100, pause=0
+    )
+
+    states = await session.scalars(select(Todo.state).order_by(Todo.state))
+    assert purged == expected_purged
+    assert states.all() == [TodoState.done, TodoState.done, TodoState.trash]
+
+
+@pytest.mark.asyncio
+async def test_purge_trash_deletes_in_bounded_batches(
+    session, user, count_queries
+):
+    expected_batches = 3
+    connection = await session.connection()
+    await _add_todos(connection, user.id, TodoState.trash, 5)
+    await session.commit()
+    batches_before = TRASH_PURGE_BATCHES.values.get((), 0)
+
+    with count_queries() as statements:
+        await purge_trash(
+            session.bind, timedelta(days=30), batch_size=2, pause=0
+        )
+
+    deletes = [s for s in statements if s.startswith('DELETE FROM todos')]
+    assert len(deletes) == expected_batches
+    assert TRASH_PURGE_BATCHES.values[()] - batches_before == expected_batches
+
+
+@pytest.mark.asyncio
+async def test_delete_account_removes_todos_in_batches(
+    session, user, count_queries
+):
+    expected_batches = 3
+    expected_deleted = 5
+    connection = await session.connection()
+    await _add_todos(connection, user.id, TodoState.todo, expected_deleted)
+    await session.commit()
+
+    with count_queries() as statements:
+        deleted = await delete_account(
+            session.bind, user.id, batch_size=2, pause=0
+        )
+
+    deletes = [s for s in statements if s.startswith('DELETE FROM todos')]
+    assert deleted == expected_deleted
+    assert len(deletes) == expected_batches
+    assert await session.scalar(select(func.count()).select_from(User)) == 0
+
+
+@pytest.mark.asyncio
+async def test_delete_account_commits_no_tombstones(
+    session, user, monkeypatch
+):
+    tombstones = []
+
+    async def count_tombstones(pause):
+        # Entre um lote e outro, com o lote anterior já confirmado
+        tombstones.append(
+            await session.scalar(
+                select(func.count()).select_from(TodoTombstone),
+            )
+        )
+
+    connection = await session.connection()
+    await _add_todos(connection, user.id, TodoState.todo, 5)
+    await session.commit()
+    monkeypatch.setattr(purge.asyncio, 'sleep', count_tombstones)
+
+    await delete_account(session.bind, user.id, batch_size=2, pause=0)
+
+    assert tombstones == [0, 0]
+
+
+@pytest.mark.asyncio
+async def test_purge_trash_lets_foreground_queries_run(tmp_path):
+    """As consultas da aplicação continuam rodando durante a limpeza."""
+    rows = 20_000
+    batch_size = 500
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "t.db"}')
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.create_all)
+        await _add_todos(conn, 1, TodoState.trash, rows)
+
+    purge = asyncio.create_task(
+        purge_trash(engine, timedelta(days=30), batch_size, pause=0.005),
+    )
+    latencies = []
+    async with engine.connect() as conn:
+        while not purge.done():
+            start = time.perf_counter()
+            await conn.scalar(select(func.count()).select_from(Todo))
+            await conn.rollback()
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0)
+
+    purged = await purge
+    await engine.dispose()
+
+    # Um lote por vez: as leituras intercalam com as transações curtas e
+    # nenhuma espera pela limpeza inteira
+    assert purged == rows
+    assert len(latencies) >= rows // batch_size // 2
+    assert max(latencies) < MAX_FOREGROUND_LATENCY
+
+
+def test_purge_trash_command_removes_expired_tombstones(
+    tmp_path, monkeypatch, capsys
+):
+    path = tmp_path / 't.db'
+    sync_engine = create_engine(f'sqlite:///{path}')
+    table_registry.metadata.create_all(sync_engine)
+    with sync_engine.begin() as conn:
+        conn.execute(
+            insert(User).values(username='ana', email='a@a.com', password='x')
+        )
+        conn.execute(
+            insert(TodoTombstone),
+            [
+                {'user_id': 1, 'id': 1},
+                {'user_id': 1, 'id': 2},
+            ],
+        )
+        conn.execute(
+            update(TodoTombstone)
+            .where(TodoTombstone.id == 1)
+            .values(deleted_at=purge_cutoff(timedelta(days=100))),
+        )
+    monkeypatch.setattr(
+        database,
+        'engine',
+        create_async_engine(f'sqlite+aiosqlite:///{path}'),
+    )
+
+    main(['purge-trash', '--tombstone-retention-days', '90'])
+
+    with sync_engine.connect() as conn:
+        remaining = conn.scalars(select(TodoTombstone.id)).all()
+    sync_engine.dispose()
+    assert remaining == [2]
+    assert '1 lápides da sincronia removidas' in capsys.readouterr().out
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+import pytest
+
+from fast_zero.models import Todo, TodoState
+from fast_zero.pagination import encode_cursor, encode_watermark
+
+
+@pytest.mark.asyncio
+async def test_todo_queries_use_indexes(
+    session, client, user, token, query_plans
+):
+    session.add_all(
+        Todo(
+            title=f'todo {n}',
+            description='descrição',
+            state=TodoState.todo,
+            user_id=user.id,
+        )
+        for n in range(10)
+    )
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+    since = encode_watermark(datetime.now() - timedelta(days=1), 3)
+
+    with query_plans.capture():
+        for url in (
+            '/todos/',
+            '/todos/?state=todo',
+            '/todos/?title=todo',
+            '/todos/?description=todo&state=done',
+            f'/todos/?limit=2&cursor={encode_cursor(3)}',
+            '/todos/?q=todo',
+            '/todos/stats',
+            '/todos/changes?limit=2',
+            f'/todos/changes?since={since}',
+        ):
+            assert (
+                client.get(url, headers=headers).status_code == HTTPStatus.OK
+            )
+
+        response = client.post(
+            '/todos/',
+            headers=headers,
+            json={'title': 'nova', 'description': 'nova', 'state': 'draft'},
+        )
+        todo_id = response.json()['id']
+        client.patch(
+            f'/todos/{todo_id}',
+            headers=headers,
+            json={'state': 'done'},
+        )
+        client.delete(f'/todos/{todo_id}', headers=headers)
+        client.patch(
+            '/todos/batch',
+            headers=headers,
+            json={'todos': [{'id': 1, 'state': 'done'}, {'id': 2}]},
+        )
+        client.request(
+            'DELETE',
+            '/todos/batch',
+            headers=headers,
+            json={'ids': [3, 4]},
+        )
+
+    assert await query_plans.full_scans('todos') == []
+    assert await query_plans.full_scans('todo_tombstones') == []
@@ -0,0 +1,99 @@
+import time
+from http import HTTPStatus
+
+import pytest
+
+from fast_zero import ratelimit
+from fast_zero.ratelimit import MemoryBackend
+from fast_zero.routers import auth
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_refills_tokens(monkeypatch):
+    expected_retry_after = 30
+    backend = MemoryBackend(shards=2)
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now)
+
+    assert await backend.take('k', rate=1 / 60, capacity=2) == 0
+    assert await backend.take('k', rate=1 / 60, capacity=2) == 0
+    assert await backend.take('k', rate=1 / 60, capacity=2) == pytest.approx(
+        60,
+    )
+
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 90)
+    assert await backend.take('k', rate=1 / 60, capacity=2) == 0
+    assert await backend.take('k', rate=1 / 60, capacity=2) == pytest.approx(
+        expected_retry_after,
+    )
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_bounds_keys_per_shard():
+    backend = MemoryBackend(shards=1, max_keys=2)
+    for key in ('a', 'b', 'c'):
+        await backend.take(key, rate=1, capacity=1)
+
+    _, buckets = backend.shards[0]
+    assert list(buckets) == ['b', 'c']
+
+
+def test_login_flood_is_limited_before_hashing(client, user, monkeypatch):
+    calls = []
+
+    async def fake_verify(plain_password, hashed_password):
+        calls.append(plain_password)
+        return False
+
+    monkeypatch.setattr(auth, 'verify_password_async', fake_verify)
+    burst = ratelimit.identity_limiter.burst
+
+    responses = [
+        client.post(
+            '/auth/token',
+            data={'username': user.email, 'password': 'errada'},
+        )
+        for _ in range(burst + 1)
+    ]
+
+    assert [r.status_code for r in responses[:-1]] == (
+        [HTTPStatus.UNAUTHORIZED] * burst
+    )
+    assert responses[-1].status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert int(responses[-1].headers['Retry-After']) > 0
+    assert len(calls) == burst
+
+
+def test_create_user_is_limited_per_ip(client, monkeypatch):
+    monkeypatch.setattr(ratelimit.ip_limiter, 'burst', 1)
+
+    first = client.post(
+        '/users/',
+        json={'username': 'a', 'email': 'a@test.com', 'password': 'secret'},
+    )
+    second = client.post(
+        '/users/',
+        json={'username': 'b', 'email': 'b@test.com', 'password': 'secret'},
+    )
+
+    assert first.status_code == HTTPStatus.CREATED
+    assert second.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert second.json() == {'detail': 'Too many requests, try again later'}
+    assert 'rate_limited_requests_total{scope="ip"}' in (
+        client.get('/metrics').text
+    )
+
+
+def test_rate_limit_disabled_with_zero_rate(client, user, monkeypatch):
+    monkeypatch.setattr(ratelimit.identity_limiter, 'rate', 0)
+    burst = ratelimit.identity_limiter.burst
+
+    responses = [
+        client.post(
+            '/auth/token',
+            data={'username': user.email, 'password': user.clean_password},
+        )
+        for _ in range(burst + 1)
+    ]
+
+    assert all(r.status_code == HTTPStatus.OK for r in responses)
@@ -0,0 +1,146 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from fast_zero import database, replica
+from fast_zero.app import app
+from fast_zero.cli import main
+from fast_zero.database import build_engine
+from fast_zero.models import User, table_registry
+from fast_zero.replica import client_keys, copy_sqlite_database
+from fast_zero.response_cache import MemoryStorage, response_cache
+from fast_zero.settings import Settings
+
+
+@pytest.fixture(autouse=True)
+def _clear_pins():
+    replica.pins.clear()
+    yield
+    replica.pins.clear()
+
+
+@pytest.fixture
+def databases(tmp_path, monkeypatch):
+    """Primário e réplica em dois arquivos SQLite."""
+    primary, copy = tmp_path / 'primary.db', tmp_path / 'replica.db'
+    sync_engine = create_engine(f'sqlite:///{primary}')
+    table_registry.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+    copy_sqlite_database(primary, copy)
+
+    settings = Settings(DATABASE_URL=f'sqlite+aiosqlite:///{primary}')
+    engines = [
+        build_engine(settings),
+        build_engine(settings, f'sqlite+aiosqlite:///{copy}'),
+    ]
+    monkeypatch.setattr(replica.settings, 'READ_DATABASE_URL', str(copy))
+    monkeypatch.setattr(
+        database,
+        'SessionLocal',
+        async_sessionmaker(engines[0], expire_on_commit=False),
+    )
+    monkeypatch.setattr(
+        database,
+        'ReadSessionLocal',
+        async_sessionmaker(engines[1], expire_on_commit=False),
+    )
+    yield primary, copy
+    for engine in engines:
+        engine.sync_engine.dispose()
+
+
+def test_client_keys_use_token_and_marker_not_ip():
+    scope = {
+        'client': ('10.0.0.1', 1234),
+        'headers': [
+            (b'authorization', b'Bearer abc'),
+            (b'cookie', b'theme=dark; read_your_writes=xyz'),
+        ],
+    }
+
+    assert client_keys(scope) == ['auth:Bearer abc', 'marker:xyz']
+    assert client_keys({'client': ('10.0.0.1', 1234)}) == []
+
+
+def test_reads_go_to_replica_unless_pinned(databases, monkeypatch):
+    primary, copy = databases
+    # Só o roteamento: sem o cache de respostas entre as leituras
+    monkeypatch.setattr(
+        response_cache, 'storage', MemoryStorage(maxsize=0, ttl=60)
+    )
+    with TestClient(app) as client:
+        created = client.post(
+            '/users/',
+            json={'username': 'ana', 'email': 'ana@test.com', 'password': 'x'},
+        )
+        # Quem acabou de escrever lê do primário
+        pinned = client.get(f'/users/{created.json()["id"]}')
+
+        replica.pins.clear()
+        stale = client.get('/users/')
+
+        copy_sqlite_database(primary, copy)
+        replicated = client.get('/users/')
+
+    assert created.status_code == HTTPStatus.CREATED
+    assert created.cookies['read_your_writes']
+    assert pinned.status_code == HTTPStatus.OK
+    assert stale.json()['users'] == []
+    assert [u['username'] for u in replicated.json()['users']] == ['ana']
+
+
+@pytest.mark.usefixtures('databases')
+def test_cached_replica_reads_are_not_served_to_pinned_writers():
+    # Mesmo IP, como atrás de um NAT: só quem escreveu fica no primário
+    with TestClient(app, client=('10.0.0.1', 1)) as writer:
+        reader = TestClient(app, client=('10.0.0.1', 2))
+        writer.post(
+            '/users/',
+            json={'username': 'ana', 'email': 'ana@test.com', 'password': 'x'},
+        )
+        # Outro cliente lê da réplica, ainda sem a escrita
+        stale = reader.get('/users/')
+        own = writer.get('/users/')
+        cached = reader.get('/users/')
+
+    assert stale.json()['users'] == []
+    assert [u['username'] for u in own.json()['users']] == ['ana']
+    assert cached.json()['users'] == []
+
+
+def test_failed_writes_do_not_pin(databases):
+    with TestClient(app) as client:
+        response = client.post('/users/', json={'username': 'ana'})
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert len(replica.pins) == 0
+
+
+def test_no_pins_without_replica(client):
+    client.post(
+        '/users/',
+        json={'username': 'ana', 'email': 'ana@test.com', 'password': 'x'},
+    )
+
+    assert len(replica.pins) == 0
+
+
+def test_copy_replica_command(tmp_path):
+    source, target = tmp_path / 'a.db', tmp_path / 'b.db'
+    engine = create_engine(f'sqlite:///{source}')
+    table_registry.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User).values(username='ana', email='a@a.com', password='x')
+        )
+    engine.dispose()
+
+    main(['copy-replica', str(source), str(target)])
+
+    engine = create_engine(f'sqlite:///{target}')
+    with engine.connect() as conn:
+        assert conn.scalars(select(User.username)).all() == ['ana']
+    engine.dispose()
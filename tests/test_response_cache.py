@@ -0,0 +1,138 @@
+from http import HTTPStatus
+
+import pytest
+
+from fast_zero.metrics import RESPONSE_CACHE_REQUESTS
+from fast_zero.response_cache import (
+    USERS_LIST_TAG,
+    MemoryStorage,
+    ResponseCache,
+    response_cache,
+)
+
+SCOPE = {'client': ('testclient', 50000), 'headers': []}
+
+
+def test_read_users_is_served_from_cache(client, user, count_queries):
+    first = client.get('/users/')
+    with count_queries() as statements:
+        second = client.get('/users/')
+
+    assert second.status_code == HTTPStatus.OK
+    assert second.content == first.content
+    assert second.headers['content-type'] == 'application/json'
+    assert statements == []
+
+
+def test_read_users_cache_is_keyed_by_query(client, users):
+    page = client.get('/users/?limit=1')
+    everyone = client.get('/users/')
+
+    assert len(page.json()['users']) == 1
+    assert len(everyone.json()['users']) == len(users)
+
+
+def test_read_user_is_served_from_cache(client, user, count_queries):
+    first = client.get(f'/users/{user.id}')
+    with count_queries() as statements:
+        second = client.get(f'/users/{user.id}')
+
+    assert second.json() == first.json()
+    assert statements == []
+
+
+def test_read_user_not_found_is_not_cached(client, count_queries):
+    client.get('/users/1')
+    with count_queries() as statements:
+        response = client.get('/users/1')
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert len(statements) == 1
+
+
+def test_create_user_invalidates_lists(client, user):
+    client.get('/users/')
+
+    client.post(
+        '/users/',
+        json={'username': 'novo', 'email': 'novo@test.com', 'password': 'x'},
+    )
+
+    usernames = [u['username'] for u in client.get('/users/').json()['users']]
+    assert usernames == [user.username, 'novo']
+
+
+def test_update_user_invalidates_only_that_user(
+    client, user, other_user, token, count_queries
+):
+    client.get(f'/users/{user.id}')
+    client.get(f'/users/{other_user.id}')
+
+    client.put(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'username': 'novo', 'email': 'novo@test.com', 'password': 'x'},
+    )
+
+    with count_queries() as statements:
+        updated = client.get(f'/users/{user.id}')
+        other = client.get(f'/users/{other_user.id}')
+
+    assert updated.json()['username'] == 'novo'
+    assert other.json()['username'] == other_user.username
+    assert len(statements) == 1
+
+
+def test_delete_user_invalidates_cache(client, user, token):
+    client.get('/users/')
+    client.get(f'/users/{user.id}')
+
+    client.delete(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert client.get('/users/').json()['users'] == []
+    assert client.get(f'/users/{user.id}').status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_store_after_invalidation_is_never_served():
+    """Uma resposta montada antes de uma escrita não volta ao cache."""
+    cache = ResponseCache(MemoryStorage(maxsize=10, ttl=60))
+    cache_key, _ = await cache.lookup('/users/', USERS_LIST_TAG, 'q', SCOPE)
+
+    await cache.invalidate(USERS_LIST_TAG)
+    await cache.store(cache_key, b'antigo')
+
+    _, body = await cache.lookup('/users/', USERS_LIST_TAG, 'q', SCOPE)
+    assert body is None
+
+
+def test_cache_hit_ratio_metric(client, user):
+    RESPONSE_CACHE_REQUESTS.values.clear()
+    client.get('/users/')
+    client.get('/users/')
+
+    metrics = client.get('/metrics').text
+
+    assert (
+        'response_cache_requests_total{route="/users/",result="hit"} 1'
+        in metrics
+    )
+    assert 'response_cache_hit_ratio 0.5' in metrics
+
+
+def test_disabled_cache_always_misses(
+    client, user, monkeypatch, count_queries
+):
+    monkeypatch.setattr(
+        response_cache, 'storage', MemoryStorage(maxsize=0, ttl=60)
+    )
+    client.get('/users/')
+
+    with count_queries() as statements:
+        response = client.get('/users/')
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(statements) == 1
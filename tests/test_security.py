@@ -1,7 +1,17 @@
+import asyncio
+import threading
 from http import HTTPStatus
 
+import pytest
+from fastapi import HTTPException
 from jwt import decode
 
+from fast_zero.cli import write_env
+from fast_zero.hashing import (
+    PasswordWorkerPool,
+    calibrate_argon2,
+    password_pool,
+)
 from fast_zero.security import create_access_token, settings
 
 
@@ -32,3 +42,101 @@ def test_jwt_invalid_token(client):
     assert response.json() == {
         'detail': 'Could not validate credentials',
     }
+
+
+@pytest.mark.asyncio
+async def test_password_pool_runs_off_the_event_loop():
+    pool = PasswordWorkerPool(workers=1, max_pending=2)
+    try:
+        thread_name = await pool.run(lambda: threading.current_thread().name)
+    finally:
+        pool.shutdown()
+
+    assert thread_name.startswith('argon2')
+
+
+@pytest.mark.asyncio
+async def test_password_pool_rejects_when_full():
+    pool = PasswordWorkerPool(workers=1, max_pending=1)
+    release = threading.Event()
+    try:
+        running = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await pool.run(release.wait)
+
+        release.set()
+        await running
+    finally:
+        release.set()
+        pool.shutdown()
+
+    assert exc_info.value.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert exc_info.value.headers == {'Retry-After': '1'}
+    assert pool.pending == 0
+
+
+def test_login_returns_503_when_password_pool_is_full(
+    client, user, monkeypatch
+):
+    monkeypatch.setattr(password_pool, 'max_pending', 0)
+    monkeypatch.setattr(password_pool, 'workers', 1)
+
+    response = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    )
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_calibrate_argon2_prefers_memory_within_budget():
+    # 256 MiB estoura o orçamento; 128 MiB cabe com uma passada só
+    expected = {
+        'ARGON2_TIME_COST': 1,
+        'ARGON2_MEMORY_COST': 2**17,
+        'ARGON2_PARALLELISM': 2,
+        'elapsed': 0.2,
+    }
+
+    # Custo fictício: 0,1 s por passada a cada 64 MiB
+    def measure(time_cost, memory_cost, parallelism):
+        return time_cost * memory_cost / 2**16 / 10
+
+    result = calibrate_argon2(0.25, 2**18, 2, measure=measure)
+
+    assert result == expected
+
+
+def test_calibrate_argon2_falls_back_to_smallest_memory():
+    def measure(time_cost, memory_cost, parallelism):
+        return 1.0
+
+    result = calibrate_argon2(0.25, 2**15, 1, measure=measure)
+
+    assert result['ARGON2_TIME_COST'] == 1
+    assert result['ARGON2_MEMORY_COST'] == 2**14
+
+
+def test_write_env_replaces_existing_keys(tmp_path):
+    env = tmp_path / '.env'
+    env.write_text('SECRET_KEY=x\nARGON2_TIME_COST=3\n', encoding='utf-8')
+
+    write_env(env, {'ARGON2_TIME_COST': 2, 'ARGON2_MEMORY_COST': 1024})
+
+    assert env.read_text(encoding='utf-8') == (
+        'SECRET_KEY=x\nARGON2_TIME_COST=2\nARGON2_MEMORY_COST=1024\n'
+    )
+
+
+def test_calibrate_argon2_raises_time_cost_until_budget():
+    expected_time_cost = 4
+
+    def measure(time_cost, memory_cost, parallelism):
+        return time_cost * 0.05
+
+    result = calibrate_argon2(0.2, 2**14, 1, measure=measure)
+
+    assert result['ARGON2_TIME_COST'] == expected_time_cost
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+from fast_zero.settings import get_settings
+
+
+def _run(code):
+    """Executa `code` em um processo Python novo e retorna a última linha."""
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.splitlines()[-1]
+
+
+def test_get_settings_is_cached():
+    assert get_settings() is get_settings()
+
+
+def test_cli_does_not_import_the_web_stack():
+    modules = _run(
+        'import contextlib, sys\n'
+        'from fast_zero.cli import main\n'
+        'with contextlib.suppress(SystemExit):\n'
+        "    main(['--help'])\n"
+        'print(*sys.modules)'
+    ).split()
+
+    assert 'fastapi' not in modules
+    assert 'fast_zero.hashing' not in modules
+    assert 'fast_zero.database' not in modules
+
+
+def test_app_import_defers_argon2_context():
+    built = _run(
+        'import fast_zero.app\n'
+        'from fast_zero.hashing import get_pwd_context\n'
+        'print(get_pwd_context.cache_info().currsize)'
+    )
+
+    assert built == '0'
+
+
+def test_app_import_defers_jwt_and_argon2():
+    modules = _run(
+        'import sys\nimport fast_zero.app\nprint(*sys.modules)'
+    ).split()
+
+    assert 'jwt' not in modules
+    assert 'pwdlib' not in modules
+    assert 'argon2' not in modules
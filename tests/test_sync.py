@@ -0,0 +1,251 @@
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import func, select, update
+
+from fast_zero.models import Todo, TodoState, TodoTombstone
+from fast_zero.pagination import decode_watermark, encode_watermark
+from fast_zero.purge import purge_cutoff, purge_tombstones
+from fast_zero.routers.todos import settings
+
+
+def _changes(client, token, **params):
+    response = client.get(
+        '/todos/changes',
+        headers={'Authorization': f'Bearer {token}'},
+        params=params,
+    )
+    assert response.status_code == HTTPStatus.OK
+    return response.json()
+
+
+@pytest.fixture
+def recent():
+    """Data já fora da janela de acomodação, em segundos inteiros."""
+    return purge_cutoff(timedelta(minutes=5)).replace(microsecond=0)
+
+
+@pytest.fixture
+def no_settle(monkeypatch):
+    """Entrega as alterações feitas agora pelo próprio teste."""
+    monkeypatch.setattr(settings, 'TODO_CHANGES_SETTLE_SECONDS', -60)
+
+
+async def _add_todos(session, user_id, count):
+    todos = [
+        Todo(
+            title=f'todo {n}',
+            description='descrição',
+            state=TodoState.todo,
+            user_id=user_id,
+        )
+        for n in range(count)
+    ]
+    session.add_all(todos)
+    await session.commit()
+    return todos
+
+
+@pytest.fixture
+def add_todos(session, mock_db_time, recent):
+    """Cria tarefas alteradas em `recent`."""
+
+    async def add(user_id, count):
+        with mock_db_time(model=Todo, time=recent):
+            return await _add_todos(session, user_id, count)
+
+    return add
+
+
+@pytest.mark.asyncio
+async def test_full_sync_returns_only_own_todos(
+    client, user, other_user, token, add_todos
+):
+    expected_ids = [1, 2, 3]
+    await add_todos(user.id, len(expected_ids))
+    await add_todos(other_user.id, 2)
+
+    changes = _changes(client, token)
+
+    assert [todo['id'] for todo in changes['todos']] == expected_ids
+    assert changes['deleted'] == []
+    assert changes['has_more'] is False
+    assert decode_watermark(changes['watermark'])[0] > datetime.fromisoformat(
+        changes['todos'][-1]['updated_at'],
+    )
+
+
+@pytest.mark.asyncio
+async def test_changes_since_watermark_include_updates_and_tombstones(
+    client, user, token, add_todos, monkeypatch
+):
+    await add_todos(user.id, 3)
+    watermark = _changes(client, token)['watermark']
+    headers = {'Authorization': f'Bearer {token}'}
+
+    client.patch('/todos/1', headers=headers, json={'state': 'done'})
+    client.delete('/todos/2', headers=headers)
+    # Sem a janela de acomodação, a alteração feita agora só aparece depois
+    assert _changes(client, token, since=watermark)['todos'] == []
+
+    monkeypatch.setattr(settings, 'TODO_CHANGES_SETTLE_SECONDS', -60)
+    changes = _changes(client, token, since=watermark)
+
+    assert [todo['id'] for todo in changes['todos']] == [1]
+    assert changes['todos'][0]['state'] == 'done'
+    assert [tombstone['id'] for tombstone in changes['deleted']] == [2]
+
+
+@pytest.mark.asyncio
+async def test_changes_are_paginated_without_gaps(
+    client, user, token, add_todos, recent
+):
+    """Tarefas com o mesmo `updated_at` não se perdem entre as páginas."""
+    expected_pages = 3
+    await add_todos(user.id, 5)
+
+    ids, pages, watermark = [], 0, encode_watermark(recent, 0)
+    while True:
+        changes = _changes(client, token, since=watermark, limit=2)
+        ids.extend(todo['id'] for todo in changes['todos'])
+        watermark = changes['watermark']
+        pages += 1
+        if not changes['has_more']:
+            break
+
+    assert ids == [1, 2, 3, 4, 5]
+    assert pages == expected_pages
+    assert _changes(client, token, since=watermark)['todos'] == []
+
+
+@pytest.mark.usefixtures('no_settle')
+@pytest.mark.asyncio
+async def test_changes_merge_todos_and_tombstones_in_order(
+    client, user, token, add_todos
+):
+    await add_todos(user.id, 3)
+    headers = {'Authorization': f'Bearer {token}'}
+    client.delete('/todos/1', headers=headers)
+    start = purge_cutoff(timedelta(days=1))
+
+    first = _changes(client, token, since=encode_watermark(start, 0), limit=1)
+    rest = _changes(client, token, since=first['watermark'], limit=10)
+
+    assert decode_watermark(first['watermark'])[0] > start
+    assert first['has_more'] is True
+    assert len(first['todos']) + len(first['deleted']) == 1
+    assert sorted(
+        [todo['id'] for todo in first['todos'] + rest['todos']]
+        + [tombstone['id'] for tombstone in first['deleted'] + rest['deleted']]
+    ) == [1, 2, 3]
+    assert rest['has_more'] is False
+
+
+@pytest.mark.usefixtures('no_settle')
+def test_reused_id_is_not_reported_as_deleted(client, token):
+    """O SQLite reaproveita o id da maior tarefa apagada."""
+    headers = {'Authorization': f'Bearer {token}'}
+    since = encode_watermark(purge_cutoff(timedelta(days=1)), 0)
+    todo = {'title': 'a', 'description': 'a', 'state': 'draft'}
+
+    first = client.post('/todos/', headers=headers, json=todo).json()
+    client.delete(f'/todos/{first["id"]}', headers=headers)
+    second = client.post('/todos/', headers=headers, json=todo).json()
+    changes = _changes(client, token, since=since)
+
+    assert second['id'] == first['id']
+    assert [todo['id'] for todo in changes['todos']] == [second['id']]
+    assert changes['deleted'] == []
+
+
+def test_changes_invalid_watermark(client, token):
+    response = client.get(
+        '/todos/changes?since=invalido',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid watermark'}
+
+
+@pytest.mark.parametrize('last_id', [True, 10**30])
+def test_changes_watermark_with_invalid_id(client, token, recent, last_id):
+    since = encode_watermark(recent, last_id)
+
+    response = client.get(
+        f'/todos/changes?since={since}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid watermark'}
+
+
+def test_changes_watermark_ahead_of_horizon(client, token):
+    since = encode_watermark(purge_cutoff(timedelta(days=-1)), 0)
+
+    response = client.get(
+        f'/todos/changes?since={since}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid watermark'}
+
+
+def test_changes_expired_watermark_requires_full_sync(client, token):
+    retention = timedelta(days=settings.TODO_TOMBSTONE_RETENTION_DAYS + 1)
+    since = encode_watermark(purge_cutoff(retention), 0)
+
+    response = client.get(
+        f'/todos/changes?since={since}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.GONE
+    assert response.json() == {
+        'detail': 'Watermark expired, full sync required'
+    }
+
+
+@pytest.mark.asyncio
+async def test_account_deletion_leaves_no_tombstones(
+    session, client, user, other_user, token
+):
+    await _add_todos(session, user.id, 2)
+    other_todos = await _add_todos(session, other_user.id, 1)
+    await session.delete(other_todos[0])
+    await session.commit()
+
+    client.delete(
+        f'/users/{user.id}', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    tombstones = await session.scalars(select(TodoTombstone.user_id))
+    assert tombstones.all() == [other_user.id]
+
+
+@pytest.mark.asyncio
+async def test_purge_tombstones_removes_only_expired(session, user):
+    expected_purged = 2
+    todos = await _add_todos(session, user.id, 3)
+    for todo in todos:
+        await session.delete(todo)
+    await session.commit()
+    await session.execute(
+        update(TodoTombstone)
+        .where(TodoTombstone.id != todos[-1].id)
+        .values(deleted_at=purge_cutoff(timedelta(days=100))),
+    )
+    await session.commit()
+
+    purged = await purge_tombstones(
+        session.bind, timedelta(days=90), batch_size=1, pause=0
+    )
+
+    remaining = await session.scalar(
+        select(func.count()).select_from(TodoTombstone),
+    )
+    assert purged == expected_purged
+    assert remaining == 1
@@ -1,3 +1,6 @@
+import csv
+import io
+import json
 from http import HTTPStatus
 
 import factory.fuzzy
@@ -5,6 +8,8 @@ import pytest
 from sqlalchemy import select
 
 from fast_zero.models import Todo, TodoState, User
+from fast_zero.pagination import encode_cursor
+from fast_zero.schemas import TodoList, TodoPublic
 
 
 class TodoFactory(factory.Factory):
@@ -54,6 +59,55 @@ async def test_list_todos_should_return_5_todos(session, client, user, token):
     assert len(todos['todos']) == expected_todos
 
 
+@pytest.mark.asyncio
+async def test_list_todos_fast_path_matches_response_model(
+    session, client, user, token
+):
+    session.add_all(TodoFactory.create_batch(3, user_id=user.id))
+    await session.commit()
+    todos = await session.scalars(select(Todo).order_by(Todo.id))
+
+    response = client.get(
+        '/todos/',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    expected = TodoList.model_validate(
+        {'todos': todos.all()},
+        from_attributes=True,
+    ).model_dump(mode='json')
+    assert response.json() == expected
+    assert response.headers['content-type'] == 'application/json'
+
+
+@pytest.mark.asyncio
+async def test_list_todos_does_not_load_mapped_instances(
+    session, client, user, token
+):
+    session.add_all(TodoFactory.create_batch(3, user_id=user.id))
+    await session.commit()
+    session.expunge_all()
+
+    response = client.get(
+        '/todos/',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert not any(
+        isinstance(obj, Todo) for obj in session.identity_map.values()
+    )
+
+
+def test_list_todos_openapi_keeps_response_model(client):
+    schema = client.get('/openapi.json').json()
+    response = schema['paths']['/todos/']['get']['responses']['200']
+
+    assert response['content']['application/json']['schema'] == {
+        '$ref': '#/components/schemas/TodoList',
+    }
+
+
 @pytest.mark.asyncio
 async def test_list_todos_pagination_should_return_2_todos(
     session, client, user, token
@@ -71,6 +125,47 @@ async def test_list_todos_pagination_should_return_2_todos(
     assert len(todos['todos']) == expected_todos
 
 
+@pytest.mark.asyncio
+async def test_list_todos_cursor_should_walk_all_pages(
+    session, client, user, token
+):
+    create_todos = 5
+    session.add_all(TodoFactory.create_batch(create_todos, user_id=user.id))
+    await session.commit()
+
+    seen = []
+    url = '/todos/?limit=2'
+    while url:
+        response = client.get(
+            url,
+            headers={'Authorization': f'Bearer {token}'},
+        )
+        page = response.json()
+        assert response.status_code == HTTPStatus.OK
+        seen.extend(todo['id'] for todo in page['todos'])
+        url = page['next_cursor'] and (
+            f'/todos/?limit=2&cursor={page["next_cursor"]}'
+        )
+
+    assert seen == sorted(seen)
+    assert len(seen) == create_todos
+
+
+@pytest.mark.asyncio
+async def test_list_todos_cursor_last_page_has_no_next_cursor(
+    session, client, user, token
+):
+    session.add_all(TodoFactory.create_batch(3, user_id=user.id))
+    await session.commit()
+    response = client.get(
+        '/todos/?limit=5',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['next_cursor'] is None
+
+
 @pytest.mark.asyncio
 async def test_list_todos_filter_title_should_return_5_todos(
     session, user, client, token
@@ -178,6 +273,117 @@ async def test_list_todos_filter_combined_should_return_5_todos(
     assert len(todos['todos']) == expected_todos
 
 
+@pytest.mark.asyncio
+async def test_list_todos_search_should_rank_matches(
+    session, client, user, token
+):
+    session.add_all([
+        Todo(
+            title='Comprar pão',
+            description='padaria da esquina',
+            state=TodoState.todo,
+            user_id=user.id,
+        ),
+        Todo(
+            title='Pão de queijo',
+            description='receita de pão de queijo mineiro com pão',
+            state=TodoState.draft,
+            user_id=user.id,
+        ),
+        Todo(
+            title='Lavar o carro',
+            description='no sábado',
+            state=TodoState.todo,
+            user_id=user.id,
+        ),
+    ])
+    await session.commit()
+
+    response = client.get(
+        '/todos/?q=pao',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    todos = response.json()['todos']
+
+    assert response.status_code == HTTPStatus.OK
+    assert [todo['title'] for todo in todos] == [
+        'Pão de queijo',
+        'Comprar pão',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_todos_search_follows_updates_and_deletes(
+    session, client, user, token
+):
+    todo = TodoFactory.create(user_id=user.id, title='antigo')
+    session.add(todo)
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    client.patch(f'/todos/{todo.id}', headers=headers, json={'title': 'novo'})
+
+    assert (
+        client.get('/todos/?q=antigo', headers=headers).json()['todos'] == []
+    )
+    assert len(client.get('/todos/?q=novo', headers=headers).json()['todos'])
+
+    client.delete(f'/todos/{todo.id}', headers=headers)
+
+    assert client.get('/todos/?q=novo', headers=headers).json()['todos'] == []
+
+
+@pytest.mark.asyncio
+async def test_list_todos_search_only_returns_own_todos(
+    session, client, user, other_user, token
+):
+    session.add(
+        TodoFactory.create(user_id=other_user.id, title='segredo alheio')
+    )
+    await session.commit()
+
+    response = client.get(
+        '/todos/?q=segredo',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['todos'] == []
+
+
+def test_list_todos_search_ignores_query_syntax(client, token):
+    response = client.get(
+        '/todos/?q="AND (OR*',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['todos'] == []
+
+
+@pytest.mark.parametrize('last_id', [True, 10**30])
+def test_list_todos_cursor_with_invalid_id(client, token, last_id):
+    response = client.get(
+        f'/todos/?cursor={encode_cursor(last_id)}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor'}
+
+
+def test_list_todos_search_rejects_cursor(client, token):
+    response = client.get(
+        f'/todos/?q=tarefa&cursor={encode_cursor(1)}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {
+        'detail': 'Search results are paginated with skip and limit'
+    }
+
+
 def test_patch_todo_error(client, token):
     response = client.patch(
         '/todos/10',
@@ -209,6 +415,66 @@ async def test_patch_todo_should_update_todo(session, client, user, token):
     assert updated_todo['title'] == 'Updated Title'
 
 
+@pytest.mark.asyncio
+async def test_patch_todo_query_count(
+    session, client, user, token, count_queries
+):
+    session.add_all(TodoFactory.create_batch(3, user_id=user.id))
+    await session.commit()
+
+    with count_queries() as statements:
+        response = client.patch(
+            '/todos/1',
+            headers={'Authorization': f'Bearer {token}'},
+            json={'title': 'Updated Title'},
+        )
+
+    # usuário + UPDATE ... RETURNING
+    expected_statements = 2
+    assert response.status_code == HTTPStatus.OK
+    assert len(statements) == expected_statements
+    assert statements[-1].startswith('UPDATE todos')
+    assert 'RETURNING' in statements[-1]
+
+
+@pytest.mark.asyncio
+async def test_patch_todo_returns_new_updated_at(
+    session, client, user, token, mock_db_time
+):
+    with mock_db_time(model=Todo) as time:
+        todo = TodoFactory.create(user_id=user.id)
+        session.add(todo)
+        await session.commit()
+
+    response = client.patch(
+        f'/todos/{todo.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'state': 'done'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['state'] == 'done'
+    assert response.json()['created_at'] == time.isoformat()
+    assert response.json()['updated_at'] != time.isoformat()
+
+
+@pytest.mark.asyncio
+async def test_patch_todo_of_other_user(session, client, other_user, token):
+    todo = TodoFactory.create(user_id=other_user.id)
+    session.add(todo)
+    await session.commit()
+
+    response = client.patch(
+        f'/todos/{todo.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'title': 'Updated Title'},
+    )
+
+    await session.refresh(todo)
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert todo.title != 'Updated Title'
+
+
 @pytest.mark.asyncio
 async def test_delete_todo_should_remove_todo(session, client, user, token):
     todo = TodoFactory.create(user_id=user.id)
@@ -225,6 +491,27 @@ async def test_delete_todo_should_remove_todo(session, client, user, token):
     }
 
 
+@pytest.mark.asyncio
+async def test_delete_todo_query_count(
+    session, client, user, token, count_queries
+):
+    session.add_all(TodoFactory.create_batch(3, user_id=user.id))
+    await session.commit()
+
+    with count_queries() as statements:
+        response = client.delete(
+            '/todos/1',
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+    # usuário + DELETE ... RETURNING
+    expected_statements = 2
+    assert response.status_code == HTTPStatus.OK
+    assert len(statements) == expected_statements
+    assert statements[-1].startswith('DELETE FROM todos')
+    assert 'RETURNING' in statements[-1]
+
+
 def test_delete_todo_error(client, token):
     response = client.delete(
         '/todos/10',
@@ -276,3 +563,234 @@ async def test_create_todo_with_wrong_state_raises_error(session, user: User):
     await session.commit()
     with pytest.raises(LookupError):
         await session.scalar(select(Todo))
+
+
+def test_create_todos_batch(client, token):
+    response = client.post(
+        '/todos/batch',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'todos': [
+                {'title': f'Todo {n}', 'description': 'batch', 'state': 'todo'}
+                for n in range(3)
+            ]
+        },
+    )
+    results = response.json()['results']
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert [r['status'] for r in results] == [HTTPStatus.CREATED] * 3
+    assert [r['todo']['title'] for r in results] == [
+        'Todo 0',
+        'Todo 1',
+        'Todo 2',
+    ]
+    assert [r['id'] for r in results] == [r['todo']['id'] for r in results]
+
+
+def test_create_todos_batch_rejects_empty_batch(client, token):
+    response = client.post(
+        '/todos/batch',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'todos': []},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_patch_todos_batch(session, client, user, other_user, token):
+    mine = TodoFactory.create_batch(2, user_id=user.id, state=TodoState.todo)
+    foreign = TodoFactory.create(user_id=other_user.id)
+    session.add_all([*mine, foreign])
+    await session.commit()
+
+    response = client.patch(
+        '/todos/batch',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'todos': [
+                {'id': mine[0].id, 'state': 'done'},
+                {'id': mine[1].id, 'title': 'Novo título'},
+                {'id': foreign.id, 'title': 'Invasão'},
+            ]
+        },
+    )
+    results = response.json()['results']
+
+    assert response.status_code == HTTPStatus.OK
+    assert [r['status'] for r in results] == [
+        HTTPStatus.OK,
+        HTTPStatus.OK,
+        HTTPStatus.NOT_FOUND,
+    ]
+    assert results[0]['todo']['state'] == 'done'
+    assert results[0]['todo']['title'] == mine[0].title
+    assert results[1]['todo']['title'] == 'Novo título'
+    assert results[1]['todo']['state'] == 'todo'
+    assert results[2]['todo'] is None
+
+    await session.refresh(foreign)
+    assert foreign.title != 'Invasão'
+
+
+@pytest.mark.asyncio
+async def test_patch_todos_batch_uses_a_single_statement(
+    session, client, user, token, count_queries
+):
+    todos = TodoFactory.create_batch(5, user_id=user.id)
+    session.add_all(todos)
+    await session.commit()
+
+    with count_queries() as statements:
+        client.patch(
+            '/todos/batch',
+            headers={'Authorization': f'Bearer {token}'},
+            json={'todos': [{'id': t.id, 'title': 'x'} for t in todos]},
+        )
+
+    todo_statements = [s for s in statements if 'todos' in s]
+    assert len(todo_statements) == 1
+    assert todo_statements[0].startswith('UPDATE todos')
+
+
+@pytest.mark.asyncio
+async def test_delete_todos_batch(session, client, user, other_user, token):
+    mine = TodoFactory.create(user_id=user.id)
+    foreign = TodoFactory.create(user_id=other_user.id)
+    session.add_all([mine, foreign])
+    await session.commit()
+
+    response = client.request(
+        'DELETE',
+        '/todos/batch',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'ids': [mine.id, foreign.id, 999]},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'results': [
+            {'id': mine.id, 'status': HTTPStatus.OK, 'todo': None},
+            {'id': foreign.id, 'status': HTTPStatus.NOT_FOUND, 'todo': None},
+            {'id': 999, 'status': HTTPStatus.NOT_FOUND, 'todo': None},
+        ]
+    }
+    remaining = await session.scalars(select(Todo.id))
+    assert remaining.all() == [foreign.id]
+
+
+@pytest.mark.asyncio
+async def test_export_todos_ndjson(session, client, user, other_user, token):
+    session.add_all(TodoFactory.create_batch(3, user_id=user.id))
+    session.add(TodoFactory.create(user_id=other_user.id))
+    await session.commit()
+
+    response = client.get(
+        '/todos/export',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert [TodoPublic.model_validate(line).id for line in lines] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_export_todos_csv_gzip(session, client, user, token):
+    session.add_all(TodoFactory.create_batch(2, user_id=user.id))
+    await session.commit()
+
+    response = client.get(
+        '/todos/export?format=csv&gzip=true',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['content-type'].startswith('text/csv')
+    assert [row['id'] for row in rows] == ['1', '2']
+
+
+def test_export_todos_csv_without_todos_has_header(client, token):
+    response = client.get(
+        '/todos/export?format=csv',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.text.splitlines() == [
+        'id,title,description,state,created_at,updated_at',
+    ]
+
+
+def test_todo_stats_follow_create_patch_and_delete(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    ids = [
+        client.post(
+            '/todos/',
+            headers=headers,
+            json={'title': 'a', 'description': 'b', 'state': state},
+        ).json()['id']
+        for state in ('todo', 'todo', 'doing')
+    ]
+    client.patch(f'/todos/{ids[0]}', headers=headers, json={'state': 'done'})
+    client.patch(f'/todos/{ids[1]}', headers=headers, json={'title': 'c'})
+    client.delete(f'/todos/{ids[2]}', headers=headers)
+
+    response = client.get('/todos/stats', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'draft': 0,
+        'todo': 1,
+        'doing': 0,
+        'done': 1,
+        'trash': 0,
+        'total': 2,
+    }
+
+
+def test_todo_stats_follow_batch_endpoints(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    created = client.post(
+        '/todos/batch',
+        headers=headers,
+        json={
+            'todos': [
+                {'title': 'a', 'description': 'b', 'state': 'draft'}
+                for _ in range(3)
+            ]
+        },
+    ).json()['results']
+    ids = [result['id'] for result in created]
+    client.patch(
+        '/todos/batch',
+        headers=headers,
+        json={'todos': [{'id': ids[0], 'state': 'trash'}]},
+    )
+    client.request(
+        'DELETE', '/todos/batch', headers=headers, json={'ids': [ids[1]]}
+    )
+
+    response = client.get('/todos/stats', headers=headers)
+
+    assert response.json() == {
+        'draft': 1,
+        'todo': 0,
+        'doing': 0,
+        'done': 0,
+        'trash': 1,
+        'total': 2,
+    }
+
+
+def test_todo_stats_only_count_current_user(client, token, other_user):
+    response = client.get(
+        '/todos/stats',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.json()['total'] == 0
@@ -1,7 +1,24 @@
+import asyncio
 from http import HTTPStatus
 
 import pytest
-
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from fast_zero import ratelimit
+from fast_zero.app import app
+from fast_zero.database import get_session, settings
+from fast_zero.models import (
+    Todo,
+    TodoCounter,
+    TodoState,
+    User,
+    table_registry,
+)
+from fast_zero.pagination import encode_cursor
+from fast_zero.purge import delete_account
+from fast_zero.routers import users as users_router
 from fast_zero.schemas import UserPublic
 from fast_zero.security import create_access_token
 
@@ -25,6 +42,89 @@ async def test_create_user(client):
     }
 
 
+@pytest.mark.parametrize(
+    ('field', 'detail'),
+    [
+        ('username', 'Username already exists'),
+        ('email', 'Email already exists'),
+    ],
+)
+def test_create_user_conflict(client, user, field, detail):
+    payload = {
+        'username': 'novo',
+        'email': 'novo@test.com',
+        'password': 'secret',
+        field: getattr(user, field),
+    }
+
+    response = client.post('/users/', json=payload)
+
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert response.json() == {'detail': detail}
+
+
+def test_create_user_in_one_statement(client, count_queries):
+    with count_queries() as statements:
+        response = client.post(
+            '/users/',
+            json={
+                'username': 'novo',
+                'email': 'novo@test.com',
+                'password': 'secret',
+            },
+        )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert len(statements) == 1
+    assert statements[0].startswith('INSERT INTO users')
+    assert 'RETURNING' in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_signups_conflict_cleanly(tmp_path, monkeypatch):
+    """Cadastros simultâneos do mesmo usuário: um cria, os outros 409."""
+    signups = 10
+    monkeypatch.setattr(ratelimit.identity_limiter, 'rate', 0)
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "u.db"}')
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.create_all)
+
+    async def get_session_override():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url='http://test'
+        ) as client:
+            responses = await asyncio.gather(
+                *(
+                    client.post(
+                        '/users/',
+                        json={
+                            'username': 'concorrente',
+                            'email': f'concorrente{n}@test.com',
+                            'password': 'secret',
+                        },
+                    )
+                    for n in range(signups)
+                )
+            )
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    statuses = sorted(r.status_code for r in responses)
+    conflicts = [
+        r.json() for r in responses if r.status_code == HTTPStatus.CONFLICT
+    ]
+    assert statuses == [HTTPStatus.CREATED] + [HTTPStatus.CONFLICT] * (
+        signups - 1
+    )
+    assert conflicts == [{'detail': 'Username already exists'}] * (signups - 1)
+
+
 def test_read_users(client, users):
     response = client.get('/users/')
 
@@ -35,6 +135,7 @@ def test_read_users(client, users):
     assert response.status_code == HTTPStatus.OK
     assert response.json() == {
         'users': users_schema,
+        'next_cursor': None,
     }
 
 
@@ -86,7 +187,45 @@ def test_read_users_with_user(client, user):
     user_schema = UserPublic.model_validate(user).model_dump()
     response = client.get('/users/')
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'users': [user_schema]}
+    assert response.json() == {'users': [user_schema], 'next_cursor': None}
+
+
+def test_read_users_cursor_pagination(client, users):
+    response = client.get('/users/?limit=2')
+    first_page = response.json()
+
+    assert response.status_code == HTTPStatus.OK
+    assert [u['id'] for u in first_page['users']] == [
+        users[0].id,
+        users[1].id,
+    ]
+    assert first_page['next_cursor']
+
+    response = client.get(
+        f'/users/?limit=2&cursor={first_page["next_cursor"]}',
+    )
+    second_page = response.json()
+
+    assert response.status_code == HTTPStatus.OK
+    assert [u['id'] for u in second_page['users']] == [
+        users[2].id,
+        users[3].id,
+    ]
+
+
+def test_read_users_invalid_cursor(client):
+    response = client.get('/users/?cursor=nao-e-um-cursor')
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor'}
+
+
+@pytest.mark.parametrize('last_id', [True, -1, 10**30])
+def test_read_users_cursor_with_invalid_id(client, last_id):
+    response = client.get(f'/users/?cursor={encode_cursor(last_id)}')
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor'}
 
 
 def test_update_integrity_error_username(client, user, other_user, token):
@@ -102,7 +241,7 @@ def test_update_integrity_error_username(client, user, other_user, token):
     )
     assert response_update.status_code == HTTPStatus.CONFLICT
     assert response_update.json() == {
-        'detail': 'Username or email already exists',
+        'detail': 'Username already exists',
     }
 
 
@@ -119,7 +258,7 @@ def test_update_integrity_error_email(client, user, other_user, token):
     )
     assert response_update.status_code == HTTPStatus.CONFLICT
     assert response_update.json() == {
-        'detail': 'Username or email already exists',
+        'detail': 'Email already exists',
     }
 
 
@@ -172,3 +311,124 @@ def test_delete_user_with_wrong_user(client, other_user, token):
     )
     assert response.status_code == HTTPStatus.FORBIDDEN
     assert response.json() == {'detail': 'Not enough permissions'}
+
+
+@pytest.mark.asyncio
+async def test_delete_user_removes_todos(session, client, user, token):
+    session.add(
+        Todo(
+            title='Test Todo',
+            description='Test Description',
+            state=TodoState.draft,
+            user_id=user.id,
+        )
+    )
+    await session.commit()
+
+    response = client.delete(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert await session.scalar(select(Todo)) is None
+
+
+@pytest.mark.asyncio
+async def test_delete_user_cascades_in_the_database(
+    session, client, user, token, count_queries
+):
+    session.add_all(
+        Todo(
+            title=f'tarefa {n}',
+            description='descrição',
+            state=TodoState.todo,
+            user_id=user.id,
+        )
+        for n in range(3)
+    )
+    await session.commit()
+
+    with count_queries() as statements:
+        client.delete(
+            f'/users/{user.id}',
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+    # O ORM não carrega nem apaga as tarefas uma a uma
+    assert not [s for s in statements if 'todos' in s]
+    assert await session.scalar(select(func.count()).select_from(Todo)) == 0
+    assert await session.scalar(text('SELECT count(*) FROM todos_fts')) == 0
+    assert await session.scalar(select(TodoCounter.count)) is None
+
+
+@pytest.mark.asyncio
+async def test_delete_large_user_runs_in_background(
+    session, client, user, token, monkeypatch
+):
+    monkeypatch.setattr(settings, 'ACCOUNT_DELETE_BACKGROUND_THRESHOLD', 2)
+    monkeypatch.setattr(settings, 'ACCOUNT_DELETE_BATCH_SIZE', 2)
+    monkeypatch.setattr(settings, 'ACCOUNT_DELETE_PAUSE', 0)
+    session.add_all(
+        Todo(
+            title=f'tarefa {n}',
+            description='descrição',
+            state=TodoState.todo,
+            user_id=user.id,
+        )
+        for n in range(5)
+    )
+    await session.commit()
+
+    response = client.delete(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.ACCEPTED
+    assert response.json() == {'message': 'User deletion scheduled'}
+    assert await session.scalar(select(func.count()).select_from(Todo)) == 0
+    assert await session.scalar(select(func.count()).select_from(User)) == 0
+
+
+@pytest.mark.asyncio
+async def test_token_stops_working_after_background_delete(
+    session, client, user, token, monkeypatch
+):
+    monkeypatch.setattr(settings, 'ACCOUNT_DELETE_BACKGROUND_THRESHOLD', 1)
+    session.add_all(
+        Todo(
+            title=f'tarefa {n}',
+            description='descrição',
+            state=TodoState.todo,
+            user_id=user.id,
+        )
+        for n in range(2)
+    )
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+    during = []
+
+    async def delete_account_with_request(engine, *args):
+        # Uma requisição autenticada no meio do job devolve o usuário ao
+        # cache de principals
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url='http://test'
+        ) as other:
+            response = await other.get('/todos/', headers=headers)
+            during.append(response.status_code)
+        return await delete_account(engine, *args)
+
+    monkeypatch.setattr(
+        users_router, 'delete_account', delete_account_with_request
+    )
+
+    client.delete(f'/users/{user.id}', headers=headers)
+    response = client.post(
+        '/todos/',
+        headers=headers,
+        json={'title': 'nova', 'description': 'nova', 'state': 'draft'},
+    )
+
+    assert during == [HTTPStatus.OK]
+    assert response.status_code == HTTPStatus.UNAUTHORIZED